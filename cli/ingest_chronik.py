@@ -4,18 +4,50 @@
 from __future__ import annotations
 
 import argparse
+import bisect
+import glob
+import hashlib
+import heapq
+import itertools
 import json
+import math
+import mmap
+import os
+import struct
 import sys
+import time
 import traceback
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List
+from typing import List
+
+try:
+    from scripts.atomic_io import FSYNC_POLICIES, atomic_write_bytes
+except ImportError:
+    # Run as `cli/ingest_chronik.py`: make the repository root importable.
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+    from scripts.atomic_io import FSYNC_POLICIES, atomic_write_bytes
 
 MAX_BYTES_DEFAULT = 10 * 1024
 DEFAULT_LIMIT = 32
-
-# Ensure parity between _encode and shrink_to_size calculation
+MAX_TAIL_WORKERS = 8
+DEFAULT_POLL_INTERVAL = 1.0
+# Record fields checked (in order) for the merge timestamp of sharded exports.
+TIMESTAMP_FIELDS = ("ts", "timestamp", "created_at", "generated_at")
+
+# Sidecar offset index: header (magic, length and digest of the source head
+# used to detect rotation), followed by one fixed-size entry per non-blank
+# line: byte offset and the running maximum timestamp up to that line.
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"CHRKIDX1"
+INDEX_HEAD_BYTES = 4096
+INDEX_HEADER = struct.Struct("<8sI16s4x")
+INDEX_ENTRY = struct.Struct("<Qd")
+
+# Ensure parity between _encode and encode_to_size fragments
 JSON_DUMPS_OPTIONS = {
     "ensure_ascii": False,
     "separators": (",", ":"),
@@ -74,49 +106,47 @@ def _coerce_tags(value) -> List[str]:
 
 
 def read_last_records(path: Path, limit: int) -> list[dict]:
+    """Return the last ``limit`` non-blank JSONL records of ``path``, oldest first.
+
+    The file is memory-mapped and line boundaries are located backwards with
+    ``rfind``, so only the returned lines are copied out of the mapping
+    regardless of how long they are.
+    """
     if limit < 0:
         raise ValueError("limit must be non-negative")
+    return _parse_records(_last_lines(path, limit))
+
+
+def _last_lines(path: Path, limit: int, *, stop: int | None = None) -> list[str]:
+    """Return the last ``limit`` non-blank lines of ``path``, oldest first.
+
+    ``stop`` ignores everything from that byte offset on.
+    """
     if limit == 0:
         return []
 
-    chunk_size = 16 * 1024
     lines: list[str] = []
 
     with path.open("rb") as handle:
-        handle.seek(0, 2)
-        pos = handle.tell()
-        remainder = b""
-
-        while len(lines) < limit and pos > 0:
-            to_read = min(chunk_size, pos)
-            pos -= to_read
-            handle.seek(pos)
-            chunk = handle.read(to_read)
-
-            chunk += remainder
-            chunk_lines = chunk.split(b"\n")
-
-            if pos > 0:
-                remainder = chunk_lines[0]
-                chunk_lines = chunk_lines[1:]
-            else:
-                remainder = b""
-                # At start of file, all lines are valid
-
-            # Process in reverse
-            for i in range(len(chunk_lines) - 1, -1, -1):
-                line_bytes = chunk_lines[i]
-                line_str = line_bytes.decode("utf-8").strip()
-
-                if not line_str:
-                    continue
-
-                lines.append(line_str)
-                if len(lines) >= limit:
+        size = os.fstat(handle.fileno()).st_size
+        if size == 0:
+            return []
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            end = size if stop is None else min(stop, size)
+            while len(lines) < limit and end > 0:
+                newline = mapped.rfind(b"\n", 0, end)
+                line_str = mapped[newline + 1 : end].decode("utf-8").strip()
+                if line_str:
+                    lines.append(line_str)
+                if newline < 0:
                     break
+                end = newline
 
     lines.reverse()
+    return lines
+
 
+def _parse_records(lines: Iterable[str]) -> list[dict]:
     records: list[dict] = []
     for line in lines:
         try:
@@ -129,48 +159,341 @@ def read_last_records(path: Path, limit: int) -> list[dict]:
     return records
 
 
+def expand_sources(patterns: Iterable[str]) -> list[Path]:
+    """Resolve source paths and globs to a de-duplicated list of files."""
+    sources: list[Path] = []
+    seen: set[Path] = set()
+    for pattern in patterns:
+        expanded = os.path.expanduser(pattern)
+        if any(char in expanded for char in "*?["):
+            matches = sorted(glob.glob(expanded))
+            if not matches:
+                raise FileNotFoundError(f"No source files match: {pattern}")
+        else:
+            matches = [expanded]
+        for match in matches:
+            path = Path(match).resolve()
+            if not path.is_file():
+                raise FileNotFoundError(f"Source file not found: {path}")
+            if path not in seen:
+                seen.add(path)
+                sources.append(path)
+    return sources
+
+
+def record_timestamp(record: dict) -> float | None:
+    """Return the record's timestamp as epoch seconds, if it carries one."""
+    for field in TIMESTAMP_FIELDS:
+        value = record.get(field)
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            try:
+                parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+            except ValueError:
+                continue
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed.timestamp()
+    return None
+
+
+def merge_newest(tails: Sequence[list[dict]], limit: int) -> list[dict]:
+    """K-way merge per-source tails and keep the newest ``limit`` records.
+
+    Each tail must be in file (append) order. Tails are walked newest-first
+    through a heap; records without a timestamp sort as oldest, and equal
+    timestamps keep source order. The result is oldest-first like
+    :func:`read_last_records`.
+    """
+
+    def newest_first(records: list[dict]) -> Iterator[tuple[float, dict]]:
+        for record in reversed(records):
+            ts = record_timestamp(record)
+            yield (float("-inf") if ts is None else ts), record
+
+    merged = heapq.merge(
+        *(newest_first(tail) for tail in tails),
+        key=lambda entry: entry[0],
+        reverse=True,
+    )
+    newest = [record for _, record in itertools.islice(merged, limit)]
+    newest.reverse()
+    return newest
+
+
+def read_last_records_from_sources(
+    paths: Sequence[Path],
+    limit: int,
+    reader: Callable[[Path, int], list[dict]] = read_last_records,
+) -> list[dict]:
+    """Tail every source concurrently and merge the newest ``limit`` records."""
+    if len(paths) == 1:
+        return reader(paths[0], limit)
+    workers = min(len(paths), MAX_TAIL_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        tails = list(pool.map(lambda path: reader(path, limit), paths))
+    return merge_newest(tails, limit)
+
+
+def index_path_for(source: Path) -> Path:
+    """Return the sidecar index path of a Chronik export."""
+    return source.with_name(source.name + INDEX_SUFFIX)
+
+
+def _head_digest(head: bytes) -> bytes:
+    return hashlib.blake2b(head, digest_size=16).digest()
+
+
+class _IndexEntries(Sequence):
+    """Read-only view of the fixed-size entries of a mapped index file."""
+
+    def __init__(self, data: bytes | mmap.mmap):
+        self._data = data
+        self._count = (len(data) - INDEX_HEADER.size) // INDEX_ENTRY.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position):  # type: ignore[override]
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError("index entry out of range")
+        return INDEX_ENTRY.unpack_from(
+            self._data, INDEX_HEADER.size + position * INDEX_ENTRY.size
+        )
+
+
+class ChronikIndex:
+    """Append-only byte-offset index stored next to a Chronik JSONL export.
+
+    Every non-blank, newline-terminated line gets one entry holding its byte
+    offset and the running maximum of the record timestamps seen so far.
+    :meth:`update` only scans bytes appended since the previous run and
+    rebuilds the sidecar when the export was truncated or rotated. The
+    monotonic watermark makes time-window lookups a binary search even when
+    a few records arrive out of order; readers then filter by the record's
+    own timestamp.
+    """
+
+    def __init__(self, source: Path, index_path: Path | None = None):
+        self.source = Path(source)
+        self.index_path = index_path or index_path_for(self.source)
+
+    def update(self) -> int:
+        """Index lines appended since the last run and return how many."""
+        size = self.source.stat().st_size
+        entries: list[bytes] = []
+        with self.source.open("rb") as handle:
+            head = handle.read(min(size, INDEX_HEAD_BYTES))
+            valid, end, watermark = self._resume_point(handle, size)
+            if not valid:
+                header = INDEX_HEADER.pack(INDEX_MAGIC, len(head), _head_digest(head))
+                self.index_path.write_bytes(header)
+            if size > end:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    while True:
+                        newline = mapped.find(b"\n", end)
+                        if newline < 0:
+                            break
+                        line = mapped[end:newline]
+                        if line.strip():
+                            ts = _line_timestamp(line)
+                            if ts is not None and ts > watermark:
+                                watermark = ts
+                            entries.append(INDEX_ENTRY.pack(end, watermark))
+                        end = newline + 1
+        if entries:
+            with self.index_path.open("ab") as index:
+                index.write(b"".join(entries))
+        return len(entries)
+
+    def _resume_point(self, handle, size: int) -> tuple[bool, int, float]:
+        """Return (index valid, first unindexed byte, last watermark)."""
+        try:
+            with self.index_path.open("rb") as index:
+                data = index.read(INDEX_HEADER.size)
+                index.seek(0, os.SEEK_END)
+                index_size = index.tell()
+                index.seek(max(INDEX_HEADER.size, index_size - INDEX_ENTRY.size))
+                last_entry = index.read(INDEX_ENTRY.size)
+        except FileNotFoundError:
+            return False, 0, -math.inf
+        if len(data) < INDEX_HEADER.size:
+            return False, 0, -math.inf
+        magic, head_len, digest = INDEX_HEADER.unpack(data)
+        handle.seek(0)
+        if magic != INDEX_MAGIC or size < head_len:
+            return False, 0, -math.inf
+        if _head_digest(handle.read(head_len)) != digest:
+            return False, 0, -math.inf
+        if (index_size - INDEX_HEADER.size) % INDEX_ENTRY.size:
+            return False, 0, -math.inf
+        if index_size == INDEX_HEADER.size:
+            return True, 0, -math.inf
+        offset, watermark = INDEX_ENTRY.unpack(last_entry)
+        if offset >= size:
+            return False, 0, -math.inf
+        if offset > 0:
+            handle.seek(offset - 1)
+            if handle.read(1) != b"\n":
+                return False, 0, -math.inf
+        # Resume after the line of the last entry; it was newline-terminated.
+        handle.seek(offset)
+        while True:
+            block = handle.read(64 * 1024)
+            if not block:
+                return False, 0, -math.inf
+            newline = block.find(b"\n")
+            if newline >= 0:
+                return True, handle.tell() - len(block) + newline + 1, watermark
+
+    def count(self) -> int:
+        """Number of indexed lines after bringing the index up to date."""
+        self.update()
+        return (self.index_path.stat().st_size - INDEX_HEADER.size) // INDEX_ENTRY.size
+
+    def tail(self, limit: int) -> list[dict]:
+        """Same contract as :func:`read_last_records`, answered from the index."""
+        if limit < 0:
+            raise ValueError("limit must be non-negative")
+        return self._records(lambda count, _: range(max(0, count - limit), count))
+
+    def records(self, start: int, stop: int | None = None) -> list[dict]:
+        """Return records ``start..stop`` (0-based, stop exclusive) in file order.
+
+        Negative values count from the end like slice indices.
+        """
+        return self._records(lambda count, _: range(*slice(start, stop).indices(count)))
+
+    def since(self, timestamp: float) -> list[dict]:
+        """Return records whose timestamp is at or after ``timestamp``, in file order.
+
+        Records without a timestamp are skipped.
+        """
+
+        def window(count: int, entries: _IndexEntries) -> range:
+            first = bisect.bisect_left(
+                entries, timestamp, hi=min(count, len(entries)), key=lambda e: e[1]
+            )
+            return range(first, count)
+
+        records = self._records(window)
+        return [
+            record
+            for record in records
+            if (ts := record_timestamp(record)) is not None and ts >= timestamp
+        ]
+
+    def _records(
+        self, select: Callable[[int, _IndexEntries], Iterable[int]]
+    ) -> list[dict]:
+        """Parse the lines chosen by ``select`` after updating the index.
+
+        ``select`` receives the number of addressable lines and the entries. A
+        trailing line that is not newline-terminated yet is addressable as the
+        last position.
+        """
+        self.update()
+        lines: list[str] = []
+        with self.source.open("rb") as handle, self.index_path.open("rb") as index:
+            size = os.fstat(handle.fileno()).st_size
+            if size == 0:
+                return []
+            with (
+                mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+                mmap.mmap(index.fileno(), 0, access=mmap.ACCESS_READ) as raw,
+            ):
+                entries = _IndexEntries(raw)
+                indexed = len(entries)
+                pending = mapped.rfind(b"\n") + 1
+                count = indexed + (1 if mapped[pending:size].strip() else 0)
+                for position in select(count, entries):
+                    if position < indexed:
+                        start = entries[position][0]
+                        if position + 1 < indexed:
+                            end = entries[position + 1][0]
+                        else:
+                            end = mapped.find(b"\n", start)
+                    else:
+                        start, end = pending, size
+                    lines.append(mapped[start:end].decode("utf-8").strip())
+        return _parse_records(lines)
+
+
+def _line_timestamp(line: bytes) -> float | None:
+    try:
+        record = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return record_timestamp(record) if isinstance(record, dict) else None
+
+
 def shrink_to_size(payload: dict, max_bytes: int) -> dict:
     """Drop oldest items until serialized payload fits into max_bytes.
 
     Mutates payload in-place.
     """
-    items = payload.get("items", [])
-    if not isinstance(items, list):
-        return payload
+    encode_to_size(payload, max_bytes)
+    return payload
 
-    encoded = _encode(payload)
-    if len(encoded) <= max_bytes:
-        return payload
 
-    # Calculate base size (empty items)
-    payload["items"] = []
-    base_len = len(_encode(payload))
+def encode_to_size(payload: dict, max_bytes: int) -> bytes:
+    """Drop oldest items until the payload fits into max_bytes and encode it.
 
+    Every item is serialized exactly once; the fragment lengths drive a binary
+    search for the longest fitting suffix, and the returned bytes are joined
+    from the same fragments, identical to ``_encode`` of the shrunk payload.
+    Mutates ``payload["items"]``; leaves the payload untouched on error.
+    """
+    items = payload.get("items")
+    if not isinstance(items, list):
+        return _encode(payload)
+
+    prefix, suffix = _encode_frame(payload)
+    fragments = [
+        json.dumps(item, **JSON_DUMPS_OPTIONS).encode("utf-8") for item in items
+    ]
+    base_len = len(prefix) + len(suffix)
     if base_len > max_bytes:
-        # Restore items before raising
-        payload["items"] = items
         raise ValueError(
             "Unable to satisfy max-bytes constraint even after dropping all items"
         )
 
-    current_size = base_len
-    start_idx = len(items)
+    # kept[i]: encoded size of items[i:] including separating commas.
+    kept = [0] * (len(fragments) + 1)
+    for i in range(len(fragments) - 1, -1, -1):
+        comma = 1 if i + 1 < len(fragments) else 0
+        kept[i] = kept[i + 1] + len(fragments[i]) + comma
+    start_idx = bisect.bisect_left(
+        range(len(kept)), True, key=lambda i: base_len + kept[i] <= max_bytes
+    )
 
-    # Iterate backwards from the end
-    for i in range(len(items) - 1, -1, -1):
-        item_encoded = json.dumps(items[i], **JSON_DUMPS_OPTIONS).encode("utf-8")
-        cost = len(item_encoded)
-        if current_size > base_len:
-            cost += 1  # comma
+    payload["items"] = items[start_idx:]
+    return prefix + b",".join(fragments[start_idx:]) + suffix
 
-        if current_size + cost <= max_bytes:
-            current_size += cost
-            start_idx = i
-        else:
-            break
 
-    payload["items"] = items[start_idx:]
-    return payload
+def _encode_frame(payload: dict) -> tuple[bytes, bytes]:
+    """Return the encoded payload before and after the items' contents.
+
+    Fields keep their order, so ``prefix + b",".join(items) + suffix`` equals
+    ``_encode`` of the payload. Payload keys must be strings.
+    """
+    fields: list[str] = []
+    split = len(payload)
+    for key, value in payload.items():
+        name = json.dumps(key, **JSON_DUMPS_OPTIONS)
+        if key == "items":
+            split = len(fields) + 1
+            fields.append(f"{name}:[")
+        else:
+            fields.append(f"{name}:{json.dumps(value, **JSON_DUMPS_OPTIONS)}")
+    prefix = "{" + ",".join(fields[:split])
+    suffix = "]" + "".join(f",{field}" for field in fields[split:]) + "}"
+    return prefix.encode("utf-8"), suffix.encode("utf-8")
 
 
 def _encode(payload: dict) -> bytes:
@@ -186,25 +509,143 @@ def build_payload(insights: list[Insight]) -> dict:
 
 
 def ingest(args: argparse.Namespace) -> Path:
-    source_path = Path(args.source).expanduser().resolve()
+    patterns = [args.source] if isinstance(args.source, str) else args.source
+    source_paths = expand_sources(patterns)
     output_path = Path(args.output).expanduser()
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if not source_path.is_file():
-        raise FileNotFoundError(f"Source file not found: {source_path}")
+    since = getattr(args, "since", None)
+    if since is not None:
+        try:
+            since_ts: float | None = float(since)
+        except ValueError:
+            since_ts = record_timestamp({"ts": since})
+        if since_ts is None:
+            raise ValueError(f"Invalid --since timestamp: {since}")
+
+        def reader(path: Path, limit: int) -> list[dict]:
+            window = ChronikIndex(path).since(since_ts)
+            return window[-limit:] if limit else []
+
+    elif getattr(args, "index", False):
+
+        def reader(path: Path, limit: int) -> list[dict]:
+            return ChronikIndex(path).tail(limit)
+
+    else:
+        reader = read_last_records
+
+    raw_records = read_last_records_from_sources(source_paths, args.limit, reader)
+    _, data_bytes = render_insights(raw_records, args.max_bytes)
+    atomic_write_bytes(output_path, data_bytes, fsync=getattr(args, "fsync", None))
+    return output_path
+
 
-    raw_records = read_last_records(source_path, args.limit)
+def render_insights(records: Iterable[dict], max_bytes: int) -> tuple[list, bytes]:
+    """Return the kept payload items and the encoded payload for ``records``."""
     insights = []
-    for record in raw_records:
+    for record in records:
         insight = Insight.from_record(record)
         if insight is not None:
             insights.append(insight)
 
     payload = build_payload(insights)
-    shrink_to_size(payload, args.max_bytes)
+    data_bytes = encode_to_size(payload, max_bytes)
+    return payload["items"], data_bytes
+
+
+@dataclass
+class FollowState:
+    """Consumption point of one followed export: inode and byte offset."""
 
-    data_bytes = _encode(payload)
-    output_path.write_bytes(data_bytes)
+    path: Path
+    inode: int
+    offset: int
+
+    @classmethod
+    def at_end(cls, path: Path) -> FollowState:
+        """Start after the last complete line of ``path``."""
+        with path.open("rb") as handle:
+            stat = os.fstat(handle.fileno())
+            offset = 0
+            if stat.st_size:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    offset = mapped.rfind(b"\n") + 1
+        return cls(path=path, inode=stat.st_ino, offset=offset)
+
+    def tail(self, limit: int) -> list[dict]:
+        """Return the last ``limit`` records before the consumption point.
+
+        Records appended after :meth:`at_end` are left to :meth:`poll`, so
+        none is counted twice.
+        """
+        return _parse_records(_last_lines(self.path, limit, stop=self.offset))
+
+    def poll(self) -> list[dict]:
+        """Return records appended since the last poll, oldest first.
+
+        A trailing line without newline stays pending until it is complete. A
+        changed inode or a shrunken file means the export was rotated or
+        truncated; it is then consumed from the start.
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return []
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            self.inode, self.offset = stat.st_ino, 0
+        if stat.st_size == self.offset:
+            return []
+        with self.path.open("rb") as handle:
+            handle.seek(self.offset)
+            data = handle.read(stat.st_size - self.offset)
+        end = data.rfind(b"\n")
+        if end < 0:
+            return []
+        self.offset += end + 1
+        lines = (line.strip() for line in data[:end].decode("utf-8").split("\n"))
+        return _parse_records(line for line in lines if line)
+
+
+def follow(
+    args: argparse.Namespace,
+    *,
+    sleep: Callable[[float], None] = time.sleep,
+    polls: int | None = None,
+) -> Path:
+    """Keep ``today.json`` current while the Chronik exports grow.
+
+    Sources are tailed once, then only appended bytes are read on every poll.
+    The output is rewritten (temp file + rename) only when the kept insight
+    items change. ``polls`` bounds the loop for tests; ``None`` runs forever.
+    """
+    patterns = [args.source] if isinstance(args.source, str) else args.source
+    source_paths = expand_sources(patterns)
+    output_path = Path(args.output).expanduser()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    states = {path: FollowState.at_end(path) for path in source_paths}
+    window = read_last_records_from_sources(
+        source_paths, args.limit, lambda path, limit: states[path].tail(limit)
+    )
+    items, data_bytes = render_insights(window, args.max_bytes)
+    atomic_write_bytes(output_path, data_bytes, fsync=args.fsync)
+
+    done = 0
+    while polls is None or done < polls:
+        sleep(args.poll_interval)
+        done += 1
+        appended = [state.poll() for state in states.values()]
+        if not any(appended):
+            continue
+        if len(states) == 1:
+            window = (window + appended[0])[-args.limit :] if args.limit else []
+        else:
+            window = merge_newest([window, *appended], args.limit)
+        new_items, data_bytes = render_insights(window, args.max_bytes)
+        if new_items != items:
+            items = new_items
+            atomic_write_bytes(output_path, data_bytes, fsync=args.fsync)
     return output_path
 
 
@@ -217,7 +658,11 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     )
     parser.add_argument(
         "source",
-        help="Path to chronik/data/aussen.jsonl",
+        nargs="+",
+        help=(
+            "Path(s) or glob(s) of Chronik JSONL exports, e.g. "
+            "chronik/data/aussen.jsonl or 'chronik/data/*.jsonl'"
+        ),
     )
     parser.add_argument(
         "--output",
@@ -228,7 +673,10 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         "--limit",
         type=int,
         default=DEFAULT_LIMIT,
-        help=f"Number of trailing records to read (default: {DEFAULT_LIMIT})",
+        help=(
+            f"Number of newest records to read across all sources "
+            f"(default: {DEFAULT_LIMIT})"
+        ),
     )
     parser.add_argument(
         "--max-bytes",
@@ -236,13 +684,57 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         default=MAX_BYTES_DEFAULT,
         help="Maximum JSON payload size in bytes (default: 10240)",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help=(
+            f"Maintain a byte-offset sidecar (<source>{INDEX_SUFFIX}) and tail "
+            "through it; only newly appended lines are scanned"
+        ),
+    )
+    parser.add_argument(
+        "--fsync",
+        choices=FSYNC_POLICIES,
+        help=(
+            "Durability of the atomic output replace: none, file (default) or "
+            "full; overrides SEMANTAH_FSYNC"
+        ),
+    )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help=(
+            "Keep running and update the output whenever new records are "
+            "appended (sources are polled)"
+        ),
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help=(
+            f"Seconds between polls in --follow mode (default: {DEFAULT_POLL_INTERVAL})"
+        ),
+    )
+    parser.add_argument(
+        "--since",
+        help=(
+            "Only read records at or after this ISO-8601 timestamp or epoch "
+            "seconds (implies --index)"
+        ),
+    )
+    args = parser.parse_args(argv)
+    if args.follow and (args.since is not None or args.index):
+        parser.error("--follow cannot be combined with --since or --index")
+    return args
 
 
 def main(argv: list[str] | None = None) -> int:
     try:
         args = parse_args(argv)
-        output_path = ingest(args)
+        output_path = follow(args) if args.follow else ingest(args)
+    except KeyboardInterrupt:
+        return 0
     except Exception as exc:  # pragma: no cover - small CLI
         print(f"Error: {exc}", file=sys.stderr)
         # Preserve full traceback for debugging unexpected failures
@@ -1,21 +1,72 @@
 #!/usr/bin/env python3
 """Read Intent-Log JSONL and transform events to graph nodes and edges."""
 
+from __future__ import annotations
+
 import argparse
+import bisect
 import hashlib
+import heapq
 import json
+import os
+import struct
 import sys
 import traceback
+from array import array
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional accelerator
+    orjson = None  # type: ignore[assignment]
+
+try:
+    from scripts.atomic_io import atomic_write_bytes, resolve_fsync_policy
+except ImportError:
+    # Run as `cli/ingest_intents.py`: make the repository root importable.
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+    from scripts.atomic_io import atomic_write_bytes, resolve_fsync_policy
 
 BUFFER_LIMIT_DEFAULT = 5000
+# Shard sizing for --workers: several shards per worker for load balance,
+# bounded so a shard's output stays small in memory.
+SHARDS_PER_WORKER = 4
+MIN_SHARD_BYTES = 1 << 20
+MAX_SHARD_BYTES = 64 << 20
+# Node de-duplication: IDs newer than the last fold are kept in a set of at
+# most this many entries before being merged into the sorted digest array.
+DEDUP_CAPACITY_DEFAULT = 1 << 20
+ID_INDEX_SUFFIX = ".ids"
+ID_INDEX_MAGIC = b"SMIDIDX1"
+ID_INDEX_HEADER = struct.Struct("<8sQQ")  # magic, nodes file size, digest count
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+# Bytes of the source head fingerprinted to detect a replaced source.
+CHECKPOINT_HEAD_BYTES = 64 * 1024
+# Bytes before each recorded output size fingerprinted to recognise the output.
+CHECKPOINT_TAIL_BYTES = 4 * 1024
+# Invalid lines are counted per category; only the first few are kept as
+# examples, shortened to this many characters.
+ERROR_SAMPLES_DEFAULT = 5
+ERROR_SAMPLE_CHARS = 160
+REQUIRED_FIELDS = ("actor", "goal", "ts")
 
 # Consistent JSON formatting
 JSON_DUMPS_OPTIONS = {
     "ensure_ascii": False,
     "separators": (",", ":"),
 }
+# "stdlib" is byte-compatible with json.dumps(**JSON_DUMPS_OPTIONS); "orjson"
+# is faster but formats some floats differently and writes NaN as null;
+# "auto" picks orjson when it is installed.
+ENCODERS = ("stdlib", "orjson", "auto")
 
 
 def sha256_hash(data: str) -> str:
@@ -23,18 +74,13 @@ def sha256_hash(data: str) -> str:
     return hashlib.sha256(data.encode("utf-8")).hexdigest()
 
 
-def process_intent_record(record: Dict[str, Any]) -> List[Dict[str, Any]]:
+def process_intent_record(record: dict[str, Any]) -> list[dict[str, Any]]:
     """Process a single intent record and return a list of graph elements."""
     actor = record.get("actor")
     goal = record.get("goal")
     timestamp = record.get("ts")
 
     if not all([actor, goal, timestamp]):
-        print(
-            f"Warning: Skipping record with missing fields (actor={actor!r}, "
-            f"goal={goal!r}, ts={timestamp!r})",
-            file=sys.stderr,
-        )
         return []
 
     intent_id = f"intent:{sha256_hash(f'{timestamp}{actor}{goal}')}"
@@ -82,67 +128,677 @@ def process_intent_record(record: Dict[str, Any]) -> List[Dict[str, Any]]:
     return nodes + edges
 
 
+def node_id_digest(node_id: str) -> int:
+    """Return the 63-bit digest under which a node ID is de-duplicated."""
+    digest = hashlib.blake2b(node_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") >> 1
+
+
+class NodeIdIndex:
+    """Bounded-memory set of node IDs already written to a nodes file.
+
+    IDs are stored as 63-bit digests: recent ones in a set, older ones in a
+    sorted ``array('q')`` (8 bytes per ID) searched with ``bisect``. When the
+    set reaches ``capacity`` it is folded into the array. The array can be
+    persisted next to the nodes file to de-duplicate across runs.
+    """
+
+    def __init__(
+        self,
+        digests: array | None = None,
+        *,
+        capacity: int = DEDUP_CAPACITY_DEFAULT,
+    ):
+        self._sorted = digests if digests is not None else array("q")
+        self._recent: set = set()
+        self.capacity = capacity
+        self.suppressed = 0
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._recent)
+
+    def __contains__(self, node_id: str) -> bool:
+        return self._contains_digest(node_id_digest(node_id))
+
+    def _contains_digest(self, digest: int) -> bool:
+        if digest in self._recent:
+            return True
+        position = bisect.bisect_left(self._sorted, digest)
+        return position < len(self._sorted) and self._sorted[position] == digest
+
+    def add(self, node_id: str) -> bool:
+        """Record ``node_id``; return False (and count it) if it was seen before."""
+        digest = node_id_digest(node_id)
+        if self._contains_digest(digest):
+            self.suppressed += 1
+            return False
+        self._recent.add(digest)
+        if len(self._recent) >= self.capacity:
+            self._fold()
+        return True
+
+    def _fold(self) -> None:
+        merged = heapq.merge(self._sorted, sorted(self._recent))
+        self._sorted = array("q", merged)
+        self._recent.clear()
+
+    @classmethod
+    def load(
+        cls,
+        index_path: Path,
+        nodes_path: Path,
+        *,
+        capacity: int = DEDUP_CAPACITY_DEFAULT,
+    ) -> NodeIdIndex:
+        """Load the persisted index, rebuilding it if it is missing or stale.
+
+        The index records the nodes file size it describes; any mismatch (e.g.
+        an interrupted run or an edited nodes file) triggers a rescan of the
+        node IDs in ``nodes_path``.
+        """
+        nodes_size = nodes_path.stat().st_size if nodes_path.exists() else 0
+        try:
+            with index_path.open("rb") as handle:
+                header = handle.read(ID_INDEX_HEADER.size)
+                magic, recorded_size, count = ID_INDEX_HEADER.unpack(header)
+                if magic == ID_INDEX_MAGIC and recorded_size == nodes_size:
+                    digests = array("q")
+                    digests.fromfile(handle, count)
+                    return cls(digests, capacity=capacity)
+        except (FileNotFoundError, struct.error, EOFError):
+            pass
+        return cls.from_nodes_file(nodes_path, capacity=capacity)
+
+    @classmethod
+    def from_nodes_file(
+        cls, nodes_path: Path, *, capacity: int = DEDUP_CAPACITY_DEFAULT
+    ) -> NodeIdIndex:
+        """Build the index from the IDs already present in ``nodes_path``."""
+        index = cls(capacity=capacity)
+        if nodes_path.exists():
+            with nodes_path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        node_id = json.loads(line).get("id")
+                    except (json.JSONDecodeError, AttributeError):
+                        continue
+                    if isinstance(node_id, str):
+                        index.add(node_id)
+        index.suppressed = 0
+        return index
+
+    def save(self, index_path: Path, nodes_path: Path) -> None:
+        """Atomically persist the digests for the current nodes file size."""
+        self._fold()
+        header = ID_INDEX_HEADER.pack(
+            ID_INDEX_MAGIC, nodes_path.stat().st_size, len(self._sorted)
+        )
+        atomic_write_bytes(index_path, header + self._sorted.tobytes(), fsync="none")
+
+
+class JsonLineEncoder:
+    """Encode graph elements as newline-terminated UTF-8 JSON lines."""
+
+    def __init__(self, backend: str = "stdlib"):
+        if backend not in ENCODERS:
+            raise ValueError(f"Unknown encoder {backend!r}; expected one of {ENCODERS}")
+        if backend == "orjson" and orjson is None:
+            raise RuntimeError("orjson is required for --encoder orjson")
+        if backend == "auto":
+            backend = "stdlib" if orjson is None else "orjson"
+        self.backend = backend
+        # json.dumps builds a new JSONEncoder per call when given options;
+        # reusing one instance yields the same bytes without that overhead.
+        self._stdlib = json.JSONEncoder(**JSON_DUMPS_OPTIONS).encode
+
+    def encode(self, element: dict[str, Any]) -> bytes:
+        if self.backend == "orjson":
+            try:
+                return orjson.dumps(
+                    element, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+                )
+            except TypeError:
+                # orjson.JSONEncodeError subclasses TypeError. Values orjson
+                # rejects (integers beyond 64 bits) are valid for json.
+                pass
+        return (self._stdlib(element) + "\n").encode("utf-8")
+
+    def encode_batch(self, elements: list[dict[str, Any]]) -> bytes:
+        """Encode all ``elements`` into one buffer, one line each."""
+        if not elements:
+            return b""
+        if self.backend == "orjson":
+            return b"".join(map(self.encode, elements))
+        return ("\n".join(map(self._stdlib, elements)) + "\n").encode("utf-8")
+
+
+class IngestErrors:
+    """Count skipped source lines per category and keep the first examples.
+
+    Categories: ``invalid_utf8``, ``invalid_json``, ``missing_fields`` and
+    ``invalid_record`` (any other failure while building graph elements).
+    Shards collect their own instance; :meth:`merge` in file order keeps the
+    examples the first ones of the whole source.
+    """
+
+    def __init__(self, max_samples: int = ERROR_SAMPLES_DEFAULT):
+        self.max_samples = max_samples
+        self.counts: dict[str, int] = {}
+        self.samples: dict[str, list[str]] = {}
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def record(self, category: str, offset: int, message: str, line: str) -> None:
+        self.counts[category] = self.counts.get(category, 0) + 1
+        samples = self.samples.setdefault(category, [])
+        if len(samples) < self.max_samples:
+            if len(line) > ERROR_SAMPLE_CHARS:
+                line = line[:ERROR_SAMPLE_CHARS] + "..."
+            samples.append(f"byte {offset}: {message}: {line}")
+
+    def merge(self, other: IngestErrors) -> None:
+        for category, count in other.counts.items():
+            self.counts[category] = self.counts.get(category, 0) + count
+            samples = self.samples.setdefault(category, [])
+            room = self.max_samples - len(samples)
+            samples.extend(other.samples.get(category, [])[: max(room, 0)])
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            category: {"count": count, "samples": self.samples.get(category, [])}
+            for category, count in sorted(self.counts.items())
+        }
+
+    def report(self) -> str:
+        """Return a human-readable summary, one block per category."""
+        lines = [f"Skipped {self.total} invalid lines:"]
+        for category, entry in self.as_dict().items():
+            lines.append(f"  {category}: {entry['count']}")
+            lines.extend(f"    {sample}" for sample in entry["samples"])
+        return "\n".join(lines)
+
+
+def line_elements(
+    line: str,
+    keep_node: Callable[[str], bool] | None = None,
+    errors: IngestErrors | None = None,
+    offset: int = 0,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Turn one JSONL line into node and edge elements.
+
+    ``keep_node`` filters nodes by ID. Bad lines yield no output and are
+    counted in ``errors`` (if given) together with their source ``offset``.
+    """
+    nodes: list[dict[str, Any]] = []
+    edges: list[dict[str, Any]] = []
+    try:
+        record = json.loads(line)
+        missing = [field for field in REQUIRED_FIELDS if not record.get(field)]
+        if missing:
+            if errors is not None:
+                errors.record("missing_fields", offset, ",".join(missing), line)
+            return nodes, edges
+        for element in process_intent_record(record):
+            if "rel" in element:  # It's an edge
+                edges.append(element)
+            elif keep_node is None or keep_node(element["id"]):  # It's a node
+                nodes.append(element)
+    except json.JSONDecodeError as e:
+        if errors is not None:
+            errors.record("invalid_json", offset, e.msg, line)
+    except Exception as e:
+        if errors is not None:
+            errors.record("invalid_record", offset, f"{type(e).__name__}: {e}", line)
+    return nodes, edges
+
+
+def _decode_line(raw: bytes, errors: IngestErrors | None, offset: int) -> str | None:
+    """Decode and strip one source line; ``None`` for lines to skip."""
+    try:
+        line = raw.decode("utf-8").strip()
+    except UnicodeDecodeError as e:
+        if errors is not None:
+            errors.record(
+                "invalid_utf8",
+                offset,
+                e.reason,
+                repr(raw.rstrip(b"\r\n")[:ERROR_SAMPLE_CHARS]),
+            )
+        return None
+    return line or None
+
+
+def shard_ranges(
+    source_path: Path, shard_bytes: int, *, start: int = 0, end: int | None = None
+) -> list[tuple[int, int]]:
+    """Split ``[start, end)`` of the source into ranges on line boundaries.
+
+    ``start`` must be a line start and ``end`` (default: file size) a line
+    end or the end of the file.
+    """
+    size = source_path.stat().st_size if end is None else end
+    ranges: list[tuple[int, int]] = []
+    with source_path.open("rb") as handle:
+        while start < size:
+            end = start + shard_bytes
+            if end < size:
+                handle.seek(end)
+                handle.readline()  # advance to the start of the next line
+                end = handle.tell()
+            end = min(end, size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def process_shard(
+    source_path: Path,
+    start: int,
+    end: int,
+    encoder: str = "stdlib",
+    max_error_samples: int = ERROR_SAMPLES_DEFAULT,
+) -> tuple[list[str], list[bytes], bytes, int, IngestErrors, int]:
+    """Encode all lines in one byte range, in file order.
+
+    Returns node IDs with their encoded lines, the edges as one encoded
+    buffer plus their count, the shard's :class:`IngestErrors` and the number
+    of duplicate nodes dropped within the shard. The writer removes
+    duplicates across shards and runs.
+    """
+    with source_path.open("rb") as handle:
+        handle.seek(start)
+        data = handle.read(end - start)
+    nodes: list[dict[str, Any]] = []
+    edges: list[dict[str, Any]] = []
+    shard_seen: set = set()
+    suppressed = 0
+
+    def keep_node(node_id: str) -> bool:
+        nonlocal suppressed
+        if node_id in shard_seen:
+            suppressed += 1
+            return False
+        shard_seen.add(node_id)
+        return True
+
+    errors = IngestErrors(max_error_samples)
+    offset = start
+    # Split on "\n" only, like iterating the binary file in the serial path.
+    for raw in data.split(b"\n"):
+        line = _decode_line(raw, errors, offset)
+        if line is not None:
+            shard_nodes, shard_edges = line_elements(line, keep_node, errors, offset)
+            nodes.extend(shard_nodes)
+            edges.extend(shard_edges)
+        offset += len(raw) + 1
+    line_encoder = JsonLineEncoder(encoder)
+    node_lines = [line_encoder.encode(node) for node in nodes]
+    return (
+        [n["id"] for n in nodes],
+        node_lines,
+        line_encoder.encode_batch(edges),
+        len(edges),
+        errors,
+        suppressed,
+    )
+
+
+def _ordered_shard_results(
+    source_path: Path,
+    ranges: list[tuple[int, int]],
+    workers: int,
+    encoder: str,
+    max_error_samples: int,
+) -> Iterable[tuple[list[str], list[bytes], bytes, int, IngestErrors, int]]:
+    """Process shards in a pool and yield results in input order.
+
+    At most ``2 * workers`` shards are in flight, which bounds the memory held
+    by finished-but-not-yet-written shard outputs.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for start, end in ranges:
+            pending.append(
+                pool.submit(
+                    process_shard, source_path, start, end, encoder, max_error_samples
+                )
+            )
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
 def ingest_intents(
     source_path: Path,
     nodes_path: Path,
     edges_path: Path,
     buffer_limit: int = BUFFER_LIMIT_DEFAULT,
-):
-    """Ingest intents from the source file and append to nodes and edges files."""
+    workers: int = 1,
+    id_index_path: Path | None = None,
+    dedup_capacity: int = DEDUP_CAPACITY_DEFAULT,
+    checkpoint_path: Path | None = None,
+    encoder: str = "stdlib",
+    errors: IngestErrors | None = None,
+) -> dict[str, int]:
+    """Ingest intents from the source file and append to nodes and edges files.
+
+    Each node ID is written once per nodes file: within a run via an
+    in-memory :class:`NodeIdIndex`, across runs when ``id_index_path`` points
+    to its persisted form. With ``workers > 1`` the source is split into
+    newline-aligned byte ranges that are processed in a process pool; output
+    order matches the serial run.
+
+    With ``checkpoint_path`` the run resumes after the last committed source
+    offset (see :class:`Checkpoint`) and only consumes newline-terminated
+    lines. ``encoder`` selects the :class:`JsonLineEncoder` backend. Skipped
+    lines are counted in ``errors`` instead of being reported one by one.
+    Returns written/suppressed/invalid counts and the consumed byte range.
+    """
     nodes_path.parent.mkdir(parents=True, exist_ok=True)
     edges_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with (
-        source_path.open("r", encoding="utf-8") as handle,
-        nodes_path.open("a", encoding="utf-8") as nodes_file,
-        edges_path.open("a", encoding="utf-8") as edges_file,
+    start = 0
+    if checkpoint_path is not None:
+        # Must run before the ID index is loaded: it may truncate nodes_path.
+        start = resume_offset(checkpoint_path, source_path, nodes_path, edges_path)
+    if id_index_path is not None:
+        seen = NodeIdIndex.load(id_index_path, nodes_path, capacity=dedup_capacity)
+    else:
+        seen = NodeIdIndex(capacity=dedup_capacity)
+    if errors is None:
+        errors = IngestErrors()
+    line_encoder = JsonLineEncoder(encoder)
+    writer = _GraphWriter(
+        source_path, nodes_path, edges_path, checkpoint_path, line_encoder
+    )
+
+    with writer:
+        _ingest(source_path, start, buffer_limit, workers, seen, writer, errors)
+    # Only a completed run may persist the index: after a failure ``seen`` can
+    # hold IDs that never reached the nodes file. The index left on disk then
+    # no longer matches the nodes file size and the next run rescans it.
+    if id_index_path is not None:
+        seen.save(id_index_path, nodes_path)
+    stats = dict(writer.stats)
+    stats["duplicate_nodes_suppressed"] = seen.suppressed
+    stats["invalid_lines"] = errors.total
+    stats["start_offset"] = start
+    stats["end_offset"] = writer.offset
+    return stats
+
+
+def source_fingerprint(source_path: Path) -> tuple[int, str]:
+    """Return the length and blake2b digest of the source head."""
+    with source_path.open("rb") as handle:
+        head = handle.read(CHECKPOINT_HEAD_BYTES)
+    return len(head), hashlib.blake2b(head, digest_size=16).hexdigest()
+
+
+def output_identity(path: Path, size: int) -> tuple[int, str]:
+    """Return the inode of ``path`` and a digest of its bytes before ``size``."""
+    with path.open("rb") as handle:
+        handle.seek(max(0, size - CHECKPOINT_TAIL_BYTES))
+        tail = handle.read(min(size, CHECKPOINT_TAIL_BYTES))
+        inode = os.fstat(handle.fileno()).st_ino
+    return inode, hashlib.blake2b(tail, digest_size=16).hexdigest()
+
+
+@dataclass
+class Checkpoint:
+    """Committed progress of an ingest: source position and output sizes.
+
+    Written atomically after outputs are flushed, so the recorded sizes never
+    exceed what is on disk. Output bytes beyond them come from a run that died
+    before its next commit and are truncated on resume; the matching source
+    lines are processed again. Each output is also identified by its inode and
+    a digest of the bytes before the recorded size (:func:`output_identity`),
+    so a file replaced or rewritten by another tool is never truncated.
+    """
+
+    source: str
+    head_len: int
+    head_digest: str
+    offset: int
+    nodes_size: int
+    edges_size: int
+    nodes_inode: int
+    nodes_tail: str
+    edges_inode: int
+    edges_tail: str
+
+    @classmethod
+    def load(cls, path: Path) -> Checkpoint | None:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return cls(**data)
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            return None
+
+    def save(self, path: Path) -> None:
+        atomic_write_bytes(path, json.dumps(asdict(self), indent=2).encode("utf-8"))
+
+    def matches(self, source_path: Path) -> bool:
+        """True if ``source_path`` is the checkpointed source, possibly grown."""
+        size = source_path.stat().st_size
+        if size < self.offset or size < self.head_len:
+            return False
+        # Compare as many head bytes as existed when the checkpoint was taken.
+        with source_path.open("rb") as handle:
+            head = handle.read(self.head_len)
+        return hashlib.blake2b(head, digest_size=16).hexdigest() == self.head_digest
+
+    def owns(self, path: Path, size: int, inode: int, tail: str) -> bool:
+        """True if ``path`` is still the output this checkpoint was taken of."""
+        if not path.exists() or path.stat().st_size < size:
+            return False
+        return output_identity(path, size) == (inode, tail)
+
+
+def resume_offset(
+    checkpoint_path: Path, source_path: Path, nodes_path: Path, edges_path: Path
+) -> int:
+    """Roll outputs back to the checkpoint and return the source offset to resume.
+
+    Returns 0 without touching the outputs when there is no usable checkpoint
+    or an output is not the one checkpointed (it was reset, replaced or
+    rewritten since). Outputs are still rolled back when the source itself was
+    replaced, because their tail belongs to the interrupted run.
+    """
+    checkpoint = Checkpoint.load(checkpoint_path)
+    if checkpoint is None:
+        return 0
+    outputs = (
+        (
+            nodes_path,
+            checkpoint.nodes_size,
+            checkpoint.nodes_inode,
+            checkpoint.nodes_tail,
+        ),
+        (
+            edges_path,
+            checkpoint.edges_size,
+            checkpoint.edges_inode,
+            checkpoint.edges_tail,
+        ),
+    )
+    if not all(checkpoint.owns(*output) for output in outputs):
+        return 0
+    for path, size, _, _ in outputs:
+        if path.stat().st_size > size:
+            os.truncate(path, size)
+    return checkpoint.offset if checkpoint.matches(source_path) else 0
+
+
+class _GraphWriter:
+    """Append node/edge lines and commit checkpoints at flush boundaries."""
+
+    def __init__(
+        self,
+        source_path: Path,
+        nodes_path: Path,
+        edges_path: Path,
+        checkpoint_path: Path | None,
+        encoder: JsonLineEncoder,
     ):
-        nodes_buffer = []
-        edges_buffer = []
+        self.source_path = source_path
+        self.encoder = encoder
+        self.nodes_path = nodes_path
+        self.edges_path = edges_path
+        self.checkpoint_path = checkpoint_path
+        self.offset = 0
+        self.stats = {"nodes_written": 0, "edges_written": 0}
+        # Set while a write is in progress; a failed write must not be retried
+        # with the same buffers, or committed output would be duplicated.
+        self.failed = False
+
+    def __enter__(self) -> Self:
+        self._nodes = self.nodes_path.open("ab")
+        self._edges = self.edges_path.open("ab")
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._nodes.close()
+        self._edges.close()
+
+    def write(
+        self, nodes: list[dict[str, Any]], edges: list[dict[str, Any]], offset: int
+    ) -> None:
+        """Encode and append output for all source bytes before ``offset``."""
+        self.failed = True
+        self.write_encoded(
+            self.encoder.encode_batch(nodes),
+            self.encoder.encode_batch(edges),
+            len(nodes),
+            len(edges),
+            offset,
+        )
+
+    def write_encoded(
+        self,
+        nodes: bytes,
+        edges: bytes,
+        node_count: int,
+        edge_count: int,
+        offset: int,
+    ) -> None:
+        """Append encoded output for all source bytes before ``offset`` and commit."""
+        self.failed = True
+        self._nodes.write(nodes)
+        self._edges.write(edges)
+        self.stats["nodes_written"] += node_count
+        self.stats["edges_written"] += edge_count
+        self.offset = offset
+        if self.checkpoint_path is None:
+            self.failed = False
+            return
+        self._nodes.flush()
+        self._edges.flush()
+        if resolve_fsync_policy() != "none":
+            os.fsync(self._nodes.fileno())
+            os.fsync(self._edges.fileno())
+        head_len, head_digest = source_fingerprint(self.source_path)
+        nodes_size = os.fstat(self._nodes.fileno()).st_size
+        edges_size = os.fstat(self._edges.fileno()).st_size
+        nodes_inode, nodes_tail = output_identity(self.nodes_path, nodes_size)
+        edges_inode, edges_tail = output_identity(self.edges_path, edges_size)
+        Checkpoint(
+            source=str(self.source_path),
+            head_len=head_len,
+            head_digest=head_digest,
+            offset=offset,
+            nodes_size=nodes_size,
+            edges_size=edges_size,
+            nodes_inode=nodes_inode,
+            nodes_tail=nodes_tail,
+            edges_inode=edges_inode,
+            edges_tail=edges_tail,
+        ).save(self.checkpoint_path)
+        self.failed = False
+
+
+def _ingest(
+    source_path: Path,
+    start: int,
+    buffer_limit: int,
+    workers: int,
+    seen: NodeIdIndex,
+    writer: _GraphWriter,
+    errors: IngestErrors,
+) -> None:
+    writer.offset = start
+    # Resumable runs leave an unterminated last line for the next run.
+    complete_only = writer.checkpoint_path is not None
+    if workers > 1:
+        size = source_path.stat().st_size
+        end = _complete_end(source_path, size) if complete_only else size
+        shard_bytes = (end - start) // (workers * SHARDS_PER_WORKER)
+        shard_bytes = min(MAX_SHARD_BYTES, max(MIN_SHARD_BYTES, shard_bytes))
+        ranges = shard_ranges(source_path, shard_bytes, start=start, end=end)
+        results = _ordered_shard_results(
+            source_path, ranges, workers, writer.encoder.backend, errors.max_samples
+        )
+        for (_, shard_end), shard in zip(ranges, results, strict=True):
+            node_ids, node_lines, edges, edge_count, shard_errors, suppressed = shard
+            errors.merge(shard_errors)
+            seen.suppressed += suppressed
+            kept = [
+                encoded
+                for node_id, encoded in zip(node_ids, node_lines, strict=True)
+                if seen.add(node_id)
+            ]
+            writer.write_encoded(
+                b"".join(kept), edges, len(kept), edge_count, shard_end
+            )
+        return
+
+    with source_path.open("rb") as handle:
+        handle.seek(start)
+        offset = start
+        nodes_buffer: list[dict[str, Any]] = []
+        edges_buffer: list[dict[str, Any]] = []
 
         try:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    record = json.loads(line)
-                    elements = process_intent_record(record)
-                    for element in elements:
-                        line_out = json.dumps(element, **JSON_DUMPS_OPTIONS) + "\n"
-                        if "rel" in element:  # It's an edge
-                            edges_buffer.append(line_out)
-                        else:  # It's a node
-                            nodes_buffer.append(line_out)
-
-                    if len(nodes_buffer) >= buffer_limit:
-                        nodes_file.writelines(nodes_buffer)
-                        nodes_buffer.clear()
-                    if len(edges_buffer) >= buffer_limit:
-                        edges_file.writelines(edges_buffer)
-                        edges_buffer.clear()
-
-                except json.JSONDecodeError:
-                    print(
-                        f"Warning: Could not decode JSON: {line}",
-                        file=sys.stderr,
-                    )
-                except Exception as e:
-                    print(
-                        f"Warning: Failed to process record: {e}",
-                        file=sys.stderr,
-                    )
-                    # We do not print full traceback here to avoid log spam on bulk ingest,
-                    # but we continue to the next record.
+            for raw in handle:
+                if complete_only and not raw.endswith(b"\n"):
+                    break
+                line = _decode_line(raw, errors, offset)
+                if line is not None:
+                    nodes, edges = line_elements(line, seen.add, errors, offset)
+                    nodes_buffer.extend(nodes)
+                    edges_buffer.extend(edges)
+                offset += len(raw)
+
+                if (
+                    len(nodes_buffer) >= buffer_limit
+                    or len(edges_buffer) >= buffer_limit
+                ):
+                    writer.write(nodes_buffer, edges_buffer, offset)
+                    nodes_buffer.clear()
+                    edges_buffer.clear()
 
         finally:
             # Flush remaining buffers
-            if nodes_buffer:
-                nodes_file.writelines(nodes_buffer)
-                nodes_buffer.clear()
-            if edges_buffer:
-                edges_file.writelines(edges_buffer)
-                edges_buffer.clear()
+            pending = nodes_buffer or edges_buffer or offset != writer.offset
+            if pending and not writer.failed:
+                writer.write(nodes_buffer, edges_buffer, offset)
+
+
+def _complete_end(source_path: Path, size: int) -> int:
+    """Return the offset just past the last newline of the source."""
+    with source_path.open("rb") as handle:
+        position = size
+        while position > 0:
+            step = min(64 * 1024, position)
+            handle.seek(position - step)
+            block = handle.read(step)
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                return position - step + newline + 1
+            position -= step
+    return 0
 
 
 def positive_int(value: str) -> int:
@@ -152,7 +808,7 @@ def positive_int(value: str) -> int:
     except ValueError:
         raise argparse.ArgumentTypeError(f"{value} is not an integer")
     if ivalue < 1:
-        raise argparse.ArgumentTypeError("buffer-limit must be at least 1")
+        raise argparse.ArgumentTypeError(f"{value} must be at least 1")
     return ivalue
 
 
@@ -182,16 +838,99 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         "--buffer-limit",
         type=positive_int,
         default=BUFFER_LIMIT_DEFAULT,
-        help=f"Number of records to buffer before writing (default: {BUFFER_LIMIT_DEFAULT})",
+        help=(
+            "Number of records to buffer before writing "
+            f"(default: {BUFFER_LIMIT_DEFAULT})"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=1,
+        help=(
+            "Process the source in newline-aligned shards with this many "
+            "processes; output order is unchanged (default: 1)"
+        ),
+    )
+    parser.add_argument(
+        "--encoder",
+        choices=ENCODERS,
+        default="stdlib",
+        help=(
+            "JSON encoder: stdlib (byte-compatible, default), orjson (faster; "
+            "float formatting may differ) or auto (orjson if installed)"
+        ),
+    )
+    parser.add_argument(
+        "--error-samples",
+        type=positive_int,
+        default=ERROR_SAMPLES_DEFAULT,
+        help=(
+            "Example lines kept per error category for the summary at the end "
+            f"(default: {ERROR_SAMPLES_DEFAULT})"
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            f"Checkpoint progress in <nodes-file>{CHECKPOINT_SUFFIX} and only "
+            "process intents appended since the last run (implies --dedup-index)"
+        ),
+    )
+    parser.add_argument(
+        "--dedup-index",
+        action="store_true",
+        help=(
+            f"Persist written node IDs in <nodes-file>{ID_INDEX_SUFFIX} so "
+            "nodes are not repeated across runs"
+        ),
+    )
+    parser.add_argument(
+        "--dedup-capacity",
+        type=positive_int,
+        default=DEDUP_CAPACITY_DEFAULT,
+        help=(
+            "Node IDs kept in the fast in-memory set before folding them into "
+            f"the compact sorted index (default: {DEDUP_CAPACITY_DEFAULT})"
+        ),
     )
     return parser.parse_args(argv)
 
 
 def main(argv: list[str] | None = None) -> int:
     """Main function."""
+    errors = IngestErrors()
     try:
         args = parse_args(argv)
-        ingest_intents(args.source, args.nodes_file, args.edges_file, args.buffer_limit)
+        errors.max_samples = args.error_samples
+        id_index_path = None
+        # Resumed runs append to existing nodes, so they need the ID index too.
+        if args.dedup_index or args.resume:
+            id_index_path = args.nodes_file.with_name(
+                args.nodes_file.name + ID_INDEX_SUFFIX
+            )
+        stats = ingest_intents(
+            args.source,
+            args.nodes_file,
+            args.edges_file,
+            args.buffer_limit,
+            workers=args.workers,
+            id_index_path=id_index_path,
+            dedup_capacity=args.dedup_capacity,
+            checkpoint_path=(
+                args.nodes_file.with_name(args.nodes_file.name + CHECKPOINT_SUFFIX)
+                if args.resume
+                else None
+            ),
+            encoder=args.encoder,
+            errors=errors,
+        )
+        if stats["duplicate_nodes_suppressed"]:
+            print(
+                f"Suppressed {stats['duplicate_nodes_suppressed']} duplicate nodes",
+                file=sys.stderr,
+            )
         return 0
     except (OSError, ValueError) as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -200,6 +939,9 @@ def main(argv: list[str] | None = None) -> int:
         print(f"Unexpected error: {e}", file=sys.stderr)
         traceback.print_exc()
         return 1
+    finally:
+        if errors.total:
+            print(errors.report(), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,173 @@
+"""
+atomic_io.py
+
+Atomic file replacement for artifacts that other processes read while they are
+being regenerated (today.json, insights.daily.json, observatory and integrity
+reports). Data is written to a temporary sibling and renamed over the target,
+so readers see either the old or the new file, never a partial one.
+
+Fsync policies:
+- ``none``: rename only; fastest, may lose the new content on power loss.
+- ``file``: fsync the temporary file before the rename (default).
+- ``full``: additionally fsync the directory so the rename itself is durable.
+
+The default can be overridden with ``SEMANTAH_FSYNC``. :class:`AtomicBatch`
+writes several files with one fsync pass and one directory sync per folder.
+"""
+
+from __future__ import annotations
+
+import os
+import secrets
+import stat
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+FSYNC_POLICIES = ("none", "file", "full")
+DEFAULT_FSYNC_POLICY = "file"
+FSYNC_ENV = "SEMANTAH_FSYNC"
+
+
+def resolve_fsync_policy(policy: str | None = None) -> str:
+    """Return ``policy``, or the ``SEMANTAH_FSYNC`` / built-in default."""
+    resolved = policy or os.environ.get(FSYNC_ENV) or DEFAULT_FSYNC_POLICY
+    if resolved not in FSYNC_POLICIES:
+        raise ValueError(
+            f"Unknown fsync policy {resolved!r}; expected one of {FSYNC_POLICIES}"
+        )
+    return resolved
+
+
+def _temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+
+
+def _write_temp(path: Path, data: bytes) -> Path:
+    """Write ``data`` to a new temporary sibling of ``path`` and return it."""
+    tmp_path = _temp_path(path)
+    # os.open with 0o666 keeps the usual umask-derived permissions of new files.
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path
+
+
+def _fsync_file(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _keep_mode(tmp_path: Path, target: Path) -> None:
+    """Give ``tmp_path`` the permission bits of an existing ``target``."""
+    try:
+        mode = os.stat(target).st_mode
+    except FileNotFoundError:
+        return
+    os.chmod(tmp_path, stat.S_IMODE(mode))
+
+
+def _fsync_dir(directory: Path) -> None:
+    if os.name == "nt":  # pragma: no cover - directories cannot be opened on Windows
+        return
+    fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(
+    path: Path | str, data: bytes, *, fsync: str | None = None
+) -> Path:
+    """Atomically replace ``path`` with ``data`` under the given fsync policy."""
+    with AtomicBatch(fsync=fsync) as batch:
+        batch.write_bytes(path, data)
+    return Path(path)
+
+
+def atomic_write_text(
+    path: Path | str,
+    text: str,
+    *,
+    encoding: str = "utf-8",
+    fsync: str | None = None,
+) -> Path:
+    """Atomically replace ``path`` with ``text``."""
+    return atomic_write_bytes(path, text.encode(encoding), fsync=fsync)
+
+
+class AtomicBatch:
+    """Stage several atomic replacements and commit them together.
+
+    Temporary files are written immediately; on a clean exit they are synced
+    (per policy), renamed over their targets in staging order, and each
+    affected directory is synced once. Replaced files keep their permission
+    bits; new files get the umask defaults. If the block raises, no target is
+    touched and the temporary files are removed.
+
+    :meth:`open` stages a file that is streamed rather than written at once
+    (e.g. large JSONL artifacts); its handle is closed when the batch exits.
+    """
+
+    def __init__(self, *, fsync: str | None = None):
+        self.fsync = resolve_fsync_policy(fsync)
+        self._staged: list[tuple[Path, Path]] = []
+        self._handles: list[BinaryIO] = []
+
+    def write_bytes(self, path: Path | str, data: bytes) -> None:
+        target = Path(path)
+        self._staged.append((_write_temp(target, data), target))
+
+    def write_text(
+        self, path: Path | str, text: str, *, encoding: str = "utf-8"
+    ) -> None:
+        self.write_bytes(path, text.encode(encoding))
+
+    def open(self, path: Path | str) -> BinaryIO:
+        """Return a binary handle to a new temporary file replacing ``path``."""
+        target = Path(path)
+        tmp_path = _temp_path(target)
+        handle = open(tmp_path, "xb")  # noqa: SIM115 - closed in __exit__
+        self._staged.append((tmp_path, target))
+        self._handles.append(handle)
+        return handle
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        staged, self._staged = self._staged, []
+        handles, self._handles = self._handles, []
+        for handle in handles:
+            handle.close()
+        if exc_type is not None:
+            for tmp_path, _ in staged:
+                tmp_path.unlink(missing_ok=True)
+            return
+        try:
+            for tmp_path, target in staged:
+                _keep_mode(tmp_path, target)
+            if self.fsync != "none":
+                for tmp_path, _ in staged:
+                    _fsync_file(tmp_path)
+            for index, (tmp_path, target) in enumerate(staged):
+                os.replace(tmp_path, target)
+                staged[index] = (target, target)
+        except BaseException:
+            for tmp_path, target in staged:
+                if tmp_path != target:
+                    tmp_path.unlink(missing_ok=True)
+            raise
+        if self.fsync == "full":
+            for directory in dict.fromkeys(target.parent for _, target in staged):
+                _fsync_dir(directory)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Benchmark artifact write latency for each fsync policy of atomic_io.
+
+Compares a plain ``write_bytes`` (the previous behaviour) with atomic
+replacement under the ``none``, ``file`` and ``full`` policies, and a batch of
+several files committed together.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def _measure(write, iterations: int) -> dict[str, float]:
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        write(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": _percentile(samples, 0.5),
+        "p95_ms": _percentile(samples, 0.95),
+    }
+
+
+def main() -> int:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from scripts.atomic_io import FSYNC_POLICIES, AtomicBatch, atomic_write_bytes
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-kb", type=int, default=10, help="payload size")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=3, help="files per batch")
+    parser.add_argument(
+        "--dir", type=Path, help="target directory (default: temporary dir)"
+    )
+    args = parser.parse_args()
+
+    payload = b"x" * (args.size_kb * 1024)
+    with tempfile.TemporaryDirectory(prefix="atomic-write-", dir=args.dir) as tmp:
+        target = Path(tmp) / "today.json"
+        results = {
+            "write_bytes": _measure(
+                lambda _: target.write_bytes(payload), args.iterations
+            )
+        }
+        for policy in FSYNC_POLICIES:
+            results[f"atomic[{policy}]"] = _measure(
+                lambda _, policy=policy: atomic_write_bytes(
+                    target, payload, fsync=policy
+                ),
+                args.iterations,
+            )
+
+        def batch_write(_, policy: str) -> None:
+            with AtomicBatch(fsync=policy) as batch:
+                for n in range(args.batch):
+                    batch.write_bytes(Path(tmp) / f"artifact-{n}.json", payload)
+
+        for policy in ("file", "full"):
+            results[f"batch{args.batch}[{policy}]"] = _measure(
+                lambda i, policy=policy: batch_write(i, policy), args.iterations
+            )
+
+    print(f"{args.iterations} writes of {args.size_kb} KiB")
+    for name, stats in results.items():
+        print(
+            f"{name:<16} mean {stats['mean_ms']:8.3f} ms  "
+            f"p50 {stats['p50_ms']:8.3f} ms  p95 {stats['p95_ms']:8.3f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Benchmark exact vs. ivf neighbour search of `tools/build_graph.py`.
+
+Generates clustered unit vectors (topic centres plus noise, similar to note
+centroids), estimates the exact all-pairs search from a sample of rows, then
+runs the ivf mode for each ``--probes`` value and reports its search time and
+recall@k against the exact neighbours of the sample.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+
+def main() -> int:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    import numpy as np
+
+    from tools import build_graph as bg
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=2000)
+    parser.add_argument("--noise", type=float, default=1.0)
+    parser.add_argument("-k", type=int, default=bg.K)
+    parser.add_argument("--lists", type=int, help="default: √notes")
+    parser.add_argument("--probes", default="1,2,4,8,16")
+    parser.add_argument("--sample", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centres = rng.normal(size=(args.clusters, args.dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, args.clusters, args.notes)]
+    vectors += rng.normal(scale=args.noise, size=vectors.shape).astype(np.float32)
+    vectors = bg._normalise(vectors)
+    rows = np.sort(rng.choice(args.notes, min(args.sample, args.notes), replace=False))
+
+    start = time.perf_counter()
+    bg._exact_rows(vectors, rows, args.k)
+    exact = (time.perf_counter() - start) * args.notes / len(rows)
+    print(f"{args.notes} notes, dim {args.dim}, k {args.k}")
+    print(f"exact  ≈{exact:8.1f} s (extrapolated from {len(rows)} rows)")
+    for probes in (int(p) for p in args.probes.split(",")):
+        start = time.perf_counter()
+        indices, _ = bg.ivf_neighbors(vectors, args.k, lists=args.lists, probes=probes)
+        elapsed = time.perf_counter() - start
+        recall = bg.recall_at_k(vectors, indices, rows)
+        print(
+            f"ivf probes={probes:<3} {elapsed:8.1f} s ({exact / elapsed:5.1f}x), "
+            f"recall@{args.k} {recall:.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Benchmark Chronik tail reading on a large JSONL export with long lines.
+
+Compares the previous chunked backwards reader with the memory-mapped
+`read_last_records` from `cli/ingest_chronik.py` on the same generated file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+
+# Original read_last_records implementation for comparison
+def read_last_records_original(path: Path, limit: int) -> list[dict]:
+    chunk_size = 16 * 1024
+    lines: list[str] = []
+
+    with path.open("rb") as handle:
+        handle.seek(0, 2)
+        pos = handle.tell()
+        remainder = b""
+
+        while len(lines) < limit and pos > 0:
+            to_read = min(chunk_size, pos)
+            pos -= to_read
+            handle.seek(pos)
+            chunk = handle.read(to_read)
+
+            chunk += remainder
+            chunk_lines = chunk.split(b"\n")
+
+            if pos > 0:
+                remainder = chunk_lines[0]
+                chunk_lines = chunk_lines[1:]
+            else:
+                remainder = b""
+
+            for i in range(len(chunk_lines) - 1, -1, -1):
+                line_str = chunk_lines[i].decode("utf-8").strip()
+                if not line_str:
+                    continue
+                lines.append(line_str)
+                if len(lines) >= limit:
+                    break
+
+    lines.reverse()
+    return [json.loads(line) for line in lines]
+
+
+def generate_export(path: Path, size_bytes: int, line_bytes: int) -> int:
+    """Append records of roughly ``line_bytes`` until ``size_bytes`` is reached."""
+    written = 0
+    count = 0
+    padding = "x" * max(0, line_bytes - 120)
+    with path.open("w", encoding="utf-8") as handle:
+        while written < size_bytes:
+            line = json.dumps(
+                {
+                    "title": f"insight {count}",
+                    "summary": padding,
+                    "url": f"https://example.com/{count}",
+                    "ts": f"2024-01-01T00:00:{count % 60:02d}Z",
+                }
+            )
+            handle.write(line + "\n")
+            written += len(line) + 1
+            count += 1
+    return count
+
+
+def _run(fn, path: Path, limit: int, iterations: int) -> tuple[float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(path, limit)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed / iterations, peak
+
+
+def main() -> int:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from cli.ingest_chronik import read_last_records
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--line-kb", type=int, default=256)
+    parser.add_argument("--limit", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--source", type=Path, help="existing export to reuse")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="chronik-tail-") as tmp:
+        path = args.source or Path(tmp) / "export.jsonl"
+        if args.source is None:
+            print(
+                f"Generating {args.size_mb} MiB export "
+                f"with ~{args.line_kb} KiB lines..."
+            )
+            count = generate_export(
+                path, args.size_mb * 1024 * 1024, args.line_kb * 1024
+            )
+            print(f"Wrote {count} records to {path}")
+
+        if read_last_records(path, args.limit) != read_last_records_original(
+            path, args.limit
+        ):
+            print("Mismatch between original and mmap reader", file=sys.stderr)
+            return 1
+
+        baseline, baseline_peak = _run(
+            read_last_records_original, path, args.limit, args.iterations
+        )
+        print(
+            f"Baseline: {baseline:.4f} s/call, "
+            f"peak traced {baseline_peak / 1024:.0f} KiB"
+        )
+        mapped, mapped_peak = _run(read_last_records, path, args.limit, args.iterations)
+        print(
+            f"Mmap:     {mapped:.4f} s/call, peak traced {mapped_peak / 1024:.0f} KiB"
+        )
+        print(f"Improvement: {(baseline - mapped) / baseline * 100:.2f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark JSON encoding in `cli/ingest_intents.py` on generated intents.
+
+Compares the previous per-element ``json.dumps`` encoding with the batch
+encoder (stdlib and, if installed, orjson), then runs the full ingest once
+per encoder. The stdlib encoder must produce byte-identical output.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def generate_intents(path: Path, count: int) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        for i in range(count):
+            record = {
+                "ts": f"2024-01-01T12:{i // 60 % 60:02d}:{i % 60:02d}Z",
+                "actor": f"user{i % 97}",
+                "goal": f"Refactor module {i} – Übersicht",
+                "scope": {"repo": f"heimgewebe/repo{i % 31}", "path": f"src/{i}.py"},
+                "context": {"tags": [f"tag{i % 13}", f"tag{i % 7}"]},
+            }
+            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def encode_original(elements: list[dict], options: dict) -> bytes:
+    # Previous behaviour: one json.dumps call and one str per element.
+    lines = [json.dumps(element, **options) + "\n" for element in elements]
+    return "".join(lines).encode("utf-8")
+
+
+def _element_batches(source: Path, batch_lines: int, line_elements):
+    """Yield graph elements of ``batch_lines`` source lines at a time."""
+    elements: list[dict] = []
+    with source.open("r", encoding="utf-8") as handle:
+        for number, line in enumerate(handle, 1):
+            nodes, edges = line_elements(line)
+            elements.extend(nodes)
+            elements.extend(edges)
+            if number % batch_lines == 0:
+                yield elements
+                elements = []
+    if elements:
+        yield elements
+
+
+def main() -> int:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from cli import ingest_intents as ingest
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--intents", type=int, default=1_000_000)
+    parser.add_argument("--batch-lines", type=int, default=50_000)
+    parser.add_argument("--source", type=Path, help="existing intents file to reuse")
+    args = parser.parse_args()
+
+    encoders = ["stdlib"] + (["orjson"] if ingest.orjson is not None else [])
+
+    with tempfile.TemporaryDirectory(prefix="ingest-intents-") as tmp:
+        tmp_dir = Path(tmp)
+        source = args.source or tmp_dir / "intents.jsonl"
+        if args.source is None:
+            print(f"Generating {args.intents} intents...")
+            generate_intents(source, args.intents)
+
+        # Encode in batches like the ingest buffers do, so memory stays bounded.
+        encoders_by_name = {name: ingest.JsonLineEncoder(name) for name in encoders}
+        timings = dict.fromkeys(["original", *encoders], 0.0)
+        identical = dict.fromkeys(encoders, True)
+        total = 0
+        for elements in _element_batches(
+            source, args.batch_lines, ingest.line_elements
+        ):
+            total += len(elements)
+            start = time.perf_counter()
+            expected = encode_original(elements, ingest.JSON_DUMPS_OPTIONS)
+            timings["original"] += time.perf_counter() - start
+            for name, encoder in encoders_by_name.items():
+                start = time.perf_counter()
+                output = encoder.encode_batch(elements)
+                timings[name] += time.perf_counter() - start
+                identical[name] = identical[name] and output == expected
+
+        baseline = total / timings["original"]
+        print(f"Encoded {total} graph elements")
+        print(f"Original json.dumps: {baseline:,.0f} lines/s")
+        for name in encoders:
+            rate = total / timings[name]
+            same = "byte-identical" if identical[name] else "differs"
+            print(
+                f"Batch {name:<13} {rate:,.0f} lines/s ({rate / baseline:.2f}x, {same})"
+            )
+        if not identical["stdlib"]:
+            print("stdlib encoder output differs from json.dumps", file=sys.stderr)
+            return 1
+
+        for name in encoders:
+            outputs = (tmp_dir / f"{name}_nodes.jsonl", tmp_dir / f"{name}_edges.jsonl")
+            start = time.perf_counter()
+            stats = ingest.ingest_intents(source, *outputs, encoder=name)
+            elapsed = time.perf_counter() - start
+            written = stats["nodes_written"] + stats["edges_written"]
+            print(
+                f"Ingest {name:<13} {elapsed:.2f} s, {written / elapsed:,.0f} lines/s"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""Benchmark the RepoBrief chunk bridge on synthetic chunk_index data.
+
+Generates deterministic RepoBrief chunk_index JSONL plus a goldset per scenario
+size, runs the bridge stages (read, build_records, evaluate_recall, JSONL and
+parquet writers) and records per-stage wall time, throughput and memory into a
+JSON report. Each scenario runs in a fresh process, so its peak RSS belongs to
+that scenario alone. A report can be compared against a stored baseline report
+with relative time and memory budgets.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts import repobrief_chunk_bridge as bridge
+
+KIND = "semantah.repobrief_chunk_bridge_benchmark"
+VERSION = "v1"
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_QUERIES = 50
+DEFAULT_BUDGET = 0.25
+DEFAULT_MEMORY_BUDGET = 0.25
+# Stage timings below this absolute delta are treated as noise.
+NOISE_FLOOR_SECONDS = 0.05
+# Memory peaks below this absolute delta are treated as noise.
+NOISE_FLOOR_BYTES = 4 << 20
+VOCABULARY = [
+    "index",
+    "chunk",
+    "embedding",
+    "vector",
+    "graph",
+    "namespace",
+    "upsert",
+    "search",
+    "parquet",
+    "bridge",
+    "recall",
+    "ranking",
+    "cache",
+    "snapshot",
+    "contract",
+    "schema",
+    "report",
+    "baseline",
+    "tokenizer",
+    "daemon",
+    "insight",
+    "intent",
+    "vault",
+    "note",
+]
+
+
+def generate_chunk_index(path: Path, rows: int, *, seed: int = 0) -> None:
+    """Write ``rows`` synthetic RepoBrief chunk_index rows to ``path``."""
+    rng = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        for i in range(rows):
+            text = " ".join(rng.choice(VOCABULARY) for _ in range(24)) + f" n{i}"
+            file_path = f"src/mod{i % 97}/file{i % 1009}.py"
+            start = (i % 50) * 512
+            row = {
+                "repo_id": "bench",
+                "chunk_id": f"chunk-{i:07d}",
+                "path": file_path,
+                "content": text,
+                "content_range_ref": {
+                    "artifact_role": "canonical_md",
+                    "file_path": file_path,
+                    "start_byte": start,
+                    "end_byte": start + len(text.encode("utf-8")),
+                    "start_line": i % 400 + 1,
+                    "end_line": i % 400 + 12,
+                    "content_sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                },
+            }
+            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def generate_goldset(
+    rows: Sequence[dict[str, Any]], queries: int, *, seed: int = 0
+) -> list[dict[str, Any]]:
+    """Pick ``queries`` rows and derive a three-token query from each."""
+    rng = random.Random(seed)
+    goldset: list[dict[str, Any]] = []
+    for _ in range(min(queries, len(rows))):
+        row = rows[rng.randrange(len(rows))]
+        tokens = row["content"].split()
+        goldset.append(
+            {
+                "query": " ".join(rng.sample(tokens, 3)),
+                "expected_chunk_id": row["chunk_id"],
+            }
+        )
+    return goldset
+
+
+def _peak_rss_bytes() -> int | None:
+    """Return the peak RSS of this process so far (the whole process lifetime)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _measure(
+    fn: Callable[[], Any], *, items: int, trace_memory: bool
+) -> tuple[Any, dict[str, Any]]:
+    """Run one stage; with ``trace_memory`` also record its own allocation peak."""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = fn()
+        elapsed = time.perf_counter() - start
+        traced_peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    stage = {
+        "seconds": round(elapsed, 6),
+        "items": items,
+        "items_per_second": round(items / elapsed, 2) if elapsed > 0 else None,
+    }
+    if traced_peak is not None:
+        stage["peak_traced_bytes"] = traced_peak
+    return result, stage
+
+
+def run_scenario(
+    rows: int,
+    *,
+    queries: int,
+    workdir: Path,
+    dim: int = bridge.DEFAULT_DIM,
+    eval_modes: Sequence[str] = ("lexical",),
+    trace_memory: bool = False,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Run all stages for one row count.
+
+    ``peak_rss_bytes`` is the process high-water mark, so it only describes the
+    scenario when it runs in a fresh process (see :func:`run_benchmark`).
+    """
+    chunk_index = workdir / f"bench-{rows}.chunk_index.jsonl"
+    generate_chunk_index(chunk_index, rows, seed=seed)
+
+    stages: dict[str, dict[str, Any]] = {}
+    _, stages["read_jsonl"] = _measure(
+        lambda: bridge.read_jsonl(chunk_index), items=rows, trace_memory=trace_memory
+    )
+    for mode in bridge.ROW_HASH_MODES:
+        (raw_rows, row_hashes), stages[f"read_row_hash_{mode}"] = _measure(
+            lambda mode=mode: bridge.read_jsonl_with_row_hashes(
+                chunk_index, row_hash=mode
+            ),
+            items=rows,
+            trace_memory=trace_memory,
+        )
+    goldset = generate_goldset(raw_rows, queries, seed=seed)
+    records, stages["build_records"] = _measure(
+        lambda: bridge.build_records(
+            raw_rows, default_repo_id="bench", dim=dim, row_hashes=row_hashes
+        ),
+        items=rows,
+        trace_memory=trace_memory,
+    )
+    for mode in eval_modes:
+        result, stage = _measure(
+            lambda mode=mode: bridge.evaluate_recall(records, goldset, mode=mode),
+            items=len(goldset),
+            trace_memory=trace_memory,
+        )
+        stage["recall"] = result["recall"]
+        stage["mrr"] = result["mrr"]
+        stages[f"evaluate_recall_{mode}"] = stage
+        if bridge.np is not None:
+            _, stages[f"evaluate_recall_batched_{mode}"] = _measure(
+                lambda mode=mode: bridge.evaluate_recall_batched(
+                    records, goldset, mode=mode
+                ),
+                items=len(goldset),
+                trace_memory=trace_memory,
+            )
+    out_jsonl = workdir / f"bench-{rows}.records.jsonl"
+    _, stages["write_jsonl"] = _measure(
+        lambda: bridge.write_jsonl(out_jsonl, records),
+        items=rows,
+        trace_memory=trace_memory,
+    )
+    stages["write_jsonl"]["output_bytes"] = out_jsonl.stat().st_size
+    if bridge.pa is not None:
+        out_parquet = workdir / f"bench-{rows}.records.parquet"
+        _, stages["write_parquet"] = _measure(
+            lambda: bridge.write_parquet(out_parquet, records),
+            items=rows,
+            trace_memory=trace_memory,
+        )
+        stages["write_parquet"]["output_bytes"] = out_parquet.stat().st_size
+
+    canonical_seconds = stages["read_row_hash_canonical"]["seconds"]
+    raw_seconds = stages["read_row_hash_raw"]["seconds"]
+    return {
+        "rows": rows,
+        "row_hash_speedup": (
+            round(canonical_seconds / raw_seconds, 3) if raw_seconds > 0 else None
+        ),
+        "queries": len(goldset),
+        "dim": dim,
+        "input_bytes": chunk_index.stat().st_size,
+        "stages": stages,
+        "peak_rss_bytes": _peak_rss_bytes(),
+    }
+
+
+def run_benchmark(
+    sizes: Sequence[int],
+    *,
+    queries: int = DEFAULT_QUERIES,
+    workdir: Path | None = None,
+    dim: int = bridge.DEFAULT_DIM,
+    eval_modes: Sequence[str] = ("lexical",),
+    trace_memory: bool = False,
+    seed: int = 0,
+) -> dict[str, Any]:
+    scenarios = []
+    with tempfile.TemporaryDirectory(prefix="bridge-bench-") as tmp:
+        root = workdir or Path(tmp)
+        for rows in sizes:
+            # A fresh interpreter per scenario keeps its peak RSS its own.
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                future = pool.submit(
+                    run_scenario,
+                    rows,
+                    queries=queries,
+                    workdir=root,
+                    dim=dim,
+                    eval_modes=eval_modes,
+                    trace_memory=trace_memory,
+                    seed=seed,
+                )
+                scenarios.append(future.result())
+    return {
+        "kind": KIND,
+        "version": VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "trace_memory": trace_memory,
+        "scenarios": scenarios,
+    }
+
+
+def _ratio(value: float, base_value: float) -> float | None:
+    return None if base_value <= 0 else value / base_value
+
+
+def compare_to_baseline(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    budget: float = DEFAULT_BUDGET,
+    memory_budget: float = DEFAULT_MEMORY_BUDGET,
+) -> dict[str, Any]:
+    """Flag stages and scenarios that regress against ``baseline``.
+
+    A stage regresses when it is slower by more than ``budget``, or when its
+    ``peak_traced_bytes`` (``--trace-memory`` in both reports) grow by more than
+    ``memory_budget``; a scenario regresses when its peak RSS grows by more than
+    ``memory_budget``. Absolute deltas below the noise floors never fail.
+    Scenarios are matched by row count and stages by name; unmatched entries are
+    listed but never fail the comparison.
+    """
+    baseline_by_rows = {s["rows"]: s for s in baseline.get("scenarios", [])}
+    regressions: list[dict[str, Any]] = []
+    compared: list[dict[str, Any]] = []
+    unmatched: list[str] = []
+
+    def check(
+        rows: int, stage: str, metric: str, current: Any, base: Any, limit: float
+    ) -> None:
+        if current is None or base is None:
+            return
+        ratio = _ratio(current, base)
+        entry = {
+            "rows": rows,
+            "stage": stage,
+            "metric": metric,
+            metric: current,
+            f"baseline_{metric}": base,
+            "ratio": None if ratio is None else round(ratio, 4),
+        }
+        compared.append(entry)
+        floor = NOISE_FLOOR_SECONDS if metric == "seconds" else NOISE_FLOOR_BYTES
+        if ratio is not None and ratio > 1.0 + limit and current - base > floor:
+            regressions.append(entry)
+
+    for scenario in report.get("scenarios", []):
+        rows = scenario["rows"]
+        base_scenario = baseline_by_rows.get(rows)
+        if base_scenario is None:
+            unmatched.append(f"rows={rows}")
+            continue
+        for name, stage in scenario["stages"].items():
+            base_stage = base_scenario["stages"].get(name)
+            if base_stage is None:
+                unmatched.append(f"rows={rows}:{name}")
+                continue
+            check(
+                rows, name, "seconds", stage["seconds"], base_stage["seconds"], budget
+            )
+            check(
+                rows,
+                name,
+                "peak_traced_bytes",
+                stage.get("peak_traced_bytes"),
+                base_stage.get("peak_traced_bytes"),
+                memory_budget,
+            )
+        check(
+            rows,
+            "scenario",
+            "peak_rss_bytes",
+            scenario.get("peak_rss_bytes"),
+            base_scenario.get("peak_rss_bytes"),
+            memory_budget,
+        )
+    return {
+        "status": "pass" if not regressions else "fail",
+        "budget": budget,
+        "memory_budget": memory_budget,
+        "noise_floor_seconds": NOISE_FLOOR_SECONDS,
+        "noise_floor_bytes": NOISE_FLOOR_BYTES,
+        "compared": compared,
+        "regressions": regressions,
+        "unmatched": unmatched,
+    }
+
+
+def _sizes(value: str) -> list[int]:
+    try:
+        sizes = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid sizes: {value}") from exc
+    if not sizes or any(size < 1 for size in sizes):
+        raise argparse.ArgumentTypeError("sizes must be positive integers")
+    return sizes
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=_sizes,
+        default=list(DEFAULT_SIZES),
+        help="comma-separated row counts (default: 10000,100000,1000000)",
+    )
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES)
+    parser.add_argument("--dim", type=int, default=bridge.DEFAULT_DIM)
+    parser.add_argument(
+        "--eval-mode",
+        action="append",
+        choices=bridge.EVAL_MODES,
+        help="evaluation mode to time; repeatable (default: lexical)",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="record tracemalloc peaks per stage (slows the run down)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", type=Path)
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET)
+    parser.add_argument(
+        "--memory-budget",
+        type=float,
+        default=DEFAULT_MEMORY_BUDGET,
+        help="allowed relative growth of peak RSS and traced peaks (default: 0.25)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.workdir:
+        args.workdir.mkdir(parents=True, exist_ok=True)
+    report = run_benchmark(
+        args.sizes,
+        queries=args.queries,
+        workdir=args.workdir,
+        dim=args.dim,
+        eval_modes=args.eval_mode or ("lexical",),
+        trace_memory=args.trace_memory,
+        seed=args.seed,
+    )
+    status = 0
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        report["baseline_comparison"] = compare_to_baseline(
+            report, baseline, budget=args.budget, memory_budget=args.memory_budget
+        )
+        if report["baseline_comparison"]["status"] != "pass":
+            status = 1
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(
+        json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+    )
+    print(json.dumps(report, indent=2, sort_keys=True))
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
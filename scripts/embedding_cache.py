@@ -0,0 +1,225 @@
+"""
+embedding_cache.py
+
+Persistent cache of text embeddings in a local SQLite file
+(`.gewebe/embedding_cache.sqlite`). Entries are keyed by the embedder revision
+and the BLAKE2b digest of the text, so identical chunks (templates,
+boilerplate, moved notes) are embedded once per model. Vectors are stored as
+float32.
+
+The cache is bounded by ``max_bytes`` of stored keys and vectors. Every lookup
+or insert batch advances a logical clock; when the bound is exceeded, the
+least recently used entries are deleted until the cache is back at 90 % of
+the bound.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional in minimal envs
+    np = None  # type: ignore[assignment]
+
+DEFAULT_CACHE_PATH = Path(".gewebe/embedding_cache.sqlite")
+DEFAULT_MAX_BYTES = 512 << 20
+EVICT_TO = 0.9
+# Stay below SQLite's default limit of bound parameters per statement.
+_QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    revision TEXT NOT NULL,
+    digest BLOB NOT NULL,
+    vector BLOB NOT NULL,
+    used INTEGER NOT NULL,
+    PRIMARY KEY (revision, digest)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS embeddings_used ON embeddings (used);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('clock', 0), ('bytes', 0);
+"""
+
+
+def text_digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class EmbeddingCache:
+    """SQLite-backed ``(revision, text) -> vector`` cache with LRU eviction.
+
+    The connection may be used from one thread other than the creating one
+    (e.g. an embedding worker thread), but not concurrently.
+    """
+
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_CACHE_PATH,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        if np is None:
+            raise RuntimeError("numpy is required for the embedding cache")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _meta(self, key: str) -> int:
+        return self._db.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()[0]
+
+    def _tick(self) -> int:
+        self._db.execute("UPDATE meta SET value = value + 1 WHERE key = 'clock'")
+        return self._meta("clock")
+
+    def get_many(self, revision: str, texts: Sequence[str]) -> list[Any]:
+        """Return a float32 vector or ``None`` per text, in input order."""
+        digests = [text_digest(text) for text in texts]
+        found: dict[bytes, Any] = {}
+        unique = list(dict.fromkeys(digests))
+        with self._db:
+            clock = self._tick()
+            for start in range(0, len(unique), _QUERY_CHUNK):
+                part = unique[start : start + _QUERY_CHUNK]
+                marks = ",".join("?" * len(part))
+                rows = self._db.execute(
+                    f"SELECT digest, vector FROM embeddings "
+                    f"WHERE revision = ? AND digest IN ({marks})",
+                    (revision, *part),
+                ).fetchall()
+                for digest, vector in rows:
+                    found[digest] = np.frombuffer(vector, dtype=np.float32)
+                if rows:
+                    hit_marks = ",".join("?" * len(rows))
+                    self._db.execute(
+                        f"UPDATE embeddings SET used = ? "
+                        f"WHERE revision = ? AND digest IN ({hit_marks})",
+                        (clock, revision, *(digest for digest, _ in rows)),
+                    )
+        vectors = [found.get(digest) for digest in digests]
+        hits = sum(vector is not None for vector in vectors)
+        self.hits += hits
+        self.misses += len(vectors) - hits
+        return vectors
+
+    def put_many(self, revision: str, texts: Sequence[str], vectors: Any) -> None:
+        """Store ``vectors`` (one row per text) and evict if over the bound."""
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if len(matrix) != len(texts):
+            raise ValueError("expected one vector per text")
+        if not len(texts):
+            return
+        key_bytes = len(revision.encode("utf-8")) + 16
+        entry_bytes = key_bytes + matrix.shape[1] * 4
+        with self._db:
+            clock = self._tick()
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO embeddings VALUES (?, ?, ?, ?)",
+                [
+                    (revision, text_digest(text), row.tobytes(), clock)
+                    for text, row in zip(texts, matrix, strict=True)
+                ],
+            )
+            inserted = self._db.total_changes - before
+            self._db.execute(
+                "UPDATE meta SET value = value + ? WHERE key = 'bytes'",
+                (inserted * entry_bytes,),
+            )
+            if self._meta("bytes") > self.max_bytes:
+                self._evict(int(self.max_bytes * EVICT_TO))
+
+    def _evict(self, target: int) -> None:
+        total = self._meta("bytes")
+        while total > target:
+            rows = self._db.execute(
+                "SELECT revision, digest, length(CAST(revision AS BLOB)) "
+                "+ length(digest) + length(vector) FROM embeddings "
+                "ORDER BY used LIMIT ?",
+                (_QUERY_CHUNK,),
+            ).fetchall()
+            if not rows:
+                total = 0
+                break
+            for revision, digest, size in rows:
+                self._db.execute(
+                    "DELETE FROM embeddings WHERE revision = ? AND digest = ?",
+                    (revision, digest),
+                )
+                self.evicted += 1
+                total -= size
+                if total <= target:
+                    break
+        self._db.execute("UPDATE meta SET value = ? WHERE key = 'bytes'", (total,))
+
+    def get_or_compute(
+        self,
+        revision: str,
+        texts: Sequence[str],
+        compute: Callable[[list[str]], Any],
+    ) -> Any:
+        """Return a float32 matrix for ``texts``, computing only cache misses.
+
+        ``compute`` is called once with the distinct missing texts.
+        """
+        cached = self.get_many(revision, texts)
+        missing = list(
+            dict.fromkeys(
+                text
+                for text, vector in zip(texts, cached, strict=True)
+                if vector is None
+            )
+        )
+        if missing:
+            computed = np.asarray(compute(missing), dtype=np.float32)
+            self.put_many(revision, missing, computed)
+            by_text = dict(zip(missing, computed, strict=True))
+            cached = [
+                by_text[text] if vector is None else vector
+                for text, vector in zip(texts, cached, strict=True)
+            ]
+        if not cached:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack(cached)
+
+    def summary(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        entries = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return {
+            "cache": str(self.path),
+            "entries": entries,
+            "bytes": self._meta("bytes"),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": 0.0 if lookups == 0 else self.hits / lookups,
+            "evicted": self.evicted,
+        }
@@ -39,7 +39,14 @@ from datetime import date, datetime, timezone
 from pathlib import Path
 from typing import Iterable, List, Tuple, Optional
 
-from observatory_lib import validate_payload_if_available
+try:
+    from atomic_io import atomic_write_text
+    from observatory_lib import validate_payload_if_available
+except ImportError:
+    # Imported by path (tests): make sibling scripts importable.
+    sys.path.append(str(Path(__file__).parent))
+    from atomic_io import atomic_write_text
+    from observatory_lib import validate_payload_if_available
 
 
 SCHEMA_PATH = Path("contracts") / "insights.daily.schema.json"
@@ -245,8 +252,9 @@ def main() -> int:
     # Ensure output directory exists
     args.output.parent.mkdir(parents=True, exist_ok=True)
 
-    with args.output.open("w", encoding="utf-8") as fh:
-        json.dump(insights, fh, ensure_ascii=False, indent=2, sort_keys=True)
+    atomic_write_text(
+        args.output, json.dumps(insights, ensure_ascii=False, indent=2, sort_keys=True)
+    )
 
     print(f"Exported valid insights to {args.output}")
     return 0
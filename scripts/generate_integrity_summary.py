@@ -12,9 +12,17 @@ Integrity Artifacts:
 
 import json
 import os
+import sys
 from pathlib import Path
 from datetime import datetime, timezone
 
+try:
+    from atomic_io import AtomicBatch
+except ImportError:
+    # Imported by path (tests): make sibling scripts importable.
+    sys.path.append(str(Path(__file__).parent))
+    from atomic_io import AtomicBatch
+
 
 def main():
     repo_root = Path.cwd()
@@ -130,11 +138,6 @@ def main():
         summary["details"]["claims_filter_active"] = True
 
     summary_path = output_dir / "summary.json"
-    with open(summary_path, "w") as f:
-        json.dump(summary, f, indent=2)
-
-    print(f"Generated Integrity Summary at {summary_path}")
-
     # Event Payload (Strict Schema: url, generated_at, repo, status)
     default_url = (
         f"https://github.com/{repo_name}/releases/download/integrity/summary.json"
@@ -149,11 +152,6 @@ def main():
     }
 
     event_payload_path = output_dir / "event_payload.json"
-    with open(event_payload_path, "w") as f:
-        json.dump(event_payload, f, indent=2)
-
-    print(f"Generated Event Payload at {event_payload_path}")
-
     # Full Event Envelope (Optional convenience)
     event_envelope = {
         "type": "integrity.summary.published.v1",
@@ -162,9 +160,15 @@ def main():
     }
 
     event_path = output_dir / "event.json"
-    with open(event_path, "w") as f:
-        json.dump(event_envelope, f, indent=2)
 
+    # The three artifacts are published together: one fsync pass, then renames.
+    with AtomicBatch() as batch:
+        batch.write_text(summary_path, json.dumps(summary, indent=2))
+        batch.write_text(event_payload_path, json.dumps(event_payload, indent=2))
+        batch.write_text(event_path, json.dumps(event_envelope, indent=2))
+
+    print(f"Generated Integrity Summary at {summary_path}")
+    print(f"Generated Event Payload at {event_payload_path}")
     print(f"Generated Event Envelope at {event_path}")
 
 
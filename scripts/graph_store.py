@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""Compact, memory-mappable graph store for `nodes.jsonl`/`edges.jsonl`.
+
+A store is a directory of NumPy ``.npy`` arrays plus ``meta.json``:
+
+- ``id_bytes``/``id_offsets``: node IDs as one UTF-8 blob, sorted bytewise, so
+  the position of an ID is its interned integer and lookups are a binary
+  search over the mapped blob.
+- ``node_type``: dictionary codes into ``meta["types"]``; ``title_bytes`` /
+  ``title_offsets`` hold titles in node order.
+- ``out_indptr``/``out_indices``/``out_rel``/``out_weight`` and the ``in_*``
+  counterparts: CSR adjacency by source and by destination. Relations are
+  dictionary codes into ``meta["rels"]``; a missing weight is NaN.
+
+Opening a store maps the arrays (``np.load(..., mmap_mode="r")``), so startup
+cost does not grow with the number of edges. Only ``id``, ``type`` and
+``title`` of nodes and ``src``, ``rel``, ``dst`` and ``weight`` of edges are
+kept; the JSONL files stay the source of truth. Duplicate node records are
+resolved last-wins; edge endpoints without a node record become untyped nodes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import math
+import os
+import shutil
+import sys
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional in minimal envs
+    np = None  # type: ignore[assignment]
+
+FORMAT = "semantah.graph-store"
+FORMAT_VERSION = 1
+DIRECTIONS = ("out", "in")
+DEFAULT_NODES = Path(".gewebe/nodes.jsonl")
+DEFAULT_EDGES = Path(".gewebe/edges.jsonl")
+DEFAULT_STORE = Path(".gewebe/graph")
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required for the graph store")
+
+
+def _read_jsonl(path: Path) -> Iterable[dict[str, Any]]:
+    with path.open("rb") as handle:
+        for line_no, raw in enumerate(handle, start=1):
+            line = raw.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{path}:{line_no}: invalid JSON: {exc}") from exc
+            if not isinstance(record, dict):
+                raise ValueError(f"{path}:{line_no}: expected a JSON object")  # noqa: TRY004 - malformed input
+            yield record
+
+
+def _string_table(values: Sequence[bytes]) -> tuple[Any, Any]:
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    if values:
+        np.cumsum([len(value) for value in values], out=offsets[1:])
+    blob = np.frombuffer(b"".join(values), dtype=np.uint8)
+    return blob, offsets
+
+
+def _csr(keys: Any, others: Any, rels: Any, weights: Any, size: int) -> dict[str, Any]:
+    """Group edges by ``keys`` (stable, then by ``others``) into CSR arrays."""
+    order = np.lexsort((others, keys))
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=size), out=indptr[1:])
+    return {
+        "indptr": indptr,
+        "indices": others[order],
+        "rel": rels[order],
+        "weight": weights[order],
+    }
+
+
+def build_store(nodes_path: Path, edges_path: Path, out_dir: Path) -> dict[str, Any]:
+    """Convert nodes/edges JSONL into a graph store directory and return its meta.
+
+    The store is written to a temporary sibling directory and swapped into
+    place, so readers never open a half-written store.
+    """
+    _require_numpy()
+    nodes: dict[str, tuple[str, str]] = {}
+    if nodes_path.exists():
+        for record in _read_jsonl(nodes_path):
+            node_id = record.get("id")
+            if not isinstance(node_id, str):
+                raise ValueError(  # noqa: TRY004 - malformed input
+                    f"{nodes_path}: node without string id: {record!r}"
+                )
+            nodes[node_id] = (
+                str(record.get("type") or ""),
+                str(record.get("title") or ""),
+            )
+
+    src_ids: list[str] = []
+    dst_ids: list[str] = []
+    rel_names: list[str] = []
+    weights: list[float] = []
+    if edges_path.exists():
+        for record in _read_jsonl(edges_path):
+            src, dst, rel = record.get("src"), record.get("dst"), record.get("rel")
+            if not (
+                isinstance(src, str) and isinstance(dst, str) and isinstance(rel, str)
+            ):
+                raise ValueError(  # noqa: TRY004 - malformed input
+                    f"{edges_path}: edge needs string src/rel/dst: {record!r}"
+                )
+            weight = record.get("weight")
+            src_ids.append(src)
+            dst_ids.append(dst)
+            rel_names.append(rel)
+            weights.append(
+                float(weight) if isinstance(weight, (int, float)) else math.nan
+            )
+            for endpoint in (src, dst):
+                nodes.setdefault(endpoint, ("", ""))
+
+    encoded_ids = sorted(node_id.encode("utf-8") for node_id in nodes)
+    position = {
+        node_id.decode("utf-8"): index for index, node_id in enumerate(encoded_ids)
+    }
+    types = sorted({node_type for node_type, _ in nodes.values()})
+    rels = sorted(set(rel_names))
+    type_code = {name: code for code, name in enumerate(types)}
+    rel_code = {name: code for code, name in enumerate(rels)}
+
+    id_bytes, id_offsets = _string_table(encoded_ids)
+    ordered = [nodes[node_id.decode("utf-8")] for node_id in encoded_ids]
+    title_bytes, title_offsets = _string_table(
+        [title.encode("utf-8") for _, title in ordered]
+    )
+    node_type = np.array(
+        [type_code[node_type] for node_type, _ in ordered], dtype=np.uint16
+    )
+
+    index_dtype = np.int32 if len(encoded_ids) < 2**31 else np.int64
+    src = np.fromiter(
+        (position[s] for s in src_ids), dtype=index_dtype, count=len(src_ids)
+    )
+    dst = np.fromiter(
+        (position[d] for d in dst_ids), dtype=index_dtype, count=len(dst_ids)
+    )
+    rel = np.fromiter(
+        (rel_code[r] for r in rel_names), dtype=np.uint16, count=len(rel_names)
+    )
+    weight = np.asarray(weights, dtype=np.float32)
+
+    arrays: dict[str, Any] = {
+        "id_bytes": id_bytes,
+        "id_offsets": id_offsets,
+        "title_bytes": title_bytes,
+        "title_offsets": title_offsets,
+        "node_type": node_type,
+    }
+    for direction, keys, others in (("out", src, dst), ("in", dst, src)):
+        for name, array in _csr(keys, others, rel, weight, len(encoded_ids)).items():
+            arrays[f"{direction}_{name}"] = array
+
+    meta = {
+        "format": FORMAT,
+        "version": FORMAT_VERSION,
+        "nodes": len(encoded_ids),
+        "edges": len(src_ids),
+        "types": types,
+        "rels": rels,
+    }
+
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    for name, array in arrays.items():
+        np.save(tmp_dir / f"{name}.npy", array)
+    (tmp_dir / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    if out_dir.exists():
+        old_dir = out_dir.with_name(out_dir.name + ".old")
+        shutil.rmtree(old_dir, ignore_errors=True)
+        os.replace(out_dir, old_dir)
+        os.replace(tmp_dir, out_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    else:
+        os.replace(tmp_dir, out_dir)
+    return meta
+
+
+class _Strings(Sequence):
+    """Sequence view of a mapped string table, yielding raw bytes."""
+
+    def __init__(self, blob: Any, offsets: Any):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):  # type: ignore[override]
+        start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+        return self._blob[start:end].tobytes()
+
+
+class GraphStore:
+    """Read-only access to a graph store directory."""
+
+    def __init__(self, path: Path):
+        _require_numpy()
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+        if (
+            self.meta.get("format") != FORMAT
+            or self.meta.get("version") != FORMAT_VERSION
+        ):
+            raise ValueError(
+                f"{self.path}: not a graph store (version {FORMAT_VERSION})"
+            )
+        self._arrays: dict[str, Any] = {}
+        self._ids = _Strings(self._array("id_bytes"), self._array("id_offsets"))
+        self._titles = _Strings(
+            self._array("title_bytes"), self._array("title_offsets")
+        )
+
+    def _array(self, name: str) -> Any:
+        if name not in self._arrays:
+            self._arrays[name] = np.load(self.path / f"{name}.npy", mmap_mode="r")
+        return self._arrays[name]
+
+    def __len__(self) -> int:
+        return int(self.meta["nodes"])
+
+    @property
+    def num_edges(self) -> int:
+        return int(self.meta["edges"])
+
+    def __contains__(self, node_id: str) -> bool:
+        try:
+            self.node_index(node_id)
+        except KeyError:
+            return False
+        return True
+
+    def node_index(self, node_id: str) -> int:
+        """Return the interned integer of ``node_id``; KeyError if unknown."""
+        key = node_id.encode("utf-8")
+        index = bisect.bisect_left(self._ids, key)
+        if index < len(self._ids) and self._ids[index] == key:
+            return index
+        raise KeyError(node_id)
+
+    def node_id(self, index: int) -> str:
+        return self._ids[index].decode("utf-8")
+
+    def node(self, node_id: str) -> dict[str, str]:
+        index = self.node_index(node_id)
+        code = int(self._array("node_type")[index])
+        return {
+            "id": node_id,
+            "type": self.meta["types"][code],
+            "title": self._titles[index].decode("utf-8"),
+        }
+
+    def degree(self, node_id: str, direction: str = "out") -> int:
+        indptr = self._array(f"{self._direction(direction)}_indptr")
+        index = self.node_index(node_id)
+        return int(indptr[index + 1] - indptr[index])
+
+    def neighbors(
+        self, node_id: str, direction: str = "out", rel: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Return adjacent nodes as ``{"id", "rel", "weight"}`` dicts.
+
+        ``direction="out"`` follows edges from ``node_id``, ``"in"`` edges
+        pointing to it. Neighbors are ordered by interned ID; a missing weight
+        is returned as None.
+        """
+        prefix = self._direction(direction)
+        index = self.node_index(node_id)
+        indptr = self._array(f"{prefix}_indptr")
+        start, end = int(indptr[index]), int(indptr[index + 1])
+        others = self._array(f"{prefix}_indices")[start:end]
+        rel_codes = self._array(f"{prefix}_rel")[start:end]
+        weights = self._array(f"{prefix}_weight")[start:end]
+        rels = self.meta["rels"]
+        if rel is not None:
+            if rel not in rels:
+                return []
+            keep = rel_codes == rels.index(rel)
+            others, rel_codes, weights = others[keep], rel_codes[keep], weights[keep]
+        return [
+            {
+                "id": self.node_id(int(other)),
+                "rel": rels[int(code)],
+                "weight": None if math.isnan(weight) else float(weight),
+            }
+            for other, code, weight in zip(others, rel_codes, weights, strict=True)
+        ]
+
+    @staticmethod
+    def _direction(direction: str) -> str:
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}")
+        return direction
+
+
+def open_store(path: Path) -> GraphStore:
+    """Open a graph store written by :func:`build_store`."""
+    return GraphStore(path)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Convert nodes/edges JSONL into a store")
+    build.add_argument("--nodes", type=Path, default=DEFAULT_NODES)
+    build.add_argument("--edges", type=Path, default=DEFAULT_EDGES)
+    build.add_argument("--out", type=Path, default=DEFAULT_STORE)
+
+    neighbors = commands.add_parser("neighbors", help="Print neighbors of a node")
+    neighbors.add_argument("node_id")
+    neighbors.add_argument("--store", type=Path, default=DEFAULT_STORE)
+    neighbors.add_argument("--direction", choices=DIRECTIONS, default="out")
+    neighbors.add_argument("--rel", help="Only follow edges with this relation")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    try:
+        if args.command == "build":
+            meta = build_store(args.nodes, args.edges, args.out)
+            print(f"Wrote {args.out} ({meta['nodes']} nodes, {meta['edges']} edges)")
+        else:
+            store = open_store(args.store)
+            for neighbor in store.neighbors(args.node_id, args.direction, args.rel):
+                print(json.dumps(neighbor, ensure_ascii=False))
+    except KeyError as exc:
+        print(f"Error: unknown node {exc.args[0]!r}", file=sys.stderr)
+        return 1
+    except (OSError, RuntimeError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
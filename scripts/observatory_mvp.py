@@ -9,9 +9,16 @@ import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 
-from observatory_lib import (
-    validate_payload_if_available as validate_json,
-)  # keeps local validation semantics
+try:
+    from atomic_io import atomic_write_text
+    from observatory_lib import (
+        validate_payload_if_available as validate_json,
+    )  # keeps local validation semantics
+except ImportError:
+    # Imported by path (tests): make sibling scripts importable.
+    sys.path.append(str(Path(__file__).parent))
+    from atomic_io import atomic_write_text
+    from observatory_lib import validate_payload_if_available as validate_json
 
 
 ARTIFACTS_DIR = Path("artifacts")
@@ -239,8 +246,8 @@ def main() -> int:
     # Validate locally before writing, so CI fails with a useful message.
     validate_json(payload, SCHEMA_PATH)
 
-    OUT_PATH.write_text(
-        json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+    atomic_write_text(
+        OUT_PATH, json.dumps(payload, indent=2, ensure_ascii=False) + "\n"
     )
     print(f"Wrote {OUT_PATH}")
 
@@ -9,23 +9,65 @@ an external semantic-evidence layer that can be measured before any promotion.
 from __future__ import annotations
 
 import argparse
+import bisect
 import hashlib
+import heapq
 import json
 import math
 import re
+import sys
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable, Sequence
+from typing import Any
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional in minimal envs
+    np = None  # type: ignore[assignment]
 
 try:
     import pandas as pd
 except ModuleNotFoundError:  # pragma: no cover - optional in minimal envs
     pd = None  # type: ignore[assignment]
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ModuleNotFoundError:  # pragma: no cover - optional in minimal envs
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+try:
+    from scripts.embedding_cache import EmbeddingCache
+except ImportError:
+    # Run as `scripts/repobrief_chunk_bridge.py`: the sibling is importable.
+    from embedding_cache import EmbeddingCache
+
 KIND = "semantah.repobrief_chunk_embedding_bridge"
 VERSION = "v1"
 DEFAULT_DIM = 8
+EMBEDDING_DECIMALS = 6
+DEFAULT_ROW_GROUP_SIZE = 8192
 DEFAULT_EVAL_K = 10
+ROW_HASH_MODES = ("raw", "canonical")
+# Raw line bytes avoid re-serialising every row. A --cache written with the
+# canonical fingerprints of earlier bridge versions is migrated on first use.
+DEFAULT_ROW_HASH = "raw"
+ROW_HASH_BASIS = {
+    "raw": "sha256_of_stripped_jsonl_line_bytes",
+    "canonical": "sha256_of_sorted_key_compact_json",
+}
+EVAL_MODES = ("lexical", "vector", "hybrid")
+RANK_BASIS = {
+    "lexical": "query_token_overlap_when_query_present_else_record_order",
+    "vector": "query_embedding_cosine_when_query_present_else_record_order",
+    "hybrid": "weighted_cosine_and_token_overlap_when_query_present_else_record_order",
+}
+HYBRID_VECTOR_WEIGHT = 0.5
+VECTOR_SCORE_DECIMALS = 9
+# Upper bound on query x record scores held per batched evaluation block.
+DEFAULT_EVAL_BLOCK_ELEMENTS = 1 << 24
 DOES_NOT_ESTABLISH = [
     "answer_correctness",
     "semantic_correctness",
@@ -60,34 +102,67 @@ def canonical_json(value: Any) -> str:
 
 
 def stable_text_embedding(text: str, *, dim: int = DEFAULT_DIM) -> list[float]:
-    """Deterministic local stand-in embedding for bridge tests and offline evaluation."""
+    """Deterministic local stand-in embedding for bridge tests and offline runs."""
     if dim < 1 or dim > 4096:
         raise ValueError("embedding dim must be between 1 and 4096")
     digest = hashlib.blake2b(text.encode("utf-8"), digest_size=32).digest()
     values: list[float] = []
     for i in range(dim):
         b = digest[i % len(digest)]
-        values.append(round((b / 127.5) - 1.0, 6))
+        values.append(round((b / 127.5) - 1.0, EMBEDDING_DECIMALS))
     norm = math.sqrt(sum(v * v for v in values)) or 1.0
-    return [round(v / norm, 6) for v in values]
+    return [round(v / norm, EMBEDDING_DECIMALS) for v in values]
+
+
+def stable_embedding_revision(dim: int = DEFAULT_DIM) -> str:
+    """Embedding-cache revision key of :func:`stable_text_embedding`."""
+    return f"stable_text_embedding/dim={dim}"
+
+
+def _stable_embeddings(texts: Sequence[str], *, dim: int) -> list[list[float]]:
+    return [stable_text_embedding(text, dim=dim) for text in texts]
+
+
+def _jsonl_lines(path: Path) -> Iterator[tuple[int, bytes]]:
+    for line_no, line in enumerate(path.read_bytes().splitlines(), start=1):
+        stripped = line.strip()
+        if stripped:
+            yield line_no, stripped
+
+
+def _parse_jsonl_row(line_no: int, line: bytes) -> dict[str, Any]:
+    try:
+        row = json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"invalid JSONL at line {line_no}: {exc}") from exc
+    if not isinstance(row, dict):
+        raise ValueError(f"chunk_index row {line_no} must be a JSON object")
+    return row
 
 
 def read_jsonl(path: Path) -> list[dict[str, Any]]:
+    return [_parse_jsonl_row(line_no, line) for line_no, line in _jsonl_lines(path)]
+
+
+def read_jsonl_with_row_hashes(
+    path: Path, *, row_hash: str = DEFAULT_ROW_HASH
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Read rows together with their ``source_row_sha256`` fingerprints.
+
+    ``raw`` hashes the stripped JSONL line bytes, which is stable for the
+    canonical lines RepoBrief writes and avoids re-serialising every row.
+    ``canonical`` hashes the sorted-key JSON re-serialisation and is insensitive
+    to key order and whitespace in the input.
+    """
+    if row_hash not in ROW_HASH_MODES:
+        raise ValueError(f"unknown row hash mode: {row_hash}")
     rows: list[dict[str, Any]] = []
-    for line_no, line in enumerate(
-        path.read_text(encoding="utf-8").splitlines(), start=1
-    ):
-        stripped = line.strip()
-        if not stripped:
-            continue
-        try:
-            row = json.loads(stripped)
-        except json.JSONDecodeError as exc:
-            raise ValueError(f"invalid JSONL at line {line_no}: {exc}") from exc
-        if not isinstance(row, dict):
-            raise ValueError(f"chunk_index row {line_no} must be a JSON object")
+    hashes: list[str] = []
+    for line_no, line in _jsonl_lines(path):
+        row = _parse_jsonl_row(line_no, line)
         rows.append(row)
-    return rows
+        hashes.append(sha256_bytes(line) if row_hash == "raw" else source_row_hash(row))
+    return rows, hashes
 
 
 def read_json(path: Path) -> dict[str, Any]:
@@ -133,8 +208,16 @@ def _content_hash(row: dict[str, Any], text: str, range_ref: dict[str, Any]) ->
     return sha256_bytes(text.encode("utf-8"))
 
 
+def source_row_hash(row: dict[str, Any]) -> str:
+    return sha256_bytes(canonical_json(row).encode("utf-8"))
+
+
 def chunk_record_from_row(
-    row: dict[str, Any], *, ordinal: int, default_repo_id: str
+    row: dict[str, Any],
+    *,
+    ordinal: int,
+    default_repo_id: str,
+    row_sha256: str | None = None,
 ) -> ChunkRecord:
     text = _non_empty_string(row.get("content")) or _non_empty_string(row.get("text"))
     if text is None:
@@ -161,7 +244,7 @@ def chunk_record_from_row(
         raise ValueError(f"row {ordinal} has invalid file_path/start_byte/end_byte")
     repo_id = _non_empty_string(row.get("repo_id")) or default_repo_id
     content_sha256 = _content_hash(row, text, range_ref)
-    row_sha = sha256_bytes(canonical_json(row).encode("utf-8"))
+    row_sha = row_sha256 if row_sha256 is not None else source_row_hash(row)
     record_id = f"repobrief:{repo_id}:{chunk_id}:{content_sha256[:16]}"
     return ChunkRecord(
         record_id=record_id,
@@ -178,39 +261,202 @@ def chunk_record_from_row(
     )
 
 
+class RecordCache:
+    """Previous bridge records keyed by ``source_row_sha256``.
+
+    A cached record is reused only when the source row is byte-identical after
+    canonicalisation, the effective repo id matches and the embedding has the
+    requested dimension. Everything else is recomputed and counted as a miss.
+    """
+
+    def __init__(
+        self, records: Iterable[dict[str, Any]] = (), *, source: str | None = None
+    ) -> None:
+        self.source = source
+        self.hits = 0
+        self.misses = 0
+        self._by_row_sha: dict[str, dict[str, Any]] = {}
+        for record in records:
+            row_sha = record.get("source_row_sha256")
+            if isinstance(row_sha, str) and row_sha:
+                self._by_row_sha[row_sha] = record
+
+    def __len__(self) -> int:
+        return len(self._by_row_sha)
+
+    def knows_any(self, row_hashes: Iterable[str]) -> bool:
+        return any(row_sha in self._by_row_sha for row_sha in row_hashes)
+
+    def lookup(
+        self, row_sha256: str, *, repo_id: str, dim: int
+    ) -> dict[str, Any] | None:
+        cached = self._by_row_sha.get(row_sha256)
+        if (
+            cached is None
+            or cached.get("repo_id") != repo_id
+            or not isinstance(cached.get("embedding"), list)
+            or len(cached["embedding"]) != dim
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return cached
+
+    def summary(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "status": "ok",
+            "cache": self.source,
+            "cached_record_count": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": 0.0 if lookups == 0 else self.hits / lookups,
+        }
+
+
+def _record_from_cache_row(record: dict[str, Any]) -> dict[str, Any]:
+    embedding = record.get("embedding")
+    if hasattr(embedding, "tolist"):
+        # float32 storage; the bridge emits EMBEDDING_DECIMALS-rounded values.
+        record["embedding"] = [
+            round(value, EMBEDDING_DECIMALS) for value in embedding.tolist()
+        ]
+    if isinstance(record.get("range_ref"), str):
+        record["range_ref"] = json.loads(record["range_ref"])
+    return record
+
+
+def load_record_cache(path: Path) -> RecordCache:
+    """Load a previous bridge output (JSONL or parquet) as an incremental cache.
+
+    A missing file yields an empty cache so the first run of a daily refresh
+    does not need special casing.
+    """
+    if not path.exists():
+        return RecordCache(source=str(path))
+    if path.suffix == ".parquet":
+        if pd is None:
+            raise RuntimeError("pandas is required for parquet cache input")
+        frame = pd.read_parquet(path)
+        records = [
+            _record_from_cache_row(record) for record in frame.to_dict(orient="records")
+        ]
+    else:
+        records = read_jsonl(path)
+    return RecordCache(records, source=str(path))
+
+
+def cache_keys_for(
+    path: Path, cache: RecordCache, row_hashes: Sequence[str], *, row_hash: str
+) -> list[str] | None:
+    """Return the rows' fingerprints of another kind if ``cache`` uses that kind.
+
+    Returns None when the cache is empty or shares a fingerprint with
+    ``row_hashes``. Otherwise ``path`` is hashed once more per other mode, so a
+    cache written with another ``--row-hash`` is reused (and migrated by
+    :func:`build_records`) instead of being rebuilt from scratch.
+    """
+    if not len(cache) or cache.knows_any(row_hashes):
+        return None
+    for other in ROW_HASH_MODES:
+        if other == row_hash:
+            continue
+        _, keys = read_jsonl_with_row_hashes(path, row_hash=other)
+        if cache.knows_any(keys):
+            return keys
+    return None
+
+
+def _record_from_chunk(
+    chunk: ChunkRecord, *, dim: int, embedding: list[float] | None = None
+) -> dict[str, Any]:
+    return {
+        "id": chunk.record_id,
+        "doc_id": f"{chunk.repo_id}:{chunk.file_path}",
+        "namespace": "repobrief-chunks",
+        "text": chunk.text,
+        "embedding": (
+            stable_text_embedding(chunk.text, dim=dim)
+            if embedding is None
+            else embedding
+        ),
+        "repo_id": chunk.repo_id,
+        "repobrief_chunk_id": chunk.chunk_id,
+        "content_sha256": chunk.content_sha256,
+        "source_row_sha256": chunk.source_row_sha256,
+        "file_path": chunk.file_path,
+        "start_byte": chunk.start_byte,
+        "end_byte": chunk.end_byte,
+        "range_ref": chunk.range_ref,
+        "bridge_input_basis": "repobrief_chunk_index_stable_ids_ranges_hashes",
+    }
+
+
 def build_records(
     rows: Sequence[dict[str, Any]],
     *,
     default_repo_id: str,
     dim: int = DEFAULT_DIM,
+    cache: RecordCache | None = None,
+    row_hashes: Sequence[str] | None = None,
+    embedding_cache: EmbeddingCache | None = None,
+    cache_keys: Sequence[str] | None = None,
 ) -> list[dict[str, Any]]:
+    """Turn chunk_index rows into bridge records.
+
+    Without ``row_hashes`` rows are fingerprinted canonically, because their
+    line bytes are unknown. ``cache`` reuses whole records of unchanged rows,
+    looked up by ``cache_keys`` when given (see :func:`cache_keys_for`); reused
+    records then take the row's own fingerprint. The remaining chunks are
+    embedded through ``embedding_cache`` when given.
+    """
+    if row_hashes is not None and len(row_hashes) != len(rows):
+        raise ValueError("row_hashes must have one entry per row")
+    if cache_keys is not None and len(cache_keys) != len(rows):
+        raise ValueError("cache_keys must have one entry per row")
     records: list[dict[str, Any]] = []
     seen: set[str] = set()
+    chunks: list[tuple[int, ChunkRecord]] = []
     for ordinal, row in enumerate(rows):
+        row_sha = (
+            row_hashes[ordinal] if row_hashes is not None else source_row_hash(row)
+        )
+        if cache is not None:
+            repo_id = _non_empty_string(row.get("repo_id")) or default_repo_id
+            key = cache_keys[ordinal] if cache_keys is not None else row_sha
+            cached = cache.lookup(key, repo_id=repo_id, dim=dim)
+            if cached is not None:
+                if key != row_sha:
+                    cached = {**cached, "source_row_sha256": row_sha}
+                if cached["id"] in seen:
+                    raise ValueError(f"duplicate stable record id: {cached['id']}")
+                seen.add(cached["id"])
+                records.append(cached)
+                continue
         chunk = chunk_record_from_row(
-            row, ordinal=ordinal, default_repo_id=default_repo_id
+            row,
+            ordinal=ordinal,
+            default_repo_id=default_repo_id,
+            row_sha256=row_sha,
         )
         if chunk.record_id in seen:
             raise ValueError(f"duplicate stable record id: {chunk.record_id}")
         seen.add(chunk.record_id)
-        records.append(
-            {
-                "id": chunk.record_id,
-                "doc_id": f"{chunk.repo_id}:{chunk.file_path}",
-                "namespace": "repobrief-chunks",
-                "text": chunk.text,
-                "embedding": stable_text_embedding(chunk.text, dim=dim),
-                "repo_id": chunk.repo_id,
-                "repobrief_chunk_id": chunk.chunk_id,
-                "content_sha256": chunk.content_sha256,
-                "source_row_sha256": chunk.source_row_sha256,
-                "file_path": chunk.file_path,
-                "start_byte": chunk.start_byte,
-                "end_byte": chunk.end_byte,
-                "range_ref": chunk.range_ref,
-                "bridge_input_basis": "repobrief_chunk_index_stable_ids_ranges_hashes",
-            }
+        if embedding_cache is None:
+            records.append(_record_from_chunk(chunk, dim=dim))
+        else:
+            chunks.append((len(records), chunk))
+            records.append({})
+    if chunks:
+        vectors = embedding_cache.get_or_compute(
+            stable_embedding_revision(dim),
+            [chunk.text for _, chunk in chunks],
+            lambda texts: _stable_embeddings(texts, dim=dim),
         )
+        for (position, chunk), vector in zip(chunks, vectors, strict=True):
+            # float32 storage; the bridge emits EMBEDDING_DECIMALS-rounded values.
+            embedding = [round(value, EMBEDDING_DECIMALS) for value in vector.tolist()]
+            records[position] = _record_from_chunk(chunk, dim=dim, embedding=embedding)
     return records
 
 
@@ -218,58 +464,130 @@ def _tokens(value: str) -> set[str]:
     return {token for token in re.split(r"[^A-Za-z0-9_]+", value.lower()) if token}
 
 
-def _query_score(record: dict[str, Any], query: str) -> tuple[int, int, str, str]:
-    query_tokens = _tokens(query)
-    haystack = " ".join(
+def _haystack(record: dict[str, Any]) -> str:
+    return " ".join(
         [
             str(record.get("text", "")),
             str(record.get("file_path", "")),
             str(record.get("repobrief_chunk_id", "")),
         ]
     )
-    record_tokens = _tokens(haystack)
-    overlap = len(query_tokens & record_tokens)
-    phrase_bonus = 1 if query.lower() in haystack.lower() else 0
-    return (
-        -(overlap + phrase_bonus),
-        len(str(record.get("file_path", ""))),
-        str(record.get("file_path", "")),
-        str(record.get("repobrief_chunk_id", "")),
+
+
+def _tie_break(record: dict[str, Any]) -> tuple[int, str, str]:
+    file_path = str(record.get("file_path", ""))
+    return (len(file_path), file_path, str(record.get("repobrief_chunk_id", "")))
+
+
+def _embedding_matrix(records: Sequence[dict[str, Any]]) -> Any:
+    if np is None:
+        raise RuntimeError("numpy is required for vector evaluation")
+    if not records:
+        return np.zeros((0, DEFAULT_DIM), dtype=np.float64)
+    matrix = np.asarray([record["embedding"] for record in records], dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return matrix / norms
+
+
+def _vector_scores(matrix: Any, query: str) -> Any:
+    """Cosine similarity of every record to the embedded query in one mat-vec.
+
+    Scores are rounded so ties do not depend on BLAS summation order.
+    """
+    query_vector = np.asarray(
+        stable_text_embedding(query, dim=matrix.shape[1]), dtype=np.float64
     )
+    norm = np.linalg.norm(query_vector) or 1.0
+    return np.round(matrix @ (query_vector / norm), VECTOR_SCORE_DECIMALS)
 
 
-def _rank_records(
-    records: Sequence[dict[str, Any]], query: str | None
-) -> list[dict[str, Any]]:
-    if not query:
-        return list(records)
-    return sorted(records, key=lambda record: _query_score(record, query))
+class _EvalIndex:
+    """Per-record data derived once per evaluation instead of once per query."""
 
+    def __init__(self, records: Sequence[dict[str, Any]], *, mode: str) -> None:
+        self.records = records
+        self.tie_keys = [
+            (*_tie_break(record), ordinal) for ordinal, record in enumerate(records)
+        ]
+        self.ordinals_by_chunk: dict[str, list[int]] = {}
+        for ordinal, record in enumerate(records):
+            chunk_id = str(record.get("repobrief_chunk_id"))
+            self.ordinals_by_chunk.setdefault(chunk_id, []).append(ordinal)
+        self.token_sets: list[set[str]] = []
+        self.lowered: list[str] = []
+        if mode != "vector":
+            for record in records:
+                haystack = _haystack(record)
+                self.token_sets.append(_tokens(haystack))
+                self.lowered.append(haystack.lower())
+        self.matrix = _embedding_matrix(records) if mode != "lexical" else None
+
+    def lexical_scores(self, query: str) -> list[int]:
+        query_tokens = _tokens(query)
+        query_lower = query.lower()
+        return [
+            len(query_tokens & tokens) + (1 if query_lower in lowered else 0)
+            for tokens, lowered in zip(self.token_sets, self.lowered, strict=True)
+        ]
 
-def evaluate_recall(
-    records: Sequence[dict[str, Any]],
-    goldset: Sequence[dict[str, Any]],
+    def scores(self, query: str, *, mode: str) -> list[float]:
+        if mode == "lexical":
+            return [float(score) for score in self.lexical_scores(query)]
+        cosine = _vector_scores(self.matrix, query)
+        if mode == "vector":
+            return cosine.tolist()
+        lexical = np.asarray(self.lexical_scores(query), dtype=np.float64)
+        lexical_max = len(_tokens(query)) + 1
+        hybrid = HYBRID_VECTOR_WEIGHT * cosine + (1.0 - HYBRID_VECTOR_WEIGHT) * (
+            lexical / lexical_max
+        )
+        return np.round(hybrid, VECTOR_SCORE_DECIMALS).tolist()
+
+    def rank_of(self, expected: Any, scores: list[float] | None) -> int | None:
+        """Return the 1-based rank of the best record carrying ``expected``.
+
+        The rank is the number of records ordered strictly before it under
+        (-score, tie-break, input order), so no per-query sort is needed.
+        """
+        ordinals = self.ordinals_by_chunk.get(str(expected))
+        if not ordinals:
+            return None
+        if scores is None:
+            return ordinals[0] + 1
+        tie_keys = self.tie_keys
+        best = min(ordinals, key=lambda idx: (-scores[idx], tie_keys[idx]))
+        best_score = scores[best]
+        best_tie = tie_keys[best]
+        ahead = 0
+        for score, tie in zip(scores, tie_keys, strict=True):
+            if score > best_score or (score == best_score and tie < best_tie):
+                ahead += 1
+        return ahead + 1
+
+    def top_k(self, scores: list[float] | None, k: int) -> list[dict[str, Any]]:
+        if scores is None:
+            return list(self.records[:k])
+        tie_keys = self.tie_keys
+        best = heapq.nsmallest(
+            k, range(len(scores)), key=lambda idx: (-scores[idx], tie_keys[idx])
+        )
+        return [self.records[idx] for idx in best]
+
+
+def _recall_result(
+    cases: Iterable[tuple[str | None, Any, int | None, list[str]]],
     *,
-    k: int = DEFAULT_EVAL_K,
+    total: int,
+    k: int,
+    mode: str,
 ) -> dict[str, Any]:
-    total = len(goldset)
     hits = 0
     reciprocal_sum = 0.0
     misses: list[dict[str, Any]] = []
     case_details: list[dict[str, Any]] = []
 
-    for item in goldset:
-        expected = item.get("expected_chunk_id")
-        query = _non_empty_string(item.get("query"))
-        ranked = _rank_records(records, query)
-        top_k = ranked[:k]
-        top_ids = [str(r["repobrief_chunk_id"]) for r in top_k]
-        rank = None
-        if expected is not None:
-            for idx, record in enumerate(ranked, start=1):
-                if str(record.get("repobrief_chunk_id")) == str(expected):
-                    rank = idx
-                    break
+    for query, expected, rank, top_ids in cases:
         if rank is None:
             miss_reason = "missing_from_bridge_records"
             misses.append({"expected_chunk_id": expected, "reason": miss_reason})
@@ -312,12 +630,250 @@ def evaluate_recall(
         "k": k,
         "recall": 1.0 if total == 0 else hits / total,
         "mrr": 0.0 if total == 0 else reciprocal_sum / total,
-        "rank_basis": "query_token_overlap_when_query_present_else_record_order",
+        "mode": mode,
+        "rank_basis": RANK_BASIS[mode],
         "miss_taxonomy": misses,
         "cases": case_details,
     }
 
 
+def evaluate_recall(
+    records: Sequence[dict[str, Any]],
+    goldset: Sequence[dict[str, Any]],
+    *,
+    k: int = DEFAULT_EVAL_K,
+    mode: str = "lexical",
+) -> dict[str, Any]:
+    if mode not in EVAL_MODES:
+        raise ValueError(f"unknown evaluation mode: {mode}")
+    index = _EvalIndex(records, mode=mode)
+
+    def cases() -> Iterator[tuple[str | None, Any, int | None, list[str]]]:
+        for item in goldset:
+            expected = item.get("expected_chunk_id")
+            query = _non_empty_string(item.get("query"))
+            scores = index.scores(query, mode=mode) if query else None
+            top_ids = [str(r["repobrief_chunk_id"]) for r in index.top_k(scores, k)]
+            rank = None if expected is None else index.rank_of(expected, scores)
+            yield query, expected, rank, top_ids
+
+    return _recall_result(cases(), total=len(goldset), k=k, mode=mode)
+
+
+class _BatchEvalIndex:
+    """Array form of the records for scoring many queries per pass.
+
+    Lexical overlap is the product of a sparse query-token incidence with the
+    token→record postings (accumulated with ``bincount``); vector scores are a
+    dense query-block × record matrix product. Rankings use the same
+    (-score, tie-break, input order) total order as :class:`_EvalIndex`.
+    """
+
+    def __init__(self, records: Sequence[dict[str, Any]], *, mode: str) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for batched evaluation")
+        self.records = records
+        self.size = len(records)
+        tie_keys = [
+            (*_tie_break(record), ordinal) for ordinal, record in enumerate(records)
+        ]
+        order = sorted(range(self.size), key=tie_keys.__getitem__)
+        self.tie_pos = np.empty(self.size, dtype=np.int64)
+        self.tie_pos[order] = np.arange(self.size, dtype=np.int64)
+        self.ordinals_by_chunk: dict[str, list[int]] = {}
+        for ordinal, record in enumerate(records):
+            chunk_id = str(record.get("repobrief_chunk_id"))
+            self.ordinals_by_chunk.setdefault(chunk_id, []).append(ordinal)
+        if mode != "vector":
+            self._build_lexical()
+        self.matrix = _embedding_matrix(records) if mode != "lexical" else None
+
+    def _build_lexical(self) -> None:
+        vocabulary: dict[str, int] = {}
+        token_ids: list[int] = []
+        counts: list[int] = []
+        lowered: list[str] = []
+        for record in self.records:
+            haystack = _haystack(record)
+            lowered.append(haystack.lower())
+            tokens = _tokens(haystack)
+            counts.append(len(tokens))
+            token_ids.extend(vocabulary.setdefault(t, len(vocabulary)) for t in tokens)
+        flat_tokens = np.asarray(token_ids, dtype=np.int64)
+        owners = np.repeat(np.arange(self.size, dtype=np.int64), counts)
+        by_token = np.argsort(flat_tokens, kind="stable")
+        self.vocabulary = vocabulary
+        self.postings = owners[by_token]
+        self.posting_ptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(flat_tokens, minlength=len(vocabulary)),
+            out=self.posting_ptr[1:],
+        )
+        # One searchable string per evaluation for the phrase bonus; records are
+        # separated by NUL so a NUL-free query cannot match across records.
+        self.lowered = lowered
+        self.blob = "\0".join(lowered)
+        self.offsets = [0]
+        for text in lowered:
+            self.offsets.append(self.offsets[-1] + len(text) + 1)
+
+    def _phrase_hits(self, query_lower: str) -> list[int]:
+        if "\0" in query_lower:
+            return [i for i, text in enumerate(self.lowered) if query_lower in text]
+        hits: list[int] = []
+        pos = self.blob.find(query_lower)
+        while pos != -1:
+            record = bisect.bisect_right(self.offsets, pos) - 1
+            hits.append(record)
+            if record + 1 >= self.size:
+                break
+            pos = self.blob.find(query_lower, self.offsets[record + 1])
+        return hits
+
+    def _lexical_block(self, queries: Sequence[str]) -> Any:
+        parts = [np.zeros(0, dtype=np.int64)]
+        for row, query in enumerate(queries):
+            base = row * self.size
+            for token in _tokens(query):
+                token_id = self.vocabulary.get(token)
+                if token_id is not None:
+                    start, stop = self.posting_ptr[token_id : token_id + 2]
+                    parts.append(self.postings[start:stop] + base)
+            hits = self._phrase_hits(query.lower())
+            if hits:
+                parts.append(np.asarray(hits, dtype=np.int64) + base)
+        counts = np.bincount(np.concatenate(parts), minlength=len(queries) * self.size)
+        return counts.reshape(len(queries), self.size).astype(np.float64)
+
+    def _vector_block(self, queries: Sequence[str]) -> Any:
+        dim = self.matrix.shape[1]
+        query_matrix = np.asarray(
+            [stable_text_embedding(query, dim=dim) for query in queries],
+            dtype=np.float64,
+        )
+        norms = np.linalg.norm(query_matrix, axis=1, keepdims=True)
+        norms[norms == 0.0] = 1.0
+        return np.round((query_matrix / norms) @ self.matrix.T, VECTOR_SCORE_DECIMALS)
+
+    def score_block(self, queries: Sequence[str], *, mode: str) -> Any:
+        if mode == "lexical":
+            return self._lexical_block(queries)
+        cosine = self._vector_block(queries)
+        if mode == "vector":
+            return cosine
+        lexical = self._lexical_block(queries)
+        lexical_max = np.asarray(
+            [len(_tokens(query)) + 1 for query in queries], dtype=np.float64
+        )[:, None]
+        hybrid = HYBRID_VECTOR_WEIGHT * cosine + (1.0 - HYBRID_VECTOR_WEIGHT) * (
+            lexical / lexical_max
+        )
+        return np.round(hybrid, VECTOR_SCORE_DECIMALS)
+
+    def rank_of(self, expected: Any, scores: Any) -> int | None:
+        ordinals = self.ordinals_by_chunk.get(str(expected))
+        if not ordinals:
+            return None
+        candidates = np.asarray(ordinals, dtype=np.int64)
+        best = candidates[
+            np.lexsort((self.tie_pos[candidates], -scores[candidates]))[0]
+        ]
+        best_score = scores[best]
+        ahead = np.count_nonzero(scores > best_score) + np.count_nonzero(
+            (scores == best_score) & (self.tie_pos < self.tie_pos[best])
+        )
+        return int(ahead) + 1
+
+    def top_k(self, scores: Any, k: int) -> list[int]:
+        if k <= 0 or self.size == 0:
+            return []
+        if k < self.size:
+            kth = np.partition(-scores, k - 1)[k - 1]
+            ahead = np.flatnonzero(-scores < kth)
+            tied = np.flatnonzero(-scores == kth)
+            needed = k - len(ahead)
+            if len(tied) > needed:
+                tied = tied[np.argpartition(self.tie_pos[tied], needed - 1)[:needed]]
+            selected = np.concatenate([ahead, tied])
+        else:
+            selected = np.arange(self.size)
+        order = np.lexsort((self.tie_pos[selected], -scores[selected]))
+        return selected[order].tolist()
+
+
+def evaluate_recall_batched(
+    records: Sequence[dict[str, Any]],
+    goldset: Sequence[dict[str, Any]],
+    *,
+    k: int = DEFAULT_EVAL_K,
+    mode: str = "lexical",
+    block_elements: int = DEFAULT_EVAL_BLOCK_ELEMENTS,
+) -> dict[str, Any]:
+    """Batched equivalent of :func:`evaluate_recall`.
+
+    Queries are scored in blocks against all records at once; a block holds at
+    most ``block_elements`` query×record scores, which bounds peak memory.
+    The result is identical to :func:`evaluate_recall`.
+    """
+    if mode not in EVAL_MODES:
+        raise ValueError(f"unknown evaluation mode: {mode}")
+    index = _BatchEvalIndex(records, mode=mode)
+    cases: list[tuple[str | None, Any, int | None, list[str]] | None] = []
+    pending: list[tuple[int, str, Any]] = []
+    for item in goldset:
+        expected = item.get("expected_chunk_id")
+        query = _non_empty_string(item.get("query"))
+        if query:
+            pending.append((len(cases), query, expected))
+            cases.append(None)
+            continue
+        top_ids = [str(r["repobrief_chunk_id"]) for r in records[: max(k, 0)]]
+        ordinals = index.ordinals_by_chunk.get(str(expected))
+        rank = None if expected is None or not ordinals else ordinals[0] + 1
+        cases.append((query, expected, rank, top_ids))
+
+    block_size = max(1, block_elements // max(index.size, 1))
+    for start in range(0, len(pending), block_size):
+        block = pending[start : start + block_size]
+        scores = index.score_block([query for _, query, _ in block], mode=mode)
+        for row, (slot, query, expected) in enumerate(block):
+            row_scores = scores[row]
+            top_ids = [
+                str(records[idx]["repobrief_chunk_id"])
+                for idx in index.top_k(row_scores, k)
+            ]
+            rank = None if expected is None else index.rank_of(expected, row_scores)
+            cases[slot] = (query, expected, rank, top_ids)
+
+    return _recall_result(cases, total=len(goldset), k=k, mode=mode)
+
+
+def evaluate_recall_modes(
+    records: Sequence[dict[str, Any]],
+    goldset: Sequence[dict[str, Any]],
+    *,
+    k: int = DEFAULT_EVAL_K,
+    modes: Sequence[str] = EVAL_MODES,
+) -> dict[str, Any]:
+    """Evaluate the goldset under several rankings and report them side by side.
+
+    Uses the batched engine when NumPy is available.
+    """
+    evaluate = evaluate_recall_batched if np is not None else evaluate_recall
+    results = {mode: evaluate(records, goldset, k=k, mode=mode) for mode in modes}
+    return {
+        "modes": results,
+        "summary": {
+            mode: {
+                "recall": result["recall"],
+                "mrr": result["mrr"],
+                "hit_count": result["hit_count"],
+            }
+            for mode, result in results.items()
+        },
+    }
+
+
 def _normalise_metric(value: Any) -> float | None:
     if isinstance(value, bool) or not isinstance(value, (int, float)):
         return None
@@ -400,7 +956,10 @@ def compare_to_baseline(
     return {
         "status": "pass" if not blockers else "warn",
         "promotion_allowed": False,
-        "promotion_rule": "default use requires explicit later decision after measured baseline comparison",
+        "promotion_rule": (
+            "default use requires explicit later decision "
+            "after measured baseline comparison"
+        ),
         "baseline_metrics": {
             "recall": baseline_recall,
             "mrr": baseline_mrr,
@@ -433,6 +992,10 @@ def build_report(
     goldset: Sequence[dict[str, Any]] | None = None,
     baseline_report: dict[str, Any] | None = None,
     k: int = DEFAULT_EVAL_K,
+    cache: RecordCache | None = None,
+    eval_modes: Sequence[str] = ("lexical",),
+    row_hash: str = DEFAULT_ROW_HASH,
+    embedding_cache: EmbeddingCache | None = None,
 ) -> dict[str, Any]:
     chunk_bytes = chunk_index.read_bytes()
     report = {
@@ -442,6 +1005,7 @@ def build_report(
         "chunk_index": str(chunk_index),
         "chunk_index_sha256": sha256_bytes(chunk_bytes),
         "record_count": len(records),
+        "source_row_hash_basis": ROW_HASH_BASIS[row_hash],
         "input_contract": "stable RepoBrief chunk ids, byte ranges, and content hashes",
         "external_layer": {
             "owner": "semantAH",
@@ -461,8 +1025,19 @@ def build_report(
         },
         "does_not_establish": DOES_NOT_ESTABLISH,
     }
+    if cache is not None:
+        report["incremental"] = cache.summary()
+    else:
+        report["incremental"] = {"status": "not_run", "reason": "no_cache_provided"}
+    if embedding_cache is not None:
+        report["embedding_cache"] = {"status": "ok", **embedding_cache.summary()}
     if goldset is not None:
-        report["evaluation"] = evaluate_recall(records, goldset, k=k)
+        modes = tuple(dict.fromkeys(("lexical", *eval_modes)))
+        by_mode = evaluate_recall_modes(records, goldset, k=k, modes=modes)
+        # The lexical result stays the baseline-comparable evaluation.
+        report["evaluation"] = by_mode["modes"]["lexical"]
+        if modes != ("lexical",):
+            report["evaluation_modes"] = by_mode
     else:
         report["evaluation"] = {
             "status": "not_run",
@@ -493,11 +1068,103 @@ def write_jsonl(path: Path, records: Iterable[dict[str, Any]]) -> None:
             handle.write(json.dumps(record, sort_keys=True, ensure_ascii=False) + "\n")
 
 
-def write_parquet(path: Path, records: Sequence[dict[str, Any]]) -> None:
-    if pd is None:
-        raise RuntimeError("pandas is required for parquet output")
+def parquet_schema(dim: int) -> Any:
+    """Typed Arrow schema for bridge records.
+
+    Embeddings are fixed-size float32 lists, low-cardinality strings are
+    dictionary encoded and ``range_ref`` is stored as canonical JSON because its
+    keys vary between RepoBrief artifact roles.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required for parquet output")
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [
+            pa.field("id", pa.string(), nullable=False),
+            pa.field("doc_id", pa.string()),
+            pa.field("namespace", dictionary),
+            pa.field("text", pa.string()),
+            pa.field("embedding", pa.list_(pa.float32(), dim)),
+            pa.field("repo_id", dictionary),
+            pa.field("repobrief_chunk_id", pa.string()),
+            pa.field("content_sha256", pa.string()),
+            pa.field("source_row_sha256", pa.string()),
+            pa.field("file_path", dictionary),
+            pa.field("start_byte", pa.int64()),
+            pa.field("end_byte", pa.int64()),
+            pa.field("range_ref", pa.string()),
+            pa.field("bridge_input_basis", dictionary),
+        ],
+        metadata={"kind": KIND, "version": VERSION, "range_ref": "canonical_json"},
+    )
+
+
+def _parquet_batch(records: Sequence[dict[str, Any]], schema: Any) -> Any:
+    dim = schema.field("embedding").type.list_size
+    embeddings = [record["embedding"] for record in records]
+    if any(len(embedding) != dim for embedding in embeddings):
+        raise ValueError(f"all embeddings must have dimension {dim}")
+    if np is not None:
+        flat = pa.array(
+            np.asarray(embeddings, dtype=np.float32).reshape(-1), type=pa.float32()
+        )
+    else:  # pragma: no cover - numpy is a declared dependency
+        flat = pa.array(
+            [value for embedding in embeddings for value in embedding],
+            type=pa.float32(),
+        )
+    columns = []
+    for field in schema:
+        if field.name == "embedding":
+            columns.append(pa.FixedSizeListArray.from_arrays(flat, dim))
+            continue
+        values = [record.get(field.name) for record in records]
+        if field.name == "range_ref":
+            values = [None if v is None else canonical_json(v) for v in values]
+        if pa.types.is_dictionary(field.type):
+            columns.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            columns.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def write_parquet(
+    path: Path,
+    records: Iterable[dict[str, Any]],
+    *,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> None:
+    """Write records with a typed schema, one row group per ``row_group_size``.
+
+    Only one row group is materialised at a time, so ``records`` may be a
+    generator over an arbitrarily large record set.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required for parquet output")
+    if row_group_size < 1:
+        raise ValueError("row_group_size must be at least 1")
     path.parent.mkdir(parents=True, exist_ok=True)
-    pd.DataFrame(list(records)).to_parquet(path)
+    writer = None
+    batch: list[dict[str, Any]] = []
+    try:
+        for record in records:
+            batch.append(record)
+            if len(batch) < row_group_size:
+                continue
+            if writer is None:
+                schema = parquet_schema(len(batch[0]["embedding"]))
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_batch(_parquet_batch(batch, schema))
+            batch = []
+        if writer is None:
+            dim = len(batch[0]["embedding"]) if batch else DEFAULT_DIM
+            schema = parquet_schema(dim)
+            writer = pq.ParquetWriter(path, schema)
+        if batch:
+            writer.write_batch(_parquet_batch(batch, schema))
+    finally:
+        if writer is not None:
+            writer.close()
 
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
@@ -506,8 +1173,33 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser.add_argument("--default-repo-id", default="repo")
     parser.add_argument("--dim", type=int, default=DEFAULT_DIM)
     parser.add_argument("--eval-k", type=int, default=DEFAULT_EVAL_K)
+    parser.add_argument(
+        "--eval-mode",
+        action="append",
+        choices=EVAL_MODES,
+        help="goldset ranking to evaluate; repeat to compare (default: lexical)",
+    )
+    parser.add_argument(
+        "--row-hash",
+        choices=ROW_HASH_MODES,
+        default=DEFAULT_ROW_HASH,
+        help=(
+            "source_row_sha256 basis: raw line bytes (default, fast) or "
+            "canonical JSON; a --cache written with the other basis is migrated"
+        ),
+    )
     parser.add_argument("--out-jsonl", type=Path)
     parser.add_argument("--out-parquet", type=Path)
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        help="previous bridge output (JSONL or parquet) reused for unchanged rows",
+    )
+    parser.add_argument(
+        "--embedding-cache",
+        type=Path,
+        help="SQLite embedding cache shared with tools/build_index.py",
+    )
     parser.add_argument("--report", required=True, type=Path)
     parser.add_argument("--goldset", type=Path)
     parser.add_argument("--baseline-report", type=Path)
@@ -516,8 +1208,33 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
 
 def main(argv: Sequence[str] | None = None) -> int:
     args = parse_args(argv)
-    rows = read_jsonl(args.chunk_index)
-    records = build_records(rows, default_repo_id=args.default_repo_id, dim=args.dim)
+    rows, row_hashes = read_jsonl_with_row_hashes(
+        args.chunk_index, row_hash=args.row_hash
+    )
+    cache = load_record_cache(args.cache) if args.cache else None
+    cache_keys = None
+    if cache is not None:
+        cache_keys = cache_keys_for(
+            args.chunk_index, cache, row_hashes, row_hash=args.row_hash
+        )
+        if cache_keys is not None:
+            print(
+                f"[bridge] {args.cache} was written with another row fingerprint; "
+                f"migrating its records to --row-hash {args.row_hash}",
+                file=sys.stderr,
+            )
+    embedding_cache = (
+        EmbeddingCache(args.embedding_cache) if args.embedding_cache else None
+    )
+    records = build_records(
+        rows,
+        default_repo_id=args.default_repo_id,
+        dim=args.dim,
+        cache=cache,
+        row_hashes=row_hashes,
+        embedding_cache=embedding_cache,
+        cache_keys=cache_keys,
+    )
     goldset = read_jsonl(args.goldset) if args.goldset else None
     baseline_report = read_json(args.baseline_report) if args.baseline_report else None
     if args.out_jsonl:
@@ -530,7 +1247,13 @@ def main(argv: Sequence[str] | None = None) -> int:
         goldset=goldset,
         baseline_report=baseline_report,
         k=args.eval_k,
+        cache=cache,
+        eval_modes=args.eval_mode or ("lexical",),
+        row_hash=args.row_hash,
+        embedding_cache=embedding_cache,
     )
+    if embedding_cache is not None:
+        embedding_cache.close()
     args.report.parent.mkdir(parents=True, exist_ok=True)
     args.report.write_text(
         json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8"
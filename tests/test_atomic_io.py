@@ -0,0 +1,83 @@
+"""Tests for scripts/atomic_io.py"""
+
+from __future__ import annotations
+
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from scripts import atomic_io
+
+
+@pytest.mark.parametrize("policy", atomic_io.FSYNC_POLICIES)
+def test_atomic_write_replaces_target_without_leftovers(tmp_path: Path, policy: str):
+    target = tmp_path / "today.json"
+    target.write_text("old", encoding="utf-8")
+
+    atomic_io.atomic_write_text(target, "neu ✓", fsync=policy)
+
+    assert target.read_text(encoding="utf-8") == "neu ✓"
+    assert [p.name for p in tmp_path.iterdir()] == ["today.json"]
+
+
+def test_atomic_batch_leaves_targets_untouched_on_error(tmp_path: Path):
+    first = tmp_path / "summary.json"
+    first.write_text("old", encoding="utf-8")
+
+    with pytest.raises(RuntimeError), atomic_io.AtomicBatch() as batch:
+        batch.write_text(first, "new")
+        batch.write_text(tmp_path / "event.json", "new")
+        raise RuntimeError("boom")
+
+    assert first.read_text(encoding="utf-8") == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["summary.json"]
+
+
+def test_atomic_batch_commits_all_files(tmp_path: Path):
+    with atomic_io.AtomicBatch(fsync="full") as batch:
+        batch.write_bytes(tmp_path / "a.json", b"a")
+        batch.write_bytes(tmp_path / "b.json", b"b")
+
+    assert (tmp_path / "a.json").read_bytes() == b"a"
+    assert (tmp_path / "b.json").read_bytes() == b"b"
+
+
+def test_resolve_fsync_policy_env_and_validation(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(atomic_io.FSYNC_ENV, "none")
+    assert atomic_io.resolve_fsync_policy() == "none"
+    assert atomic_io.resolve_fsync_policy("full") == "full"
+
+    monkeypatch.setenv(atomic_io.FSYNC_ENV, "sometimes")
+    with pytest.raises(ValueError, match="Unknown fsync policy"):
+        atomic_io.resolve_fsync_policy()
+
+
+def test_atomic_batch_open_streams_into_staged_file(tmp_path: Path):
+    target = tmp_path / "edges.jsonl"
+    target.write_text("old\n", encoding="utf-8")
+
+    with atomic_io.AtomicBatch() as batch:
+        handle = batch.open(target)
+        for n in range(3):
+            handle.write(b"line %d\n" % n)
+        assert target.read_text(encoding="utf-8") == "old\n"
+
+    assert handle.closed
+    assert target.read_bytes() == b"line 0\nline 1\nline 2\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["edges.jsonl"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permission bits")
+def test_atomic_write_keeps_permissions_of_replaced_file(tmp_path: Path):
+    target = tmp_path / "summary.json"
+    target.write_text("old", encoding="utf-8")
+    target.chmod(0o640)
+
+    atomic_io.atomic_write_text(target, "new")
+    with atomic_io.AtomicBatch() as batch:
+        batch.open(target).write(b"streamed")
+
+    assert target.read_text(encoding="utf-8") == "streamed"
+    assert stat.S_IMODE(target.stat().st_mode) == 0o640
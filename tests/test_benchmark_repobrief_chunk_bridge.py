@@ -0,0 +1,76 @@
+import copy
+from pathlib import Path
+
+from scripts import benchmark_repobrief_chunk_bridge as bench
+
+
+def test_benchmark_reports_per_stage_timings_for_each_size(tmp_path: Path):
+    report = bench.run_benchmark([20, 40], queries=3, workdir=tmp_path)
+
+    assert report["kind"] == "semantah.repobrief_chunk_bridge_benchmark"
+    assert [s["rows"] for s in report["scenarios"]] == [20, 40]
+    stages = report["scenarios"][0]["stages"]
+    assert {"read_jsonl", "build_records", "evaluate_recall_lexical"} <= set(stages)
+    assert {"read_row_hash_raw", "read_row_hash_canonical"} <= set(stages)
+    assert stages["build_records"]["items"] == 20
+    assert stages["evaluate_recall_lexical"]["items"] == 3
+    assert stages["write_jsonl"]["output_bytes"] > 0
+    assert all("peak_rss_bytes" not in stage for stage in stages.values())
+
+
+def test_baseline_comparison_flags_stages_over_budget_and_noise_floor():
+    baseline = {
+        "scenarios": [
+            {
+                "rows": 10,
+                "stages": {
+                    "build_records": {"seconds": 1.0},
+                    "write_jsonl": {"seconds": 0.01},
+                },
+            }
+        ]
+    }
+    report = copy.deepcopy(baseline)
+    report["scenarios"][0]["stages"]["build_records"]["seconds"] = 1.5
+    # 3x slower but below the absolute noise floor.
+    report["scenarios"][0]["stages"]["write_jsonl"]["seconds"] = 0.03
+    report["scenarios"].append({"rows": 99, "stages": {}})
+
+    comparison = bench.compare_to_baseline(report, baseline, budget=0.25)
+
+    assert comparison["status"] == "fail"
+    assert [r["stage"] for r in comparison["regressions"]] == ["build_records"]
+    assert comparison["unmatched"] == ["rows=99"]
+    assert bench.compare_to_baseline(baseline, baseline)["status"] == "pass"
+
+
+def test_baseline_comparison_flags_memory_growth_over_budget():
+    mib = 1 << 20
+    baseline = {
+        "scenarios": [
+            {
+                "rows": 10,
+                "peak_rss_bytes": 100 * mib,
+                "stages": {
+                    "build_records": {"seconds": 1.0, "peak_traced_bytes": 40 * mib},
+                    "write_jsonl": {"seconds": 1.0, "peak_traced_bytes": 1 * mib},
+                },
+            }
+        ]
+    }
+    report = copy.deepcopy(baseline)
+    scenario = report["scenarios"][0]
+    scenario["peak_rss_bytes"] = 150 * mib
+    scenario["stages"]["build_records"]["peak_traced_bytes"] = 60 * mib
+    # Doubled but below the absolute noise floor.
+    scenario["stages"]["write_jsonl"]["peak_traced_bytes"] = 2 * mib
+
+    comparison = bench.compare_to_baseline(report, baseline, memory_budget=0.25)
+
+    assert comparison["status"] == "fail"
+    assert [(r["stage"], r["metric"]) for r in comparison["regressions"]] == [
+        ("build_records", "peak_traced_bytes"),
+        ("scenario", "peak_rss_bytes"),
+    ]
+    relaxed = bench.compare_to_baseline(report, baseline, memory_budget=1.0)
+    assert relaxed["status"] == "pass"
@@ -0,0 +1,206 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from tools import build_graph as bg
+from tools import build_index as bi
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pyarrow.parquet")
+
+CONTRACTS = Path(__file__).resolve().parents[1] / "contracts" / "semantics"
+
+
+def _read_jsonl(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def _unit_vectors(n, dim, seed=7):
+    vectors = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_blocked_exact_neighbors_match_full_sort():
+    vectors = _unit_vectors(53, 6)
+    full = vectors @ vectors.T
+    np.fill_diagonal(full, -np.inf)
+
+    blocks = list(bg.exact_neighbors(vectors, 5, block_scores=53 * 4))
+
+    assert [start for start, _, _ in blocks] == list(range(0, 53, 4))
+    indices = np.concatenate([block for _, block, _ in blocks])
+    scores = np.concatenate([block for _, _, block in blocks])
+    np.testing.assert_array_equal(indices, np.argsort(-full, axis=1)[:, :5])
+    np.testing.assert_allclose(scores, -np.sort(-full, axis=1)[:, :5], rtol=1e-6)
+
+
+def test_exact_neighbors_caps_k_at_other_documents():
+    (block,) = bg.exact_neighbors(_unit_vectors(3, 4), 8)
+    assert block[1].shape == (3, 2)
+    assert list(bg.exact_neighbors(_unit_vectors(1, 4), 8)) == []
+
+
+def test_build_graph_links_notes_and_topics(tmp_path):
+    jsonschema = pytest.importorskip("jsonschema")
+    vault = tmp_path / "vault"
+    notes = {
+        "garten.md": "---\ntitle: Gartenplan\ntopics: [Garten, Boden]\n---\n"
+        + "Kompost Beet Boden Mulch\n\nTomaten Beet Kompost",
+        "beet.md": "---\ntopics: Garten\n---\nBeet Kompost Mulch Boden",
+        "rust.md": "Cargo Traits Ownership Borrow",
+        "kaputt.md": "---\ntopics: [unclosed\n---\nBorrow Cargo Lifetimes",
+    }
+    for rel, text in notes.items():
+        (vault / rel).parent.mkdir(parents=True, exist_ok=True)
+        (vault / rel).write_text(text, encoding="utf-8")
+    embeddings = vault / ".gewebe" / "embeddings.parquet"
+    bi.build_index(
+        vault,
+        embeddings,
+        embedder=bi.StableEmbedder(dim=32),
+        target_tokens=4,
+        max_tokens=4,
+        overlap_tokens=0,
+    )
+    nodes_path = vault / ".gewebe" / "nodes.jsonl"
+    edges_path = vault / ".gewebe" / "edges.jsonl"
+
+    stats = bg.build_graph(embeddings, nodes_path, edges_path, vault=vault, k=2)
+
+    nodes = _read_jsonl(nodes_path)
+    edges = _read_jsonl(edges_path)
+    node_schema = json.loads((CONTRACTS / "node.schema.json").read_text())
+    edge_schema = json.loads((CONTRACTS / "edge.schema.json").read_text())
+    for node in nodes:
+        jsonschema.validate(node, node_schema)
+    for edge in edges:
+        jsonschema.validate(edge, edge_schema)
+    by_id = {node["id"]: node for node in nodes}
+    assert by_id["note:garten.md"]["title"] == "Gartenplan"
+    assert by_id["note:garten.md"]["topics"] == ["Garten", "Boden"]
+    assert by_id["note:kaputt.md"] == {
+        "id": "note:kaputt.md",
+        "type": "note",
+        "title": "kaputt",
+        "source": "kaputt.md",
+    }
+    assert by_id["topic:Garten"]["type"] == "topic"
+    similar = [edge for edge in edges if edge["rel"] == "similar"]
+    about = {(e["src"], e["dst"]) for e in edges if e["rel"] == "about"}
+    assert stats == {
+        "notes": 4,
+        "topics": 2,
+        "similar_edges": len(similar),
+        "about_edges": 3,
+        "elapsed_ms": stats["elapsed_ms"],
+    }
+    assert about == {
+        ("note:garten.md", "topic:Garten"),
+        ("note:garten.md", "topic:Boden"),
+        ("note:beet.md", "topic:Garten"),
+    }
+    assert all(edge["src"] != edge["dst"] and edge["weight"] > 0 for edge in similar)
+    garten = [edge for edge in similar if edge["src"] == "note:garten.md"]
+    assert garten[0]["dst"] == "note:beet.md" and garten[0]["why"] == ["rank:1"]
+    assert [edge["weight"] for edge in garten] == sorted(
+        (edge["weight"] for edge in garten), reverse=True
+    )
+
+
+def test_load_documents_averages_normalised_chunks(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    vectors = [[3.0, 0.0], [0.0, 1.0], [0.0, 0.0], [1.0, 1.0], [2.0, 0.0]]
+    table = pa.table(
+        {
+            "path": ["a.md", "a.md", "b.md", "c.md", "a.md"],
+            "embedding": pa.array(vectors, type=pa.list_(pa.float32(), 2)),
+        }
+    )
+    path = tmp_path / "embeddings.parquet"
+    pq.write_table(table, path)
+
+    docs = bg.load_documents(path, batch_rows=2)
+
+    assert docs.paths == ["a.md", "b.md", "c.md"]
+    np.testing.assert_allclose(
+        docs.vectors,
+        [[2 / 5**0.5, 1 / 5**0.5], [0, 0], [0.5**0.5, 0.5**0.5]],
+        rtol=1e-6,
+    )
+
+
+def _clustered_vectors(n, dim, clusters, seed=3):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(0, clusters, n)] + rng.normal(size=(n, dim))
+    return bg._normalise(vectors.astype(np.float32))
+
+
+def test_ivf_probing_every_list_is_exact():
+    vectors = _clustered_vectors(300, 8, 6)
+    exact = list(bg.exact_neighbors(vectors, 5))
+    (start, exact_indices, exact_scores), *_ = exact
+
+    indices, scores = bg.ivf_neighbors(vectors, 5, lists=7, probes=7)
+
+    assert len(exact) == 1 and start == 0
+    np.testing.assert_array_equal(indices, exact_indices)
+    np.testing.assert_allclose(scores, exact_scores, rtol=1e-6)
+
+
+def test_ivf_recall_grows_with_probes():
+    vectors = _clustered_vectors(2000, 16, 40)
+    rows = np.arange(0, 2000, 10)
+
+    recalls = [
+        bg.recall_at_k(vectors, bg.ivf_neighbors(vectors, 8, probes=p)[0], rows)
+        for p in (1, 4, 45)
+    ]
+
+    assert 0.5 < recalls[0] <= recalls[1] <= recalls[2] == 1.0
+
+
+def test_ivf_pads_rows_without_candidates():
+    vectors = _unit_vectors(6, 4)
+
+    # One note per list and one probe: only the note itself is a candidate.
+    indices, scores = bg.ivf_neighbors(vectors, 3, lists=6, probes=1)
+
+    assert (indices == -1).all() and np.isneginf(scores).all()
+
+
+def test_build_graph_ivf_mode_reports_recall_and_writes_same_schema(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    vectors = _clustered_vectors(120, 8, 5)
+    path = tmp_path / "embeddings.parquet"
+    pq.write_table(
+        pa.table(
+            {
+                "path": [f"n{i:03d}.md" for i in range(120)],
+                "embedding": pa.array(vectors.tolist(), type=pa.list_(pa.float32(), 8)),
+            }
+        ),
+        path,
+    )
+    exact_edges = tmp_path / "exact_edges.jsonl"
+    bg.build_graph(path, tmp_path / "exact_nodes.jsonl", exact_edges, k=4)
+
+    stats = bg.build_graph(
+        path,
+        tmp_path / "nodes.jsonl",
+        tmp_path / "edges.jsonl",
+        k=4,
+        mode="ivf",
+        ivf_lists=11,
+        ivf_probes=11,
+        evaluate=50,
+    )
+
+    assert stats["eval_sample"] == 50 and stats["recall_at_k"] == 1.0
+    assert {"search_ms", "exact_estimate_ms"} <= stats.keys()
+    assert (tmp_path / "edges.jsonl").read_bytes() == exact_edges.read_bytes()
+    with pytest.raises(ValueError, match="ivf"):
+        bg.build_graph(path, tmp_path / "n.jsonl", tmp_path / "e.jsonl", evaluate=5)
@@ -0,0 +1,272 @@
+import itertools
+import sys
+
+import pytest
+
+from scripts.repobrief_chunk_bridge import stable_text_embedding
+from tools import build_index as bi
+
+pq = pytest.importorskip("pyarrow.parquet")
+np = pytest.importorskip("numpy")
+
+
+def _words(prefix: str, count: int) -> str:
+    return " ".join(f"{prefix}{i}" for i in range(count))
+
+
+def test_chunk_text_packs_paragraphs_with_overlap():
+    paragraphs = [_words(f"p{n}w", 40) for n in range(12)]
+    text = "---\ntitle: Note\ntopics: [a]\n---\n" + "\n\n".join(paragraphs)
+
+    chunks = bi.chunk_text(text, target_tokens=100, max_tokens=120, overlap_tokens=40)
+
+    assert "title:" not in chunks[0]
+    assert all(len(chunk.split()) <= 120 for chunk in chunks)
+    # Each chunk starts with the last paragraph of its predecessor.
+    for previous, current in itertools.pairwise(chunks):
+        assert current.split("\n\n")[0] == previous.split("\n\n")[-1]
+    # Every paragraph is covered and chunks break on paragraph boundaries.
+    joined = "\n\n".join(chunks)
+    assert all(paragraph in joined.split("\n\n") for paragraph in paragraphs)
+
+
+def test_chunk_text_splits_long_paragraphs_and_overlaps_words():
+    chunks = bi.chunk_text(
+        _words("w", 700), target_tokens=250, max_tokens=300, overlap_tokens=50
+    )
+
+    assert [len(chunk.split()) for chunk in chunks] == [250, 300, 250]
+    assert chunks[1].split()[:50] == chunks[0].split()[-50:]
+    assert chunks[2].split()[-1] == "w699"
+
+
+def test_chunk_text_rejects_overlap_not_below_target():
+    with pytest.raises(ValueError):
+        bi.chunk_text("text", target_tokens=50, max_tokens=60, overlap_tokens=50)
+
+
+def test_iter_vault_files_skips_tool_folders(tmp_path):
+    for rel in ["b.md", "a/c.md", ".gewebe/x.md", ".obsidian/y.md", "a/img.png"]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("text", encoding="utf-8")
+
+    files = [p.as_posix() for p in bi.iter_vault_files(tmp_path)]
+
+    assert files == ["b.md", "a/c.md"]
+
+
+def test_build_index_writes_typed_parquet_in_row_groups(tmp_path):
+    vault = tmp_path / "vault"
+    for n in range(5):
+        note = vault / f"note{n}.md"
+        note.parent.mkdir(parents=True, exist_ok=True)
+        note.write_text(
+            "\n\n".join(_words(f"n{n}p{p}w", 30) for p in range(8)), encoding="utf-8"
+        )
+    (vault / "broken.md").write_bytes(b"\xff\xfe not utf-8")
+    output = vault / ".gewebe" / "embeddings.parquet"
+    embedder = bi.StableEmbedder(dim=16)
+
+    stats = bi.build_index(
+        vault,
+        output,
+        embedder=embedder,
+        batch_size=3,
+        row_group_size=4,
+        target_tokens=100,
+        max_tokens=120,
+        overlap_tokens=30,
+    )
+
+    parquet = pq.ParquetFile(output)
+    table = parquet.read()
+    assert stats["files"] == 6
+    assert table.num_rows == stats["chunks"] > 5
+    assert parquet.metadata.num_row_groups == stats["row_groups"]
+    assert parquet.metadata.row_group(0).num_rows == 4
+    embedding_type = table.schema.field("embedding").type
+    assert embedding_type.list_size == 16 and str(embedding_type.value_type) == "float"
+    assert (
+        table.schema.metadata[b"embedder_revision"] == b"stable_text_embedding/dim=16"
+    )
+    rows = table.to_pylist()
+    assert rows[0]["id"] == "note0.md#0" and rows[0]["chunk_id"] == 0
+    np.testing.assert_allclose(
+        rows[0]["embedding"], stable_text_embedding(rows[0]["text"], dim=16), atol=1e-6
+    )
+    assert not list(output.parent.glob(".*.tmp"))
+
+
+def test_main_builds_index_with_stable_embedder(tmp_path, capsys):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    (vault / "a.md").write_text("Hallo Welt", encoding="utf-8")
+    output = tmp_path / "out" / "embeddings.parquet"
+
+    argv = ["--vault", str(vault), "--output", str(output), "--embedder", "stable"]
+    assert bi.main(argv) == 0
+
+    assert pq.read_table(output).num_rows == 1
+    assert "1 files → 1 chunks" in capsys.readouterr().out
+
+
+def test_main_fails_without_a_model_unless_stable_is_requested(
+    tmp_path, monkeypatch, capsys
+):
+    monkeypatch.setitem(sys.modules, "sentence_transformers", None)
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    output = tmp_path / "embeddings.parquet"
+
+    assert bi.main(["--vault", str(vault), "--output", str(output)]) == 1
+    assert "--embedder stable" in capsys.readouterr().err
+    assert not output.exists()
+
+
+class CountingEmbedder(bi.StableEmbedder):
+    def __init__(self, dim=8):
+        super().__init__(dim)
+        self.texts = []
+
+    def embed(self, texts):
+        self.texts.extend(texts)
+        return super().embed(texts)
+
+
+def _write_vault(vault, notes):
+    for rel, paragraphs in notes.items():
+        path = vault / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n\n".join(paragraphs), encoding="utf-8")
+
+
+def test_incremental_build_embeds_only_changed_notes(tmp_path):
+    import os
+
+    vault = tmp_path / "vault"
+    output = tmp_path / "embeddings.parquet"
+    options = {
+        "row_group_size": 5,
+        "target_tokens": 40,
+        "max_tokens": 50,
+        "overlap_tokens": 10,
+    }
+    _write_vault(
+        vault,
+        {
+            f"d{n // 3}/note{n}.md": [_words(f"n{n}p{p}w", 20) for p in range(6)]
+            for n in range(9)
+        },
+    )
+    first = bi.build_index(vault, output, embedder=CountingEmbedder(), **options)
+    assert first["embedded_files"] == 9 and first["reused_files"] == 0
+
+    _write_vault(vault, {"d1/note4.md": ["changed text"], "d2/new.md": ["new note"]})
+    (vault / "d0" / "note1.md").unlink()
+    touched = vault / "d2" / "note7.md"
+    os.utime(
+        touched, ns=(touched.stat().st_atime_ns, touched.stat().st_mtime_ns + 10**9)
+    )
+
+    embedder = CountingEmbedder()
+    second = bi.build_index(vault, output, embedder=embedder, **options)
+
+    assert second["files"] == 9
+    assert second["embedded_files"] == 2 and second["reused_files"] == 7
+    assert second["removed_files"] == 1
+    assert sorted(embedder.texts) == ["changed text", "new note"]
+    incremental = pq.read_table(output)
+    full = tmp_path / "full.parquet"
+    bi.build_index(
+        vault, full, embedder=CountingEmbedder(), incremental=False, **options
+    )
+    assert incremental.equals(pq.read_table(full))
+    manifest = bi.Manifest.load(bi.manifest_path_for(output))
+    assert manifest.files["d1/note4.md"].chunk_ids == ["d1/note4.md#0"]
+    assert manifest.files["d2/note7.md"].mtime_ns == touched.stat().st_mtime_ns
+
+
+def test_incremental_build_restarts_when_embedder_changes(tmp_path):
+    vault = tmp_path / "vault"
+    output = tmp_path / "embeddings.parquet"
+    _write_vault(vault, {"a.md": ["alpha"], "b.md": ["beta"]})
+    bi.build_index(vault, output, embedder=CountingEmbedder(dim=8))
+
+    embedder = CountingEmbedder(dim=4)
+    stats = bi.build_index(vault, output, embedder=embedder)
+
+    assert stats["embedded_files"] == 2 and len(embedder.texts) == 2
+    assert pq.read_table(output).schema.field("embedding").type.list_size == 4
+
+
+def test_parallel_build_matches_serial_output_and_reports_progress(tmp_path, capsys):
+    vault = tmp_path / "vault"
+    _write_vault(
+        vault,
+        {
+            f"n{n:02d}.md": [_words(f"n{n}p{p}w", 15) for p in range(n % 7)]
+            for n in range(30)
+        },
+    )
+    options = {
+        "embedder": bi.StableEmbedder(dim=8),
+        "batch_size": 4,
+        "row_group_size": 7,
+        "target_tokens": 30,
+        "max_tokens": 40,
+        "overlap_tokens": 10,
+    }
+    serial = bi.build_index(vault, tmp_path / "serial.parquet", **options)
+    parallel = bi.build_index(
+        vault,
+        tmp_path / "parallel.parquet",
+        workers=3,
+        embed_queue=1,
+        progress_interval=0,
+        **options,
+    )
+
+    assert parallel["chunks"] == serial["chunks"]
+    assert pq.read_table(tmp_path / "parallel.parquet").equals(
+        pq.read_table(tmp_path / "serial.parquet")
+    )
+    err = capsys.readouterr().err
+    assert f"30/30 files, {serial['chunks']} chunks" in err and "chunks/s" in err
+
+
+def test_embedding_cache_skips_embedder_across_full_builds(tmp_path, capsys):
+    from scripts.embedding_cache import EmbeddingCache
+
+    vault = tmp_path / "vault"
+    _write_vault(vault, {"a.md": ["alpha", "shared"], "b.md": ["alpha", "shared"]})
+    options = {"target_tokens": 1, "max_tokens": 1, "overlap_tokens": 0}
+
+    with EmbeddingCache(tmp_path / "cache.sqlite") as cache:
+        first = CountingEmbedder()
+        stats = bi.build_index(
+            vault,
+            tmp_path / "first.parquet",
+            embedder=first,
+            embedding_cache=cache,
+            **options,
+        )
+        second = CountingEmbedder()
+        again = bi.build_index(
+            vault,
+            tmp_path / "second.parquet",
+            embedder=second,
+            embedding_cache=cache,
+            incremental=False,
+            **options,
+        )
+
+    assert sorted(first.texts) == ["alpha", "shared"]
+    assert (stats["cache_hits"], stats["cache_misses"]) == (0, 4)
+    assert second.texts == [] and again["cache_hits"] == 4
+    assert pq.read_table(tmp_path / "second.parquet").equals(
+        pq.read_table(tmp_path / "first.parquet")
+    )
+    no_cache = tmp_path / "plain.parquet"
+    bi.build_index(vault, no_cache, embedder=CountingEmbedder(), **options)
+    assert pq.read_table(no_cache).equals(pq.read_table(tmp_path / "first.parquet"))
@@ -0,0 +1,59 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scripts.embedding_cache import EmbeddingCache
+
+
+def _vectors(texts, dim=4):
+    return [
+        [float(len(text)), float(i), 0.5, -1.0][:dim] for i, text in enumerate(texts)
+    ]
+
+
+def test_get_or_compute_embeds_distinct_misses_once(tmp_path):
+    calls = []
+
+    def compute(texts):
+        calls.append(list(texts))
+        return _vectors(texts)
+
+    with EmbeddingCache(tmp_path / "cache.sqlite") as cache:
+        first = cache.get_or_compute("m1", ["a", "bb", "a"], compute)
+        second = cache.get_or_compute("m1", ["bb", "ccc"], compute)
+
+    assert calls == [["a", "bb"], ["ccc"]]
+    assert first.dtype == np.float32 and first.shape == (3, 4)
+    np.testing.assert_array_equal(first[0], first[2])
+    np.testing.assert_array_equal(second[0], first[1])
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_cache_persists_and_isolates_revisions(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    with EmbeddingCache(path) as cache:
+        cache.put_many("m1", ["text"], [[1.0, 2.0]])
+
+    with EmbeddingCache(path) as cache:
+        assert cache.get_many("m2", ["text"]) == [None]
+        (vector,) = cache.get_many("m1", ["text"])
+        summary = cache.summary()
+
+    np.testing.assert_array_equal(vector, [1.0, 2.0])
+    assert summary["entries"] == 1 and summary["hit_rate"] == 0.5
+
+
+def test_eviction_drops_least_recently_used_entries(tmp_path):
+    # 2 bytes revision + 16 bytes digest + 4 float32 = 34 bytes per entry.
+    with EmbeddingCache(tmp_path / "cache.sqlite", max_bytes=34 * 3) as cache:
+        cache.put_many("m1", ["a", "b", "c"], _vectors(["a", "b", "c"]))
+        cache.get_many("m1", ["a"])
+        cache.put_many("m1", ["d"], _vectors(["d"]))
+
+        present = [v is not None for v in cache.get_many("m1", ["a", "b", "c", "d"])]
+        summary = cache.summary()
+
+    # Over the bound, eviction goes down to 90 %: "b" and "c" were least recent.
+    assert present == [True, False, False, True]
+    assert summary["evicted"] == 2
+    assert summary["bytes"] == 34 * 2 <= summary["max_bytes"]
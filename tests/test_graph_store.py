@@ -0,0 +1,102 @@
+"""Tests for scripts/graph_store.py"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scripts import graph_store
+
+
+def _write_jsonl(path: Path, records: list[dict]) -> Path:
+    path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> graph_store.GraphStore:
+    nodes = _write_jsonl(
+        tmp_path / "nodes.jsonl",
+        [
+            {"id": "intent:1", "type": "Intent", "title": "old"},
+            {"id": "actor:ä", "type": "Actor", "title": "ä"},
+            {"id": "intent:1", "type": "Intent", "title": "Refactor"},
+            {"id": "tag:x", "type": "Tag", "title": "x"},
+        ],
+    )
+    edges = _write_jsonl(
+        tmp_path / "edges.jsonl",
+        [
+            {"src": "actor:ä", "rel": "declares", "dst": "intent:1"},
+            {"src": "intent:1", "rel": "mentions", "dst": "tag:x"},
+            {"src": "intent:1", "rel": "related", "dst": "note:y", "weight": 0.5},
+        ],
+    )
+    meta = graph_store.build_store(nodes, edges, tmp_path / "graph")
+    assert meta["nodes"] == 4 and meta["edges"] == 3
+    return graph_store.open_store(tmp_path / "graph")
+
+
+def test_neighbors_in_both_directions(store):
+    assert store.neighbors("intent:1") == [
+        {"id": "note:y", "rel": "related", "weight": 0.5},
+        {"id": "tag:x", "rel": "mentions", "weight": None},
+    ]
+    assert store.neighbors("intent:1", "in") == [
+        {"id": "actor:ä", "rel": "declares", "weight": None}
+    ]
+    assert store.neighbors("intent:1", rel="mentions") == [
+        {"id": "tag:x", "rel": "mentions", "weight": None}
+    ]
+    assert store.neighbors("intent:1", rel="unknown") == []
+    assert store.degree("tag:x", "in") == 1
+
+
+def test_nodes_are_interned_sorted_and_last_record_wins(store):
+    ids = [store.node_id(i) for i in range(len(store))]
+    assert ids == sorted(ids, key=lambda value: value.encode("utf-8"))
+    assert store.node("intent:1") == {
+        "id": "intent:1",
+        "type": "Intent",
+        "title": "Refactor",
+    }
+    # Edge endpoints without a node record are kept as untyped nodes.
+    assert store.node("note:y")["type"] == ""
+    assert "missing" not in store
+    with pytest.raises(KeyError):
+        store.neighbors("missing")
+
+
+def test_arrays_are_memory_mapped(store):
+    assert isinstance(store._array("out_indices"), np.memmap)
+
+
+def test_build_replaces_existing_store_and_handles_empty_graph(tmp_path: Path):
+    out = tmp_path / "graph"
+    nodes = _write_jsonl(tmp_path / "nodes.jsonl", [{"id": "a", "type": "Note"}])
+    graph_store.build_store(nodes, tmp_path / "none.jsonl", out)
+
+    store = graph_store.open_store(out)
+    assert len(store) == 1 and store.num_edges == 0
+    assert store.neighbors("a") == []
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["graph", "nodes.jsonl"]
+
+
+def test_cli_build_and_neighbors(tmp_path: Path, capsys):
+    nodes = _write_jsonl(tmp_path / "nodes.jsonl", [])
+    edges = _write_jsonl(
+        tmp_path / "edges.jsonl", [{"src": "a", "rel": "r", "dst": "b"}]
+    )
+    out = tmp_path / "graph"
+    argv = ["build", "--nodes", str(nodes), "--edges", str(edges), "--out", str(out)]
+    assert graph_store.main(argv) == 0
+    assert (
+        graph_store.main(["neighbors", "b", "--store", str(out), "--direction", "in"])
+        == 0
+    )
+    assert json.loads(capsys.readouterr().out.splitlines()[-1])["id"] == "a"
+    assert graph_store.main(["neighbors", "zzz", "--store", str(out)]) == 1
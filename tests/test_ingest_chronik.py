@@ -113,6 +113,16 @@ def test_read_last_records_large_utf8_record_across_chunks(tmp_path: Path):
     assert result[0]["data"] == data
 
 
+def test_read_last_records_empty_file_and_missing_trailing_newline(tmp_path: Path):
+    path = tmp_path / "export.jsonl"
+    path.write_bytes(b"")
+    assert ingest_chronik.read_last_records(path, 3) == []
+
+    path.write_bytes(b'{"id": 1}\r\n\n{"id": 2}')
+    assert ingest_chronik.read_last_records(path, 1) == [{"id": 2}]
+    assert ingest_chronik.read_last_records(path, 5) == [{"id": 1}, {"id": 2}]
+
+
 def test_shrink_to_size_no_change_needed():
     items = [{"title": "test", "summary": "short", "url": "http://example.com"}]
     payload = {
@@ -270,3 +280,243 @@ def test_shrink_to_size_restores_on_exception():
 
     # Verify items are restored
     assert payload["items"] == items
+
+
+def _write_jsonl(path: Path, records: list[dict]) -> None:
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n", encoding="utf-8")
+
+
+def test_read_last_records_from_sources_merges_newest_by_timestamp(tmp_path: Path):
+    a = tmp_path / "a.jsonl"
+    b = tmp_path / "b.jsonl"
+    _write_jsonl(
+        a, [{"id": f"a{i}", "ts": f"2024-01-0{i}T00:00:00Z"} for i in (1, 3, 5)]
+    )
+    _write_jsonl(
+        b, [{"id": f"b{i}", "ts": f"2024-01-0{i}T00:00:00+00:00"} for i in (2, 4, 6)]
+    )
+
+    result = ingest_chronik.read_last_records_from_sources([a, b], 4)
+
+    assert [r["id"] for r in result] == ["a3", "b4", "a5", "b6"]
+
+
+def test_merge_newest_sorts_untimestamped_records_as_oldest():
+    tails = [[{"id": "plain"}], [{"id": "t1", "ts": 1}, {"id": "t2", "ts": 2}]]
+
+    assert [r["id"] for r in ingest_chronik.merge_newest(tails, 2)] == ["t1", "t2"]
+    assert [r["id"] for r in ingest_chronik.merge_newest(tails, 5)] == [
+        "plain",
+        "t1",
+        "t2",
+    ]
+
+
+def test_ingest_accepts_multiple_sources_and_globs(tmp_path: Path):
+    data = tmp_path / "chronik"
+    data.mkdir()
+    for name, day in (("one", 1), ("two", 2)):
+        _write_jsonl(
+            data / f"{name}.jsonl",
+            [
+                {
+                    "title": name,
+                    "summary": "s",
+                    "url": "u",
+                    "ts": f"2024-01-0{day}T00:00:00Z",
+                }
+            ],
+        )
+    output = tmp_path / "today.json"
+
+    args = ingest_chronik.parse_args(
+        [str(data / "*.jsonl"), str(data / "one.jsonl"), "--output", str(output)]
+    )
+    ingest_chronik.ingest(args)
+
+    payload = json.loads(output.read_text(encoding="utf-8"))
+    assert [item["title"] for item in payload["items"]] == ["one", "two"]
+    with pytest.raises(FileNotFoundError, match="No source files match"):
+        ingest_chronik.expand_sources([str(data / "*.missing")])
+
+
+def test_chronik_index_matches_tail_and_updates_incrementally(tmp_path: Path):
+    source = tmp_path / "chronik.jsonl"
+    records = [{"id": i, "ts": 100 + i} for i in range(10)]
+    source.write_text(
+        "\n\n".join(json.dumps(r) for r in records) + "\n", encoding="utf-8"
+    )
+    index = ingest_chronik.ChronikIndex(source)
+
+    assert index.update() == 10
+    assert index.update() == 0
+    assert index.index_path == tmp_path / "chronik.jsonl.idx"
+    for limit in (0, 1, 4, 10, 25):
+        assert index.tail(limit) == ingest_chronik.read_last_records(source, limit)
+    assert index.records(2, 5) == records[2:5]
+    assert index.records(-2) == records[-2:]
+
+    with source.open("a", encoding="utf-8") as handle:
+        handle.write('{"id": 10, "ts": 110}\n{"id": 11, "ts": 111}')
+    assert index.tail(2) == [{"id": 10, "ts": 110}, {"id": 11, "ts": 111}]
+    # The unterminated last line is picked up once it is complete.
+    assert index.count() == 11
+
+
+def test_chronik_index_since_handles_out_of_order_and_untimestamped(tmp_path: Path):
+    source = tmp_path / "chronik.jsonl"
+    _write_jsonl(
+        source,
+        [
+            {"id": "a", "ts": 1},
+            {"id": "b", "ts": 5},
+            {"id": "late", "ts": 3},
+            {"id": "plain"},
+            {"id": "c", "ts": "1970-01-01T00:00:06Z"},
+        ],
+    )
+    index = ingest_chronik.ChronikIndex(source)
+
+    assert [r["id"] for r in index.since(3)] == ["b", "late", "c"]
+    assert [r["id"] for r in index.since(5.5)] == ["c"]
+    assert index.since(10) == []
+
+
+def test_chronik_index_rebuilds_after_rotation(tmp_path: Path):
+    source = tmp_path / "chronik.jsonl"
+    _write_jsonl(source, [{"id": i} for i in range(5)])
+    index = ingest_chronik.ChronikIndex(source)
+    assert index.count() == 5
+
+    _write_jsonl(source, [{"id": "fresh"}])
+
+    assert index.tail(3) == [{"id": "fresh"}]
+    assert index.count() == 1
+
+
+def test_ingest_since_reads_window_through_index(tmp_path: Path):
+    source = tmp_path / "chronik.jsonl"
+    _write_jsonl(
+        source,
+        [
+            {"title": f"t{day}", "summary": "s", "url": "u", "ts": f"2024-01-0{day}"}
+            for day in range(1, 6)
+        ],
+    )
+    output = tmp_path / "today.json"
+
+    args = ingest_chronik.parse_args(
+        [str(source), "--output", str(output), "--since", "2024-01-04"]
+    )
+    ingest_chronik.ingest(args)
+
+    payload = json.loads(output.read_text(encoding="utf-8"))
+    assert [item["title"] for item in payload["items"]] == ["t4", "t5"]
+    assert ingest_chronik.index_path_for(source).exists()
+
+
+@pytest.mark.parametrize("extra", [{}, {"meta": {"ä": [1, None]}, "z": "ö"}])
+def test_encode_to_size_matches_encode_of_shrunk_payload(extra):
+    items = [{"title": "😀" * i, "summary": "s", "url": str(i)} for i in range(12)]
+    payload = {"generated_at": "2024-01-01T00:00:00+00:00", "items": items, **extra}
+    full = len(ingest_chronik._encode(payload))
+
+    for max_bytes in range(full - 400, full + 2, 7):
+        candidate = dict(payload)
+        encoded = ingest_chronik.encode_to_size(candidate, max_bytes)
+
+        assert encoded == ingest_chronik._encode(candidate)
+        assert len(encoded) <= max_bytes
+        assert candidate["items"] == items[len(items) - len(candidate["items"]) :]
+        if len(candidate["items"]) < len(items):
+            longer = dict(payload, items=items[-len(candidate["items"]) - 1 :])
+            assert len(ingest_chronik._encode(longer)) > max_bytes
+
+
+def test_follow_consumes_appended_records_and_rewrites_on_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    source = tmp_path / "chronik.jsonl"
+    source.write_text(
+        '{"title": "a", "summary": "s", "url": "u"}\n{"title": "part',
+        encoding="utf-8",
+    )
+    output = tmp_path / "today.json"
+    args = ingest_chronik.parse_args(
+        [str(source), "--output", str(output), "--limit", "2", "--follow"]
+    )
+    appends = iter(
+        [
+            'ial", "summary": "s", "url": "u"}\n',
+            "\n",
+            '{"title": "c", "summary": "s", "url": "u"}\n',
+        ]
+    )
+    seen: list[list[str]] = []
+    written: list[bytes] = []
+    atomic_write_bytes = ingest_chronik.atomic_write_bytes
+
+    def sleep(_interval: float) -> None:
+        payload = json.loads(output.read_text(encoding="utf-8"))
+        seen.append([item["title"] for item in payload["items"]])
+        with source.open("a", encoding="utf-8") as handle:
+            handle.write(next(appends))
+
+    def record_write(path: Path, data: bytes, **kwargs) -> Path:
+        written.append(data)
+        return atomic_write_bytes(path, data, **kwargs)
+
+    monkeypatch.setattr(ingest_chronik, "atomic_write_bytes", record_write)
+    ingest_chronik.follow(args, sleep=sleep, polls=3)
+
+    assert seen == [["a"], ["a", "partial"], ["a", "partial"]]
+    payload = json.loads(output.read_text(encoding="utf-8"))
+    assert [item["title"] for item in payload["items"]] == ["partial", "c"]
+    # Initial write plus one per change; the blank-line poll rewrites nothing.
+    assert len(written) == 3
+
+
+def test_follow_state_restarts_after_rotation(tmp_path: Path):
+    source = tmp_path / "chronik.jsonl"
+    _write_jsonl(source, [{"id": 1}, {"id": 2}])
+    state = ingest_chronik.FollowState.at_end(source)
+    assert state.poll() == []
+
+    rotated = tmp_path / "rotated.jsonl"
+    _write_jsonl(rotated, [{"id": 3}])
+    rotated.replace(source)
+
+    assert state.poll() == [{"id": 3}]
+    assert state.poll() == []
+
+
+def test_parse_args_rejects_follow_with_since():
+    with pytest.raises(SystemExit):
+        ingest_chronik.parse_args(["x.jsonl", "--follow", "--since", "2024-01-01"])
+
+
+def test_follow_does_not_repeat_records_appended_during_start(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    source = tmp_path / "chronik.jsonl"
+    source.write_text('{"title": "a", "summary": "s", "url": "u"}\n', encoding="utf-8")
+    output = tmp_path / "today.json"
+    args = ingest_chronik.parse_args(
+        [str(source), "--output", str(output), "--limit", "5", "--follow"]
+    )
+    at_end = ingest_chronik.FollowState.at_end.__func__
+
+    def at_end_then_append(cls, path: Path):
+        state = at_end(cls, path)
+        # A record arriving between recording the offset and the initial tail.
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write('{"title": "b", "summary": "s", "url": "u"}\n')
+        return state
+
+    monkeypatch.setattr(
+        ingest_chronik.FollowState, "at_end", classmethod(at_end_then_append)
+    )
+    ingest_chronik.follow(args, sleep=lambda _interval: None, polls=1)
+
+    payload = json.loads(output.read_text(encoding="utf-8"))
+    assert [item["title"] for item in payload["items"]] == ["a", "b"]
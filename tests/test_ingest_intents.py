@@ -1,4 +1,6 @@
+import itertools
 import json
+import os
 import tempfile
 from pathlib import Path
 from cli.ingest_intents import ingest_intents, main
@@ -101,3 +103,404 @@ def test_ingest_intents_creates_output_dirs(intent_data, tmp_path):
 
     assert nodes_path.is_file()
     assert edges_path.is_file()
+
+
+def test_ingest_intents_workers_match_serial_output(tmp_path, monkeypatch):
+    import cli.ingest_intents as ingest_module
+
+    source_path = tmp_path / "intents.jsonl"
+    lines = []
+    for i in range(300):
+        record = {
+            "ts": f"2024-01-01T12:00:{i % 60:02d}Z",
+            "actor": f"user{i % 7}",
+            "goal": f"Goal {i} – ünïcode",
+            "scope": {"repo": f"repo{i % 3}", "path": f"src/{i}.py"},
+            "context": {"tags": [f"t{i % 5}"]},
+        }
+        lines.append(json.dumps(record, ensure_ascii=False))
+        if i % 50 == 0:
+            lines.extend(["", "{not json"])
+    source_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    serial = (tmp_path / "serial_nodes.jsonl", tmp_path / "serial_edges.jsonl")
+    serial_stats = ingest_intents(source_path, *serial)
+
+    # Force many small shards so boundaries fall inside the test file.
+    monkeypatch.setattr(ingest_module, "MIN_SHARD_BYTES", 512)
+    parallel = (tmp_path / "par_nodes.jsonl", tmp_path / "par_edges.jsonl")
+    parallel_stats = ingest_intents(source_path, *parallel, workers=3)
+
+    assert parallel[0].read_bytes() == serial[0].read_bytes()
+    assert parallel[1].read_bytes() == serial[1].read_bytes()
+    assert parallel_stats == serial_stats
+    assert serial_stats["duplicate_nodes_suppressed"] > 0
+
+    if ingest_module.orjson is not None:
+        fast = (tmp_path / "fast_nodes.jsonl", tmp_path / "fast_edges.jsonl")
+        ingest_intents(source_path, *fast, workers=3, encoder="orjson")
+        assert fast[0].read_bytes() == serial[0].read_bytes()
+        assert fast[1].read_bytes() == serial[1].read_bytes()
+
+
+ENCODER_SAMPLES = [
+    {"id": "intent:1", "type": "intent", "title": "Grüße – ünïcode ☃"},
+    {"src": "intent:1", "rel": "in_repo", "dst": "repo:a", "meta": {"w": 1}},
+    {"id": "x", "nested": {"list": [1, 2.5, None, True], "s": 'q"uote\\'}},
+]
+
+
+def test_stdlib_batch_encoder_matches_json_dumps_lines():
+    from cli.ingest_intents import JSON_DUMPS_OPTIONS, JsonLineEncoder
+
+    expected = "".join(
+        json.dumps(element, **JSON_DUMPS_OPTIONS) + "\n" for element in ENCODER_SAMPLES
+    ).encode("utf-8")
+    encoder = JsonLineEncoder("stdlib")
+
+    assert encoder.encode_batch(ENCODER_SAMPLES) == expected
+    assert b"".join(map(encoder.encode, ENCODER_SAMPLES)) == expected
+    assert encoder.encode_batch([]) == b""
+
+
+def test_orjson_encoder_writes_equivalent_lines():
+    pytest.importorskip("orjson")
+    from cli.ingest_intents import JsonLineEncoder
+
+    encoder = JsonLineEncoder("auto")
+    assert encoder.backend == "orjson"
+    lines = encoder.encode_batch(ENCODER_SAMPLES).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == ENCODER_SAMPLES
+    assert encoder.encode_batch(ENCODER_SAMPLES) == JsonLineEncoder(
+        "stdlib"
+    ).encode_batch(ENCODER_SAMPLES)
+
+
+def test_orjson_encoder_falls_back_to_stdlib_for_big_integers():
+    pytest.importorskip("orjson")
+    from cli.ingest_intents import JsonLineEncoder
+
+    elements = [{"id": "a", "meta": {"big": 2**70}}, ENCODER_SAMPLES[0]]
+    encoder = JsonLineEncoder("orjson")
+
+    assert encoder.encode_batch(elements) == JsonLineEncoder("stdlib").encode_batch(
+        elements
+    )
+
+
+def test_orjson_encoder_requires_orjson(monkeypatch):
+    import cli.ingest_intents as ingest_module
+
+    monkeypatch.setattr(ingest_module, "orjson", None)
+    assert ingest_module.JsonLineEncoder("auto").backend == "stdlib"
+    with pytest.raises(RuntimeError):
+        ingest_module.JsonLineEncoder("orjson")
+
+
+def _write_malformed_backfill(source_path):
+    valid = {"ts": "2024-01-01T12:00:00Z", "actor": "a", "goal": "g"}
+    lines = []
+    for i in range(40):
+        lines.append(json.dumps({**valid, "goal": f"goal {i}"}).encode())
+        lines.append(b"{not json %d" % i)
+        lines.append(json.dumps({"ts": "2024-01-01T12:00:00Z", "goal": "x"}).encode())
+    lines.extend([b"\xff\xfe broken", b"[1, 2]"])
+    source_path.write_bytes(b"\n".join(lines) + b"\n")
+
+
+def test_ingest_intents_counts_invalid_lines_by_category(tmp_path, capsys):
+    from cli.ingest_intents import IngestErrors
+
+    source_path = tmp_path / "intents.jsonl"
+    _write_malformed_backfill(source_path)
+
+    errors = IngestErrors(max_samples=3)
+    stats = ingest_intents(
+        source_path, tmp_path / "n.jsonl", tmp_path / "e.jsonl", errors=errors
+    )
+
+    assert errors.counts == {
+        "invalid_json": 40,
+        "missing_fields": 40,
+        "invalid_utf8": 1,
+        "invalid_record": 1,
+    }
+    assert stats["invalid_lines"] == 82
+    assert all(len(samples) <= 3 for samples in errors.samples.values())
+    first = errors.samples["invalid_json"][0]
+    assert first.startswith("byte ") and "{not json 0" in first
+    assert "actor" in errors.samples["missing_fields"][0]
+    # Nothing is printed per line; the caller decides how to report.
+    assert capsys.readouterr().err == ""
+
+
+def test_parallel_ingest_reports_the_same_errors(tmp_path, monkeypatch):
+    import cli.ingest_intents as ingest_module
+
+    source_path = tmp_path / "intents.jsonl"
+    _write_malformed_backfill(source_path)
+    serial = ingest_module.IngestErrors()
+    ingest_intents(
+        source_path, tmp_path / "s.jsonl", tmp_path / "se.jsonl", errors=serial
+    )
+
+    monkeypatch.setattr(ingest_module, "MIN_SHARD_BYTES", 256)
+    parallel = ingest_module.IngestErrors()
+    ingest_intents(
+        source_path,
+        tmp_path / "p.jsonl",
+        tmp_path / "pe.jsonl",
+        workers=3,
+        errors=parallel,
+    )
+
+    assert parallel.as_dict() == serial.as_dict()
+
+
+def test_main_prints_error_summary_once(tmp_path, capsys):
+    source_path = tmp_path / "intents.jsonl"
+    _write_malformed_backfill(source_path)
+
+    argv = [
+        str(source_path),
+        "--nodes-file",
+        str(tmp_path / "n.jsonl"),
+        "--edges-file",
+        str(tmp_path / "e.jsonl"),
+        "--error-samples",
+        "2",
+    ]
+    assert main(argv) == 0
+
+    err = capsys.readouterr().err
+    assert "Skipped 82 invalid lines:" in err
+    assert "  invalid_json: 40" in err
+    assert err.count("{not json") == 2
+
+
+def test_shard_ranges_align_to_line_starts(tmp_path):
+    from cli.ingest_intents import shard_ranges
+
+    source_path = tmp_path / "intents.jsonl"
+    source_path.write_bytes(b"aaaa\nbb\n\ncccccc\nd")
+
+    ranges = shard_ranges(source_path, 3)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == source_path.stat().st_size
+    data = source_path.read_bytes()
+    for (_, end), (start, _) in itertools.pairwise(ranges):
+        assert end == start and data[end - 1 : end] == b"\n"
+
+
+def _write_intents(path, records):
+    path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+
+
+def test_ingest_intents_writes_each_node_once(intent_data, tmp_path):
+    source_path = tmp_path / "intents.jsonl"
+    second = dict(intent_data[0], ts="2024-01-02T12:00:00Z")
+    _write_intents(source_path, [intent_data[0], second, intent_data[0]])
+    nodes_path = tmp_path / "nodes.jsonl"
+
+    stats = ingest_intents(source_path, nodes_path, tmp_path / "edges.jsonl")
+
+    ids = [json.loads(line)["id"] for line in nodes_path.read_text().splitlines()]
+    assert len(ids) == len(set(ids)) == 6
+    assert stats["nodes_written"] == 6
+    assert stats["edges_written"] == 12
+    assert stats["duplicate_nodes_suppressed"] == 9
+
+
+def test_dedup_index_persists_across_runs_and_rebuilds_when_stale(
+    intent_data, tmp_path
+):
+    from cli.ingest_intents import NodeIdIndex
+
+    source_path = tmp_path / "intents.jsonl"
+    nodes_path = tmp_path / "nodes.jsonl"
+    edges_path = tmp_path / "edges.jsonl"
+    index_path = tmp_path / "nodes.jsonl.ids"
+    _write_intents(source_path, intent_data)
+
+    ingest_intents(source_path, nodes_path, edges_path, id_index_path=index_path)
+    stats = ingest_intents(
+        source_path, nodes_path, edges_path, id_index_path=index_path
+    )
+
+    assert stats["nodes_written"] == 0
+    assert stats["duplicate_nodes_suppressed"] == 5
+    assert len(nodes_path.read_text().splitlines()) == 5
+
+    # A nodes file changed behind the index's back forces a rescan.
+    nodes_path.write_text(nodes_path.read_text().splitlines()[0] + "\n")
+    index = NodeIdIndex.load(index_path, nodes_path)
+    assert len(index) == 1
+
+
+def test_node_id_index_folds_recent_ids_into_sorted_digests():
+    from cli.ingest_intents import NodeIdIndex
+
+    index = NodeIdIndex(capacity=3)
+    ids = [f"tag:{i}" for i in range(10)]
+
+    assert all(index.add(node_id) for node_id in ids)
+    assert not any(index.add(node_id) for node_id in ids)
+    assert index.suppressed == 10
+    assert len(index) == 10
+    assert "tag:4" in index and "tag:99" not in index
+
+
+def _intent(i):
+    return {
+        "ts": f"2024-01-01T00:00:{i:02d}Z",
+        "actor": f"user{i % 2}",
+        "goal": f"Goal {i}",
+        "context": {"tags": [f"t{i % 3}"]},
+    }
+
+
+def test_resume_processes_only_appended_intents(tmp_path):
+    source_path = tmp_path / "intents.jsonl"
+    nodes_path = tmp_path / "nodes.jsonl"
+    edges_path = tmp_path / "edges.jsonl"
+    checkpoint = tmp_path / "nodes.jsonl.checkpoint.json"
+    _write_intents(source_path, [_intent(i) for i in range(3)])
+    with source_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(_intent(3))[:10])  # still being written
+
+    first = ingest_intents(
+        source_path, nodes_path, edges_path, checkpoint_path=checkpoint
+    )
+    again = ingest_intents(
+        source_path, nodes_path, edges_path, checkpoint_path=checkpoint
+    )
+    with source_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(_intent(3))[10:] + "\n")
+    third = ingest_intents(
+        source_path, nodes_path, edges_path, checkpoint_path=checkpoint
+    )
+
+    assert first["edges_written"] == 6
+    assert again["edges_written"] == 0
+    assert third["start_offset"] == first["end_offset"]
+    assert third["end_offset"] == source_path.stat().st_size
+    reference = tmp_path / "ref"
+    _write_intents(source_path.with_name("full.jsonl"), [_intent(i) for i in range(4)])
+    ingest_intents(
+        source_path.with_name("full.jsonl"),
+        reference / "nodes.jsonl",
+        reference / "edges.jsonl",
+    )
+    assert edges_path.read_bytes() == (reference / "edges.jsonl").read_bytes()
+
+
+def test_resume_rolls_back_output_of_an_interrupted_run(tmp_path, monkeypatch):
+    from cli import ingest_intents as ingest_module
+
+    source_path = tmp_path / "intents.jsonl"
+    nodes_path = tmp_path / "nodes.jsonl"
+    edges_path = tmp_path / "edges.jsonl"
+    checkpoint = tmp_path / "nodes.jsonl.checkpoint.json"
+    id_index = tmp_path / "nodes.jsonl.ids"
+    _write_intents(source_path, [_intent(i) for i in range(10)])
+
+    save = ingest_module.Checkpoint.save
+    calls = []
+
+    def crash_on_second_commit(self, path):
+        calls.append(self.offset)
+        if len(calls) == 2:
+            raise RuntimeError("simulated crash after flushing outputs")
+        save(self, path)
+
+    monkeypatch.setattr(ingest_module.Checkpoint, "save", crash_on_second_commit)
+    with pytest.raises(RuntimeError):
+        ingest_intents(
+            source_path,
+            nodes_path,
+            edges_path,
+            2,
+            id_index_path=id_index,
+            checkpoint_path=checkpoint,
+        )
+    monkeypatch.setattr(ingest_module.Checkpoint, "save", save)
+    stats = ingest_intents(
+        source_path,
+        nodes_path,
+        edges_path,
+        2,
+        id_index_path=id_index,
+        checkpoint_path=checkpoint,
+    )
+
+    reference = tmp_path / "ref"
+    ingest_intents(source_path, reference / "nodes.jsonl", reference / "edges.jsonl")
+    assert stats["start_offset"] == calls[0]
+    assert nodes_path.read_bytes() == (reference / "nodes.jsonl").read_bytes()
+    assert edges_path.read_bytes() == (reference / "edges.jsonl").read_bytes()
+
+
+def test_resume_restarts_when_source_is_replaced(tmp_path):
+    source_path = tmp_path / "intents.jsonl"
+    checkpoint = tmp_path / "checkpoint.json"
+    outputs = (tmp_path / "nodes.jsonl", tmp_path / "edges.jsonl")
+    _write_intents(source_path, [_intent(i) for i in range(3)])
+    ingest_intents(source_path, *outputs, checkpoint_path=checkpoint, workers=2)
+
+    _write_intents(source_path, [_intent(i) for i in range(10, 14)])
+    stats = ingest_intents(source_path, *outputs, checkpoint_path=checkpoint)
+
+    assert stats["start_offset"] == 0
+    assert stats["edges_written"] == 8
+
+
+def test_resume_never_truncates_an_output_replaced_by_another_tool(tmp_path):
+    source_path = tmp_path / "intents.jsonl"
+    nodes_path = tmp_path / "nodes.jsonl"
+    edges_path = tmp_path / "edges.jsonl"
+    checkpoint = tmp_path / "checkpoint.json"
+    _write_intents(source_path, [_intent(i) for i in range(3)])
+    ingest_intents(source_path, nodes_path, edges_path, checkpoint_path=checkpoint)
+
+    # Another tool atomically replaces nodes.jsonl with a larger file.
+    foreign = b'{"id": "note:a", "type": "note"}\n' * 200
+    replacement = tmp_path / "nodes.jsonl.tmp"
+    replacement.write_bytes(foreign)
+    os.replace(replacement, nodes_path)
+    stats = ingest_intents(
+        source_path, nodes_path, edges_path, checkpoint_path=checkpoint
+    )
+
+    assert stats["start_offset"] == 0
+    assert nodes_path.read_bytes().startswith(foreign)
+
+
+def test_failed_run_does_not_persist_unwritten_node_ids(tmp_path, monkeypatch):
+    from cli import ingest_intents as ingest_module
+
+    source_path = tmp_path / "intents.jsonl"
+    nodes_path = tmp_path / "nodes.jsonl"
+    edges_path = tmp_path / "edges.jsonl"
+    id_index = tmp_path / "nodes.jsonl.ids"
+    _write_intents(source_path, [_intent(i) for i in range(10)])
+
+    encode_batch = ingest_module.JsonLineEncoder.encode_batch
+    calls = []
+
+    def fail_on_second_batch(self, elements):
+        calls.append(len(elements))
+        if len(calls) == 3:
+            raise RuntimeError("simulated encoder failure")
+        return encode_batch(self, elements)
+
+    monkeypatch.setattr(
+        ingest_module.JsonLineEncoder, "encode_batch", fail_on_second_batch
+    )
+    with pytest.raises(RuntimeError):
+        ingest_intents(source_path, nodes_path, edges_path, 2, id_index_path=id_index)
+    monkeypatch.setattr(ingest_module.JsonLineEncoder, "encode_batch", encode_batch)
+    ingest_intents(source_path, nodes_path, edges_path, 2, id_index_path=id_index)
+
+    node_ids = {json.loads(line)["id"] for line in nodes_path.read_text().splitlines()}
+    edges = [json.loads(line) for line in edges_path.read_text().splitlines()]
+    assert edges and all({e["src"], e["dst"]} <= node_ids for e in edges)
@@ -203,4 +203,242 @@ def test_cli_writes_external_jsonl_report_and_baseline_comparison(tmp_path: Path
     assert len(written[0]["embedding"]) == 4
     assert payload["kind"] == "semantah.repobrief_chunk_embedding_bridge"
     assert payload["record_count"] == 1
+    assert payload["source_row_hash_basis"] == "sha256_of_stripped_jsonl_line_bytes"
     assert payload["baseline_comparison"]["status"] == "pass"
+
+
+def test_incremental_rebuild_reuses_unchanged_rows_from_previous_output(
+    tmp_path: Path,
+):
+    previous = bridge.build_records(
+        [_row("alpha text", chunk_id="c1"), _row("beta text", chunk_id="c2")],
+        default_repo_id="demo",
+        dim=4,
+    )
+    out_jsonl = tmp_path / "semantah.records.jsonl"
+    bridge.write_jsonl(out_jsonl, previous)
+
+    cache = bridge.load_record_cache(out_jsonl)
+    records = bridge.build_records(
+        [_row("alpha text", chunk_id="c1"), _row("gamma text", chunk_id="c2")],
+        default_repo_id="demo",
+        dim=4,
+        cache=cache,
+    )
+
+    assert records[0] == previous[0]
+    assert records[1]["text"] == "gamma text"
+    summary = cache.summary()
+    assert summary["hits"] == 1
+    assert summary["misses"] == 1
+    assert summary["cached_record_count"] == 2
+    assert summary["hit_rate"] == 0.5
+
+
+def test_incremental_cache_misses_on_dim_change_and_missing_file(tmp_path: Path):
+    previous = bridge.build_records([_row()], default_repo_id="demo", dim=4)
+    cache = bridge.RecordCache(previous)
+
+    records = bridge.build_records([_row()], default_repo_id="demo", dim=6, cache=cache)
+
+    assert len(records[0]["embedding"]) == 6
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert len(bridge.load_record_cache(tmp_path / "absent.jsonl")) == 0
+
+
+def test_embedding_cache_reproduces_records_and_is_reported(tmp_path: Path):
+    pytest.importorskip("numpy")
+    rows = [_row("alpha text", chunk_id="c1"), _row("beta text", chunk_id="c2")]
+    plain = bridge.build_records(rows, default_repo_id="demo", dim=6)
+
+    with bridge.EmbeddingCache(tmp_path / "cache.sqlite") as embedding_cache:
+        first = bridge.build_records(
+            rows, default_repo_id="demo", dim=6, embedding_cache=embedding_cache
+        )
+        second = bridge.build_records(
+            rows, default_repo_id="demo", dim=6, embedding_cache=embedding_cache
+        )
+        chunk_index = tmp_path / "demo.chunk_index.jsonl"
+        chunk_index.write_text(json.dumps(rows[0]) + "\n", encoding="utf-8")
+        report = bridge.build_report(
+            chunk_index=chunk_index,
+            records=second,
+            embedding_cache=embedding_cache,
+        )
+
+    assert first == plain and second == plain
+    assert report["embedding_cache"]["hits"] == 2
+    assert report["embedding_cache"]["misses"] == 2
+    assert report["embedding_cache"]["hit_rate"] == 0.5
+
+
+def test_vector_and_hybrid_modes_rank_by_query_embedding_cosine():
+    pytest.importorskip("numpy")
+    texts = ["alpha retrieval", "beta storage", "gamma ranking", "delta cache"]
+    records = bridge.build_records(
+        [_row(text, chunk_id=f"c{i}") for i, text in enumerate(texts)],
+        default_repo_id="demo",
+        dim=8,
+    )
+    # The stand-in embedding of the query equals the embedding of the record text.
+    goldset = [{"query": "gamma ranking", "expected_chunk_id": "c2"}]
+
+    vector = bridge.evaluate_recall(records, goldset, k=1, mode="vector")
+    hybrid = bridge.evaluate_recall(records, goldset, k=1, mode="hybrid")
+
+    assert vector["cases"][0]["rank"] == 1
+    assert vector["rank_basis"].startswith("query_embedding_cosine")
+    assert hybrid["cases"][0]["rank"] == 1
+    assert hybrid["mode"] == "hybrid"
+    with pytest.raises(ValueError, match="unknown evaluation mode"):
+        bridge.evaluate_recall(records, goldset, mode="bm25")
+
+
+def test_report_lists_evaluation_modes_side_by_side(tmp_path: Path):
+    pytest.importorskip("numpy")
+    chunk_index = tmp_path / "demo.chunk_index.jsonl"
+    chunk_index.write_text(json.dumps(_row()) + "\n", encoding="utf-8")
+    records = bridge.build_records(
+        bridge.read_jsonl(chunk_index), default_repo_id="fallback"
+    )
+    goldset = [{"query": "semantic bridge", "expected_chunk_id": "c1"}]
+
+    report = bridge.build_report(
+        chunk_index=chunk_index,
+        records=records,
+        goldset=goldset,
+        eval_modes=("vector", "hybrid"),
+    )
+
+    by_mode = report["evaluation_modes"]
+    assert list(by_mode["modes"]) == ["lexical", "vector", "hybrid"]
+    assert set(by_mode["summary"]["vector"]) == {"recall", "mrr", "hit_count"}
+    assert report["evaluation"] == by_mode["modes"]["lexical"]
+
+
+def test_count_based_rank_matches_full_sort_with_ties_and_duplicate_chunk_ids():
+    rows = [
+        _row("shared words here", chunk_id="c1", path="b.md"),
+        _row("shared words there", chunk_id="c2", path="a.md"),
+        {**_row("shared words again", chunk_id="c1", path="a.md"), "repo_id": "x"},
+        _row("nothing in common", chunk_id="c3", path="a.md"),
+    ]
+    records = bridge.build_records(rows, default_repo_id="demo")
+    goldset = [
+        {"query": "shared words", "expected_chunk_id": "c1"},
+        {"query": "shared words", "expected_chunk_id": "c3"},
+        {"expected_chunk_id": "c3"},
+    ]
+
+    result = bridge.evaluate_recall(records, goldset, k=2)
+
+    # Reference: full sort with the original score and tie-break order.
+    ranked = sorted(
+        records,
+        key=lambda r: (
+            -(len({"shared", "words"} & bridge._tokens(bridge._haystack(r))) + 1),
+            len(r["file_path"]),
+            r["file_path"],
+            r["repobrief_chunk_id"],
+        ),
+    )
+    assert [case["rank"] for case in result["cases"]] == [1, 4, 4]
+    assert result["cases"][0]["top_k"] == [r["repobrief_chunk_id"] for r in ranked[:2]]
+    assert result["cases"][2]["top_k"] == ["c1", "c2"]
+
+
+def test_parquet_output_uses_typed_schema_row_groups_and_roundtrips_as_cache(
+    tmp_path: Path,
+):
+    pq = pytest.importorskip("pyarrow.parquet")
+    rows = [_row(f"text {i}", chunk_id=f"c{i}") for i in range(5)]
+    records = bridge.build_records(rows, default_repo_id="demo", dim=4)
+    out = tmp_path / "records.parquet"
+
+    bridge.write_parquet(out, iter(records), row_group_size=2)
+
+    parquet_file = pq.ParquetFile(out)
+    schema = parquet_file.schema_arrow
+    assert parquet_file.metadata.num_row_groups == 3
+    assert str(schema.field("embedding").type) == ("fixed_size_list<element: float>[4]")
+    assert str(schema.field("repo_id").type).startswith("dictionary<values=string")
+    assert schema.field("range_ref").type == "string"
+
+    cache = bridge.load_record_cache(out)
+    rebuilt = bridge.build_records(rows, default_repo_id="demo", dim=4, cache=cache)
+    assert cache.hits == 5
+    assert rebuilt == records
+
+
+def test_row_hash_modes_raw_line_bytes_and_strict_canonical(tmp_path: Path):
+    row = _row()
+    reordered = dict(reversed(list(row.items())))
+    chunk_index = tmp_path / "demo.chunk_index.jsonl"
+    lines = [json.dumps(row), "  " + json.dumps(reordered, indent=None) + "  "]
+    chunk_index.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+
+    rows, raw = bridge.read_jsonl_with_row_hashes(chunk_index)
+    _, canonical = bridge.read_jsonl_with_row_hashes(chunk_index, row_hash="canonical")
+
+    assert rows == [row, reordered]
+    assert raw == [_sha(lines[0]), _sha(lines[1].strip())]
+    assert canonical == [bridge.source_row_hash(row)] * 2
+    records = bridge.build_records(rows[:1], default_repo_id="demo", row_hashes=raw[:1])
+    assert records[0]["source_row_sha256"] == raw[0]
+    with pytest.raises(ValueError, match="one entry per row"):
+        bridge.build_records(rows, default_repo_id="demo", row_hashes=raw[:1])
+
+
+@pytest.mark.parametrize("mode", ["lexical", "vector", "hybrid"])
+def test_batched_evaluation_matches_per_query_evaluation(mode: str):
+    pytest.importorskip("numpy")
+    words = ["alpha", "beta", "gamma", "delta"]
+    rows = [
+        _row(
+            f"{words[i % 4]} {words[(i * 3) % 4]} item{i}",
+            chunk_id=f"c{i % 9}" if i % 2 else f"c{i}",
+            path=["a.md", "bb.md", "c/d.md"][i % 3],
+        )
+        for i in range(30)
+    ]
+    for i, row in enumerate(rows):
+        row["repo_id"] = f"r{i}"
+    records = bridge.build_records(rows, default_repo_id="demo")
+    goldset = [
+        {"query": "alpha beta", "expected_chunk_id": "c3"},
+        {"query": "pha bet", "expected_chunk_id": "c4"},
+        {"query": "gamma", "expected_chunk_id": "missing"},
+        {"query": "delta item7", "expected_chunk_id": "c7"},
+        {"expected_chunk_id": "c5"},
+        {"query": "beta"},
+    ]
+
+    for k in (1, 3, 100):
+        expected = bridge.evaluate_recall(records, goldset, k=k, mode=mode)
+        # A tiny block forces several query blocks per evaluation.
+        batched = bridge.evaluate_recall_batched(
+            records, goldset, k=k, mode=mode, block_elements=40
+        )
+        assert batched == expected
+
+
+def test_cli_migrates_cache_written_with_other_row_hash(tmp_path: Path, capsys):
+    chunk_index = tmp_path / "demo.chunk_index.jsonl"
+    line = json.dumps(_row())
+    chunk_index.write_text(line + "\n", encoding="utf-8")
+    old, new = tmp_path / "old.jsonl", tmp_path / "new.jsonl"
+    base = ["--chunk-index", str(chunk_index), "--report", str(tmp_path / "r.json")]
+
+    args = [*base, "--out-jsonl", str(old), "--row-hash", "canonical"]
+    assert bridge.main(args) == 0
+    assert bridge.main([*base, "--cache", str(old), "--out-jsonl", str(new)]) == 0
+    report = json.loads((tmp_path / "r.json").read_text(encoding="utf-8"))
+    assert report["incremental"]["hits"] == 1
+    assert "migrating its records to --row-hash raw" in capsys.readouterr().err
+    migrated = json.loads(new.read_text(encoding="utf-8"))
+    assert migrated["source_row_sha256"] == _sha(line)
+
+    assert bridge.main([*base, "--cache", str(new)]) == 0
+    report = json.loads((tmp_path / "r.json").read_text(encoding="utf-8"))
+    assert report["incremental"]["hits"] == 1
+    assert "migrating" not in capsys.readouterr().err
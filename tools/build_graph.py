@@ -1,32 +1,559 @@
 #!/usr/bin/env python3
-"""Stub script to turn embeddings into graph nodes and edges.
+"""Build the semantic graph of a vault from its chunk embeddings.
 
-This is a placeholder for the full implementation.
-See `docs/blueprint.md` for the full concept.
+Reads `.gewebe/embeddings.parquet` (see `tools/build_index.py`), aggregates the
+chunk vectors of each note into one centroid (mean of the L2-normalised chunk
+vectors, normalised again) and links every note to its ``k`` most similar notes
+by cosine similarity. Frontmatter `title`/`topics` of the notes in the vault add
+titles, topic nodes and `about` edges (see `docs/blueprint.md`, section 4).
+
+Similarities are computed exactly in blocks of rows: each block is one NumPy
+matrix product against all centroids, reduced to its top ``k`` with
+`argpartition`, and its edges are streamed to `edges.jsonl` before the next
+block. Memory is bounded by the centroid matrix plus one block of scores
+(``--block-scores``), never the full n×n matrix.
+
+Exact search is O(n²). ``--mode ivf`` instead clusters the centroids with
+spherical k-means into ``--ivf-lists`` inverted lists and scores each note only
+against the members of its ``--ivf-probes`` nearest lists; more probes raise
+recall and cost. ``--evaluate N`` compares the approximate neighbours of ``N``
+sampled notes with their exact neighbours and reports recall@k.
+
+Output rows follow `contracts/semantics/{node,edge}.schema.json`.
 """
 
+from __future__ import annotations
+
+import argparse
 import json
+import math
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, BinaryIO
+
+import yaml
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional in minimal envs
+    np = None  # type: ignore[assignment]
+
+try:
+    import pyarrow.parquet as pq
+except ModuleNotFoundError:  # pragma: no cover - optional in minimal envs
+    pq = None  # type: ignore[assignment]
+
+try:
+    from scripts.atomic_io import AtomicBatch
+    from tools.build_index import OUTPUT as EMBEDDINGS
+    from tools.build_index import ROW_GROUP_SIZE, frontmatter_text
+except ImportError:
+    # Run as `tools/build_graph.py`: make the repository root importable.
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+    from scripts.atomic_io import AtomicBatch
+    from tools.build_index import OUTPUT as EMBEDDINGS
+    from tools.build_index import ROW_GROUP_SIZE, frontmatter_text
+
+NODES = Path(".gewebe/nodes.jsonl")
+EDGES = Path(".gewebe/edges.jsonl")
+# Blueprint `related.k`.
+K = 8
+# Scores per block of the similarity matrix: 32 MiB of float32 plus the
+# int64 argpartition indices.
+BLOCK_SCORES = 1 << 23
+MODES = ("exact", "ivf")
+IVF_PROBES = 8
+IVF_TRAIN_ITERATIONS = 10
+# k-means trains on at most this many sampled notes per list.
+IVF_TRAIN_PER_LIST = 64
+# Rows per block when streaming precomputed neighbours to edges.jsonl.
+WRITE_BLOCK_ROWS = 4096
+
+
+@dataclass
+class Documents:
+    """Notes of an embedding index and their normalised chunk centroids."""
+
+    paths: list[str]
+    vectors: Any  # float32 (len(paths), dim)
+
+
+def _require_dependencies() -> None:
+    if np is None or pq is None:
+        raise RuntimeError("numpy and pyarrow are required to build the graph")
+
+
+def _normalise(vectors: Any) -> Any:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def load_documents(path: Path, *, batch_rows: int = ROW_GROUP_SIZE) -> Documents:
+    """Read ``path`` batch by batch and return one centroid per note.
+
+    Notes keep the order of their first chunk in the index.
+    """
+    _require_dependencies()
+    parquet = pq.ParquetFile(path)
+    missing = {"path", "embedding"} - set(parquet.schema_arrow.names)
+    if missing:
+        raise ValueError(f"{path}: missing columns {sorted(missing)}")
+    index: dict[str, int] = {}
+    parts: list[tuple[Any, Any]] = []
+    dim = 0
+    for batch in parquet.iter_batches(
+        batch_size=batch_rows, columns=["path", "embedding"]
+    ):
+        column = batch.column("embedding")
+        vectors = np.asarray(column.flatten(), dtype=np.float32)
+        vectors = _normalise(vectors.reshape(len(column), -1))
+        dim = vectors.shape[1]
+        rows = np.fromiter(
+            (index.setdefault(p, len(index)) for p in batch.column("path").to_pylist()),
+            dtype=np.int64,
+            count=len(column),
+        )
+        # Chunks of a note are contiguous: sum each run once.
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        parts.append((rows[starts], np.add.reduceat(vectors, starts, axis=0)))
+    centroids = np.zeros((len(index), dim), dtype=np.float32)
+    for rows, sums in parts:
+        np.add.at(centroids, rows, sums)
+    return Documents(list(index), _normalise(centroids))
+
+
+def _top_k(scores: Any, k: int) -> tuple[Any, Any]:
+    """Return per row the ``k`` best columns and scores, best first."""
+    part = np.argpartition(scores, -k, axis=1)[:, -k:]
+    top = np.take_along_axis(scores, part, axis=1)
+    # Highest score first, lower index on ties.
+    order = np.lexsort((part, -top), axis=1)
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(
+        top, order, axis=1
+    )
+
+
+def _exact_rows(vectors: Any, rows: Any, k: int) -> tuple[Any, Any]:
+    scores = vectors[rows] @ vectors.T
+    scores[np.arange(len(rows)), rows] = -np.inf
+    return _top_k(scores, k)
+
+
+def exact_neighbors(
+    vectors: Any, k: int, *, block_scores: int = BLOCK_SCORES
+) -> Iterator[tuple[int, Any, Any]]:
+    """Yield ``(start, indices, scores)`` of the top ``k`` per block of rows.
+
+    ``vectors`` must be L2-normalised; a row is never its own neighbour.
+    """
+    n = len(vectors)
+    k = min(k, n - 1)
+    if k < 1:
+        return
+    block = max(1, block_scores // n)
+    for start in range(0, n, block):
+        yield (start, *_exact_rows(vectors, np.arange(start, min(start + block, n)), k))
+
+
+def _nearest_lists(vectors: Any, centroids: Any, probes: int, block_scores: int) -> Any:
+    """Return the ``probes`` most similar centroids per row, best first."""
+    nearest = np.empty((len(vectors), probes), dtype=np.int64)
+    block = max(1, block_scores // len(centroids))
+    for start in range(0, len(vectors), block):
+        scores = vectors[start : start + block] @ centroids.T
+        nearest[start : start + block] = _top_k(scores, probes)[0]
+    return nearest
+
+
+def train_lists(
+    vectors: Any,
+    lists: int,
+    *,
+    iterations: int = IVF_TRAIN_ITERATIONS,
+    seed: int = 0,
+    block_scores: int = BLOCK_SCORES,
+) -> Any:
+    """Spherical k-means on a sample of ``vectors``; returns unit centroids."""
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    sample = vectors[
+        np.sort(rng.choice(n, min(n, lists * IVF_TRAIN_PER_LIST), replace=False))
+    ]
+    centroids = sample[rng.choice(len(sample), lists, replace=False)]
+    for _ in range(iterations):
+        assigned = _nearest_lists(sample, centroids, 1, block_scores)[:, 0]
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assigned, sample)
+        empty = np.bincount(assigned, minlength=lists) == 0
+        # Restart empty lists from random sample points.
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        centroids = _normalise(sums)
+    return centroids
 
-GEWEBE = Path(".gewebe")
-NODES = GEWEBE / "nodes.jsonl"
-EDGES = GEWEBE / "edges.jsonl"
-
-
-def main() -> None:
-    GEWEBE.mkdir(exist_ok=True)
-    node1_data = {"id": "stub:node", "type": "Note", "title": "Stub Node"}
-    node2_data = {"id": "stub:other", "type": "Note", "title": "Other Stub Node"}
-    NODES.write_text(f"{json.dumps(node1_data)}\n{json.dumps(node2_data)}\n")
-    edge_data = {
-        "src": "stub:node",
-        "rel": "related",
-        "dst": "stub:other",
-        "weight": 0.0,
+
+def _list_members(assigned: Any, lists: int) -> tuple[Any, Any]:
+    """Return row order grouped by list and the list boundaries in it."""
+    order = np.argsort(assigned, kind="stable")
+    return order, np.searchsorted(assigned[order], np.arange(lists + 1))
+
+
+def ivf_neighbors(
+    vectors: Any,
+    k: int,
+    *,
+    lists: int | None = None,
+    probes: int = IVF_PROBES,
+    seed: int = 0,
+    block_scores: int = BLOCK_SCORES,
+) -> tuple[Any, Any]:
+    """Approximate top ``k`` per row by probing the nearest inverted lists.
+
+    Each row is assigned to its nearest k-means centroid (``lists`` of them,
+    default √n) and compared with the members of its ``probes`` nearest lists.
+    Lists are disjoint, so no candidate is scored twice. Returns ``(indices,
+    scores)`` of shape (n, k), best first; rows with fewer than ``k``
+    candidates are padded with index -1 and score -inf.
+    """
+    n = len(vectors)
+    k = min(k, n - 1)
+    if k < 1:
+        return np.empty((n, 0), dtype=np.int64), np.empty((n, 0), dtype=np.float32)
+    lists = min(n, lists or max(1, round(math.sqrt(n))))
+    probes = max(1, min(probes, lists))
+    centroids = train_lists(vectors, lists, seed=seed, block_scores=block_scores)
+    nearest = _nearest_lists(vectors, centroids, probes, block_scores)
+    members, member_bounds = _list_members(nearest[:, 0], lists)
+    probing, probe_bounds = _list_members(nearest.ravel(), lists)
+    probing //= probes
+
+    best = np.full((n, k), -1, dtype=np.int64)
+    best_scores = np.full((n, k), -np.inf, dtype=np.float32)
+    for list_id in range(lists):
+        cands = members[member_bounds[list_id] : member_bounds[list_id + 1]]
+        queries = probing[probe_bounds[list_id] : probe_bounds[list_id + 1]]
+        if not len(cands) or not len(queries):
+            continue
+        list_vectors = vectors[cands]
+        block = max(1, block_scores // len(cands))
+        for start in range(0, len(queries), block):
+            rows = queries[start : start + block]
+            scores = vectors[rows] @ list_vectors.T
+            scores[rows[:, None] == cands[None, :]] = -np.inf
+            merged = np.concatenate(
+                [best[rows], np.broadcast_to(cands, scores.shape)], axis=1
+            )
+            picked, best_scores[rows] = _top_k(
+                np.concatenate([best_scores[rows], scores], axis=1), k
+            )
+            best[rows] = np.take_along_axis(merged, picked, axis=1)
+    # Same order as the exact mode: highest score first, lower index on ties.
+    order = np.lexsort((best, -best_scores), axis=1)
+    best = np.take_along_axis(best, order, axis=1)
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+    best[np.isneginf(best_scores)] = -1
+    return best, best_scores
+
+
+def recall_at_k(
+    vectors: Any,
+    indices: Any,
+    rows: Any,
+    *,
+    block_scores: int = BLOCK_SCORES,
+) -> float:
+    """Share of the exact top-k neighbours of ``rows`` found in ``indices``."""
+    k = indices.shape[1]
+    if not len(rows) or k < 1:
+        return 1.0
+    found = 0
+    block = max(1, block_scores // len(vectors))
+    for start in range(0, len(rows), block):
+        part = rows[start : start + block]
+        exact, _ = _exact_rows(vectors, part, k)
+        found += sum(
+            len(set(truth) & set(approx))
+            for truth, approx in zip(
+                exact.tolist(), indices[part].tolist(), strict=True
+            )
+        )
+    return found / (len(rows) * k)
+
+
+def note_id(path: str) -> str:
+    return f"note:{path}"
+
+
+def topic_id(topic: str) -> str:
+    return f"topic:{topic}"
+
+
+def note_metadata(vault: Path | None, path: str) -> tuple[str, list[str]]:
+    """Return ``(title, topics)`` from the note's frontmatter.
+
+    Falls back to the file stem and no topics if the note is missing or its
+    frontmatter is not a YAML mapping.
+    """
+    title = Path(path).stem
+    if vault is None:
+        return title, []
+    try:
+        text = (vault / path).read_text(encoding="utf-8")
+        data = yaml.safe_load(frontmatter_text(text))
+    except (OSError, UnicodeDecodeError, yaml.YAMLError):
+        return title, []
+    if not isinstance(data, dict):
+        return title, []
+    if isinstance(data.get("title"), str) and data["title"].strip():
+        title = data["title"].strip()
+    topics = data.get("topics") or []
+    if isinstance(topics, str):
+        topics = [topics]
+    if not isinstance(topics, list):
+        return title, []
+    names = (str(topic).strip() for topic in topics if topic is not None)
+    return title, list(dict.fromkeys(name for name in names if name))
+
+
+def _line(element: dict[str, Any]) -> str:
+    return json.dumps(element, ensure_ascii=False) + "\n"
+
+
+def _write_similar(
+    handle: BinaryIO,
+    paths: Sequence[str],
+    neighbours: Iterator[tuple[int, Any, Any]],
+    min_similarity: float,
+) -> int:
+    written = 0
+    for start, indices, scores in neighbours:
+        lines = []
+        for offset, (row, row_scores) in enumerate(
+            zip(indices.tolist(), scores.tolist(), strict=True)
+        ):
+            src = note_id(paths[start + offset])
+            for rank, (dst, score) in enumerate(zip(row, row_scores, strict=True), 1):
+                # Scores are sorted; approximate padding (-1, -inf) ends up here too.
+                if score <= min_similarity:
+                    break
+                lines.append(
+                    _line(
+                        {
+                            "src": src,
+                            "rel": "similar",
+                            "dst": note_id(paths[dst]),
+                            "weight": round(score, 4),
+                            "why": [f"rank:{rank}"],
+                        }
+                    )
+                )
+        handle.write("".join(lines).encode("utf-8"))
+        written += len(lines)
+    return written
+
+
+def build_graph(
+    embeddings: Path = EMBEDDINGS,
+    nodes_path: Path = NODES,
+    edges_path: Path = EDGES,
+    *,
+    vault: Path | None = None,
+    k: int = K,
+    min_similarity: float = 0.0,
+    block_scores: int = BLOCK_SCORES,
+    mode: str = "exact",
+    ivf_lists: int | None = None,
+    ivf_probes: int = IVF_PROBES,
+    evaluate: int = 0,
+    seed: int = 0,
+    fsync: str | None = None,
+) -> dict[str, Any]:
+    """Write note/topic nodes and `similar`/`about` edges; return statistics.
+
+    Each note gets `similar` edges to its ``k`` nearest notes with a cosine
+    similarity above ``min_similarity``, best first. ``mode="ivf"`` finds the
+    neighbours approximately (see :func:`ivf_neighbors`); ``evaluate`` then
+    samples that many notes and adds their recall@k against the exact search
+    to the statistics. Both files are replaced atomically once complete.
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}; expected one of {MODES}")
+    if evaluate and mode == "exact":
+        raise ValueError("evaluation compares the ivf mode against exact search")
+    started = time.monotonic()
+    docs = load_documents(embeddings)
+    notes = [note_metadata(vault, path) for path in docs.paths]
+    topics = sorted({topic for _, note_topics in notes for topic in note_topics})
+    stats = {"notes": len(docs.paths), "topics": len(topics)}
+
+    nodes_path.parent.mkdir(parents=True, exist_ok=True)
+    edges_path.parent.mkdir(parents=True, exist_ok=True)
+    with AtomicBatch(fsync=fsync) as batch:
+        nodes = batch.open(nodes_path)
+        for path, (title, note_topics) in zip(docs.paths, notes, strict=True):
+            node = {"id": note_id(path), "type": "note", "title": title}
+            if note_topics:
+                node["topics"] = note_topics
+            node["source"] = path
+            nodes.write(_line(node).encode("utf-8"))
+        for topic in topics:
+            node = {"id": topic_id(topic), "type": "topic", "title": topic}
+            nodes.write(_line(node).encode("utf-8"))
+
+        edges = batch.open(edges_path)
+        if mode == "exact":
+            neighbours = exact_neighbors(docs.vectors, k, block_scores=block_scores)
+        else:
+            search_started = time.monotonic()
+            indices, scores = ivf_neighbors(
+                docs.vectors,
+                k,
+                lists=ivf_lists,
+                probes=ivf_probes,
+                seed=seed,
+                block_scores=block_scores,
+            )
+            stats["search_ms"] = int((time.monotonic() - search_started) * 1000)
+            if evaluate:
+                stats.update(_evaluate(docs.vectors, indices, evaluate, seed))
+            neighbours = (
+                (
+                    start,
+                    indices[start : start + WRITE_BLOCK_ROWS],
+                    scores[start : start + WRITE_BLOCK_ROWS],
+                )
+                for start in range(0, len(indices), WRITE_BLOCK_ROWS)
+            )
+        stats["similar_edges"] = _write_similar(
+            edges, docs.paths, neighbours, min_similarity
+        )
+        about = [
+            _line(
+                {
+                    "src": note_id(path),
+                    "rel": "about",
+                    "dst": topic_id(topic),
+                    "weight": 1.0,
+                    "why": ["frontmatter:topics"],
+                }
+            )
+            for path, (_, note_topics) in zip(docs.paths, notes, strict=True)
+            for topic in note_topics
+        ]
+        edges.write("".join(about).encode("utf-8"))
+        stats["about_edges"] = len(about)
+    stats["elapsed_ms"] = int((time.monotonic() - started) * 1000)
+    return stats
+
+
+def _evaluate(vectors: Any, indices: Any, sample: int, seed: int) -> dict[str, Any]:
+    rows = np.sort(
+        np.random.default_rng(seed).choice(
+            len(vectors), min(sample, len(vectors)), replace=False
+        )
+    )
+    started = time.monotonic()
+    recall = recall_at_k(vectors, indices, rows)
+    elapsed = time.monotonic() - started
+    return {
+        "eval_sample": len(rows),
+        "recall_at_k": round(recall, 4),
+        # Exact search cost grows linearly with the rows searched.
+        "exact_estimate_ms": int(elapsed * 1000 * len(vectors) / max(len(rows), 1)),
     }
-    EDGES.write_text(f"{json.dumps(edge_data)}\n")
-    print("[stub] build_graph → wrote", NODES, "and", EDGES)
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--embeddings", type=Path, default=EMBEDDINGS)
+    parser.add_argument(
+        "--vault",
+        type=Path,
+        default=Path("."),
+        help="vault root for frontmatter titles/topics (note paths are relative)",
+    )
+    parser.add_argument("--nodes", type=Path, default=NODES)
+    parser.add_argument("--edges", type=Path, default=EDGES)
+    parser.add_argument("-k", "--k", type=int, default=K, help="neighbours per note")
+    parser.add_argument(
+        "--min-similarity",
+        type=float,
+        default=0.0,
+        help="only link notes with a cosine similarity above this value",
+    )
+    parser.add_argument(
+        "--block-scores",
+        type=int,
+        default=BLOCK_SCORES,
+        help="similarity scores computed per block (bounds memory)",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=MODES,
+        default="exact",
+        help="exact all-pairs search or approximate inverted-list (ivf) search",
+    )
+    parser.add_argument(
+        "--ivf-lists", type=int, help="k-means lists for --mode ivf (default: √notes)"
+    )
+    parser.add_argument(
+        "--ivf-probes",
+        type=int,
+        default=IVF_PROBES,
+        help="lists searched per note; higher is slower with better recall",
+    )
+    parser.add_argument(
+        "--evaluate",
+        type=int,
+        default=0,
+        metavar="N",
+        help="with --mode ivf: report recall@k against exact search on N notes",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.evaluate and args.mode == "exact":
+        parser.error("--evaluate requires --mode ivf")
+    return args
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    try:
+        stats = build_graph(
+            args.embeddings,
+            args.nodes,
+            args.edges,
+            vault=args.vault,
+            k=args.k,
+            min_similarity=args.min_similarity,
+            block_scores=args.block_scores,
+            mode=args.mode,
+            ivf_lists=args.ivf_lists,
+            ivf_probes=args.ivf_probes,
+            evaluate=args.evaluate,
+            seed=args.seed,
+        )
+    except (OSError, RuntimeError, ValueError) as exc:
+        print(f"[build_graph] error: {exc}", file=sys.stderr)
+        return 1
+    print(
+        f"[build_graph] {stats['notes']} notes, {stats['topics']} topics → "
+        f"{args.nodes}; {stats['similar_edges']} similar + "
+        f"{stats['about_edges']} about edges → {args.edges}; "
+        f"{stats['elapsed_ms'] / 1000:.1f}s"
+    )
+    if "recall_at_k" in stats:
+        print(
+            f"[build_graph] ivf recall@{args.k}: {stats['recall_at_k']:.3f} on "
+            f"{stats['eval_sample']} notes; search {stats['search_ms'] / 1000:.1f}s, "
+            f"exact ≈{stats['exact_estimate_ms'] / 1000:.1f}s"
+        )
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
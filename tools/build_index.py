@@ -1,21 +1,893 @@
 #!/usr/bin/env python3
-"""Stub script for building embeddings and chunk index artifacts.
+"""Build the chunk embedding index of a Markdown vault.
 
-This is a placeholder for the full implementation.
-See `docs/blueprint.md` for the full concept.
+Crawls the vault (skipping `.gewebe/`, `.obsidian/` and similar tool folders),
+splits each note into paragraph-aligned chunks with overlap (see
+`docs/blueprint.md`, section 1), embeds the chunks in batches and writes
+`.gewebe/embeddings.parquet` with a typed schema, one row group at a time.
+
+Token counts are whitespace-separated words, a CPU-cheap stand-in for model
+tokens. The embedder is pluggable: `sentence-transformers` runs a local model,
+`stable` is the deterministic hash embedding used by the RepoBrief bridge and
+serves as offline/test fallback.
 """
 
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional in minimal envs
+    np = None  # type: ignore[assignment]
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ModuleNotFoundError:  # pragma: no cover - optional in minimal envs
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+try:
+    from scripts.atomic_io import atomic_write_text
+    from scripts.embedding_cache import DEFAULT_MAX_BYTES, EmbeddingCache
+    from scripts.repobrief_chunk_bridge import (
+        stable_embedding_revision,
+        stable_text_embedding,
+    )
+except ImportError:
+    # Run as `tools/build_index.py`: make the repository root importable.
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+    from scripts.atomic_io import atomic_write_text
+    from scripts.embedding_cache import DEFAULT_MAX_BYTES, EmbeddingCache
+    from scripts.repobrief_chunk_bridge import (
+        stable_embedding_revision,
+        stable_text_embedding,
+    )
+
+KIND = "semantah.vault_embeddings"
+VERSION = "v1"
 OUTPUT = Path(".gewebe/embeddings.parquet")
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_KIND = "semantah.vault_index_manifest"
+EXCLUDE_DIRS = (".gewebe", ".obsidian", ".git", ".trash", "node_modules")
+INCLUDE_EXT = (".md",)
+# Chunk sizes in tokens (blueprint: 200-300 tokens, overlap 40-60).
+TARGET_TOKENS = 250
+MAX_TOKENS = 300
+OVERLAP_TOKENS = 50
+BATCH_SIZE = 64
+ROW_GROUP_SIZE = 4096
+# Embedding batches queued for or running on the embedding thread.
+EMBED_QUEUE = 4
+# Notes chunked ahead of the writer per --workers process.
+CHUNK_QUEUE_PER_WORKER = 4
+PROGRESS_INTERVAL = 10.0
+STABLE_DIM = 384
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDERS = ("sentence-transformers", "stable")
+
+_FRONTMATTER = re.compile(r"\A---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|\Z)", re.DOTALL)
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+
+
+@dataclass(frozen=True)
+class Chunk:
+    path: str
+    chunk_id: int
+    text: str
+    tokens: int
+
+    @property
+    def id(self) -> str:
+        return f"{self.path}#{self.chunk_id}"
+
+
+class Embedder(Protocol):
+    """Turns texts into a float32 matrix of shape ``(len(texts), dim)``.
+
+    ``revision`` identifies model and settings; artifacts built with
+    different revisions must not be mixed.
+    """
+
+    name: str
+    revision: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> Any: ...
+
+
+class StableEmbedder:
+    """Deterministic hash embedding; no model, no semantics."""
+
+    name = "stable"
+
+    def __init__(self, dim: int = STABLE_DIM):
+        _require_numpy()
+        self.dim = dim
+        self.revision = stable_embedding_revision(dim)
+
+    def embed(self, texts: Sequence[str]) -> Any:
+        matrix = np.empty((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row] = stable_text_embedding(text, dim=self.dim)
+        return matrix
+
+
+class SentenceTransformerEmbedder:
+    """Local sentence-transformers model on CPU (or GPU if torch finds one)."""
+
+    name = "sentence-transformers"
+
+    def __init__(self, model: str = DEFAULT_MODEL, *, device: str | None = None):
+        _require_numpy()
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ModuleNotFoundError as exc:
+            raise RuntimeError(
+                "sentence-transformers is required for --embedder "
+                "sentence-transformers; install it (extra 'embeddings') or pass "
+                "--embedder stable for deterministic hash vectors"
+            ) from exc
+        self._model = SentenceTransformer(model, device=device)
+        self.dim = int(self._model.get_sentence_embedding_dimension())
+        self.revision = f"{model}/dim={self.dim}"
+
+    def embed(self, texts: Sequence[str]) -> Any:
+        vectors = self._model.encode(
+            list(texts),
+            batch_size=max(len(texts), 1),
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class CachedEmbedder:
+    """Serve embeddings from an :class:`EmbeddingCache`, computing misses.
+
+    Keeps the wrapped embedder's name, revision and dimension, so indexes
+    built with and without the cache are interchangeable.
+    """
+
+    def __init__(self, embedder: Embedder, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+        self.name = embedder.name
+        self.revision = embedder.revision
+        self.dim = embedder.dim
+
+    def embed(self, texts: Sequence[str]) -> Any:
+        return self.cache.get_or_compute(self.revision, texts, self.embedder.embed)
+
+
+def make_embedder(
+    name: str = "sentence-transformers",
+    *,
+    model: str = DEFAULT_MODEL,
+    dim: int = STABLE_DIM,
+) -> Embedder:
+    """Create an embedder.
+
+    Without sentence-transformers this raises instead of degrading: the
+    ``stable`` hash vectors carry no meaning and must be asked for explicitly.
+    """
+    if name not in EMBEDDERS:
+        raise ValueError(f"Unknown embedder {name!r}; expected one of {EMBEDDERS}")
+    if name == "sentence-transformers":
+        return SentenceTransformerEmbedder(model)
+    return StableEmbedder(dim)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required for embeddings")
+
+
+def iter_vault_files(
+    vault: Path,
+    *,
+    exclude_dirs: Iterable[str] = EXCLUDE_DIRS,
+    include_ext: Iterable[str] = INCLUDE_EXT,
+) -> Iterator[Path]:
+    """Yield note paths relative to ``vault`` in sorted, stable order."""
+    excluded = set(exclude_dirs)
+    extensions = tuple(ext.lower() for ext in include_ext)
+    for root, dirnames, filenames in os.walk(vault):
+        dirnames[:] = sorted(d for d in dirnames if d not in excluded)
+        for filename in sorted(filenames):
+            if filename.lower().endswith(extensions):
+                yield (Path(root) / filename).relative_to(vault)
+
+
+def strip_frontmatter(text: str) -> str:
+    """Remove a leading YAML frontmatter block."""
+    return _FRONTMATTER.sub("", text, count=1)
+
+
+def frontmatter_text(text: str) -> str:
+    """Return the YAML source of a leading frontmatter block, or ``""``."""
+    match = _FRONTMATTER.match(text)
+    return match.group(1) if match else ""
+
+
+def _paragraph_units(text: str, target_tokens: int) -> Iterator[tuple[str, int]]:
+    """Yield ``(text, tokens)`` per paragraph; long paragraphs are split."""
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        words = paragraph.split()
+        if len(words) <= target_tokens:
+            yield paragraph, len(words)
+            continue
+        for start in range(0, len(words), target_tokens):
+            piece = words[start : start + target_tokens]
+            yield " ".join(piece), len(piece)
+
+
+def _overlap_tail(
+    units: list[tuple[str, int]], overlap_tokens: int
+) -> list[tuple[str, int]]:
+    """Trailing whole paragraphs within ``overlap_tokens``, else trailing words."""
+    tail: list[tuple[str, int]] = []
+    total = 0
+    for text, tokens in reversed(units):
+        if total + tokens > overlap_tokens:
+            break
+        tail.insert(0, (text, tokens))
+        total += tokens
+    if not tail and units and overlap_tokens > 0:
+        words = units[-1][0].split()[-overlap_tokens:]
+        tail = [(" ".join(words), len(words))]
+    return tail
+
+
+def chunk_text(
+    text: str,
+    *,
+    target_tokens: int = TARGET_TOKENS,
+    max_tokens: int = MAX_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS,
+) -> list[str]:
+    """Split Markdown into paragraph-aligned chunks.
+
+    Paragraphs are packed until a chunk reaches ``target_tokens`` without
+    exceeding ``max_tokens``; each chunk starts with the last paragraphs (or
+    words) of the previous one, up to ``overlap_tokens``.
+    """
+    if not 0 <= overlap_tokens < target_tokens <= max_tokens:
+        raise ValueError("expected 0 <= overlap_tokens < target_tokens <= max_tokens")
+    chunks: list[str] = []
+    current: list[tuple[str, int]] = []
+    current_tokens = 0
+    fresh = False  # whether ``current`` holds more than the carried overlap
+
+    def emit() -> None:
+        nonlocal current, current_tokens, fresh
+        chunks.append("\n\n".join(text for text, _ in current))
+        current = _overlap_tail(current, overlap_tokens)
+        current_tokens = sum(tokens for _, tokens in current)
+        fresh = False
+
+    for unit in _paragraph_units(strip_frontmatter(text), target_tokens):
+        if fresh and current_tokens + unit[1] > max_tokens:
+            emit()
+        if current_tokens + unit[1] > max_tokens:
+            current, current_tokens = [], 0  # drop overlap that cannot fit
+        current.append(unit)
+        current_tokens += unit[1]
+        fresh = True
+        if current_tokens >= target_tokens:
+            emit()
+    if fresh:
+        chunks.append("\n\n".join(text for text, _ in current))
+    return chunks
+
+
+def chunk_note(path: str, data: bytes, **chunk_options: int) -> list[Chunk]:
+    """Chunk one note's bytes; undecodable notes yield no chunks."""
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return []
+    return [
+        Chunk(path, index, chunk, len(chunk.split()))
+        for index, chunk in enumerate(chunk_text(text, **chunk_options))
+    ]
+
+
+def chunk_file(vault: Path, path: Path, **chunk_options: int) -> list[Chunk]:
+    """Read and chunk one note; undecodable files yield no chunks."""
+    return chunk_note(path.as_posix(), (vault / path).read_bytes(), **chunk_options)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def manifest_path_for(output: Path) -> Path:
+    return output.with_name(output.name + MANIFEST_SUFFIX)
+
+
+@dataclass
+class FileEntry:
+    mtime_ns: int
+    size: int
+    blake2b: str
+    chunk_ids: list[str]
+
+
+@dataclass
+class Manifest:
+    """Per-file state of the last build, stored next to the Parquet file.
+
+    A note whose ``mtime_ns`` and ``size`` are unchanged is not read again; if
+    only those differ, the content hash decides. Entries are only valid for
+    the embedder revision and chunking options they were built with.
+    """
+
+    embedder_revision: str
+    chunking: dict[str, int]
+    files: dict[str, FileEntry] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> Manifest | None:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("kind") != MANIFEST_KIND:
+                return None
+            return cls(
+                data["embedder_revision"],
+                data["chunking"],
+                {rel: FileEntry(**entry) for rel, entry in data["files"].items()},
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path: Path) -> None:
+        data = {
+            "kind": MANIFEST_KIND,
+            "version": VERSION,
+            "embedder_revision": self.embedder_revision,
+            "chunking": self.chunking,
+            "files": {rel: asdict(entry) for rel, entry in self.files.items()},
+        }
+        atomic_write_text(path, json.dumps(data, ensure_ascii=False) + "\n")
+
+
+def index_schema(embedder: Embedder, chunk_options: dict[str, int]) -> Any:
+    """Typed Arrow schema; provenance is kept in the schema metadata."""
+    if pa is None:
+        raise RuntimeError("pyarrow is required for parquet output")
+    return pa.schema(
+        [
+            pa.field("id", pa.string(), nullable=False),
+            pa.field("path", pa.string(), nullable=False),
+            pa.field("chunk_id", pa.int32(), nullable=False),
+            pa.field("text", pa.string()),
+            pa.field("tokens", pa.int32()),
+            pa.field("embedding", pa.list_(pa.float32(), embedder.dim)),
+        ],
+        metadata={
+            "kind": KIND,
+            "version": VERSION,
+            "embedder": embedder.name,
+            "embedder_revision": embedder.revision,
+            "chunking": json.dumps(chunk_options, sort_keys=True),
+        },
+    )
+
+
+def _chunk_table(chunks: Sequence[Chunk], vectors: Any, schema: Any) -> Any:
+    dim = schema.field("embedding").type.list_size
+    return pa.Table.from_arrays(
+        [
+            pa.array([chunk.id for chunk in chunks], type=pa.string()),
+            pa.array([chunk.path for chunk in chunks], type=pa.string()),
+            pa.array([chunk.chunk_id for chunk in chunks], type=pa.int32()),
+            pa.array([chunk.text for chunk in chunks], type=pa.string()),
+            pa.array([chunk.tokens for chunk in chunks], type=pa.int32()),
+            pa.FixedSizeListArray.from_arrays(
+                pa.array(vectors.reshape(-1), type=pa.float32()), dim
+            ),
+        ],
+        schema=schema,
+    )
+
+
+class _PreviousRows:
+    """Forward-only reader over the rows of the previous index.
+
+    Notes are crawled in the same order on every run, so the rows of
+    unchanged notes are found by scanning ahead; one batch is held at a time.
+    """
+
+    def __init__(self, path: Path, schema: Any, batch_rows: int):
+        self._schema = schema
+        self._batches = pq.ParquetFile(path).iter_batches(batch_size=batch_rows)
+        self._batch: Any = None
+        self._paths: list[str] = []
+        self._pos = 0
+
+    def _advance(self) -> bool:
+        batch = next(self._batches, None)
+        if batch is None:
+            return False
+        self._batch = pa.Table.from_arrays(batch.columns, schema=self._schema)
+        self._paths = batch.column("path").to_pylist()
+        self._pos = 0
+        return True
+
+    def take(self, path: str) -> Any | None:
+        """Return the rows of ``path`` after the current position, if any."""
+        pieces = []
+        while self._pos < len(self._paths) or self._advance():
+            paths, start = self._paths, self._pos
+            if not pieces:  # skip rows of removed or re-embedded notes
+                while start < len(paths) and paths[start] != path:
+                    start += 1
+            end = start
+            while end < len(paths) and paths[end] == path:
+                end += 1
+            if end > start:
+                pieces.append(self._batch.slice(start, end - start))
+            self._pos = end
+            if end < len(paths):  # the note's rows end inside this batch
+                break
+        return pa.concat_tables(pieces) if pieces else None
+
+
+class _RowGroupWriter:
+    """Write new chunks and copied rows in input order, in full row groups.
+
+    New chunks are embedded in batches of ``batch_size`` texts on a
+    background thread while chunking continues; at most ``embed_queue``
+    batches wait or run at a time. Vectors are collected in submission
+    order when a row group is complete.
+    """
+
+    def __init__(
+        self,
+        writer: Any,
+        schema: Any,
+        embedder: Embedder,
+        batch_size: int,
+        row_group_size: int,
+        embed_queue: int = EMBED_QUEUE,
+    ):
+        self.writer = writer
+        self.schema = schema
+        self.embedder = embedder
+        self.batch_size = batch_size
+        self.row_group_size = row_group_size
+        self.row_groups = 0
+        self._pending: list[Any] = []  # lists of Chunk and Arrow tables
+        self._rows = 0
+        self._unsubmitted: list[Chunk] = []
+        self._vectors: list[Future] = []
+        self._slots = threading.BoundedSemaphore(embed_queue)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def add_chunks(self, chunks: list[Chunk]) -> None:
+        if not chunks:
+            return
+        self._unsubmitted.extend(chunks)
+        while len(self._unsubmitted) >= self.batch_size:
+            self._submit(self._unsubmitted[: self.batch_size])
+            del self._unsubmitted[: self.batch_size]
+        self._add(chunks, len(chunks))
+
+    def add_rows(self, table: Any) -> None:
+        self._add(table, table.num_rows)
+
+    def _add(self, item: Any, rows: int) -> None:
+        self._pending.append(item)
+        self._rows += rows
+        if self._rows >= self.row_group_size:
+            self._write(final=False)
+
+    def flush(self) -> None:
+        if self._rows:
+            self._write(final=True)
+
+    def _submit(self, chunks: list[Chunk]) -> None:
+        texts = [chunk.text for chunk in chunks]
+        self._slots.acquire()  # blocks while the embedding queue is full
+        try:
+            future = self._executor.submit(self.embedder.embed, texts)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._vectors.append(future)
+
+    def _write(self, final: bool) -> None:
+        if self._unsubmitted:
+            self._submit(self._unsubmitted)
+            self._unsubmitted = []
+        vectors = [
+            np.asarray(future.result(), dtype=np.float32) for future in self._vectors
+        ]
+        self._vectors = []
+        vectors = (
+            np.concatenate(vectors)
+            if vectors
+            else np.empty((0, self.embedder.dim), dtype=np.float32)
+        )
+        tables, offset = [], 0
+        for item in self._pending:
+            if isinstance(item, list):
+                tables.append(
+                    _chunk_table(
+                        item, vectors[offset : offset + len(item)], self.schema
+                    )
+                )
+                offset += len(item)
+            else:
+                tables.append(item)
+        table = pa.concat_tables(tables)
+        size = self.row_group_size
+        full = table.num_rows if final else table.num_rows - table.num_rows % size
+        for start in range(0, full, size):
+            self.writer.write_table(table.slice(start, size), row_group_size=size)
+            self.row_groups += 1
+        rest = table.slice(full)
+        self._pending = [rest] if rest.num_rows else []
+        self._rows = rest.num_rows
+
+
+def _chunk_job(
+    vault: Path, rel: str, chunk_options: dict[str, int]
+) -> tuple[str, list[Chunk]]:
+    """Read, hash and chunk one note (runs in a worker process)."""
+    data = (vault / rel).read_bytes()
+    return content_hash(data), chunk_note(rel, data, **chunk_options)
+
+
+def _completed(fn: Callable[..., Any], *args: Any) -> Future:
+    """Run ``fn`` now and wrap the outcome like a pool future."""
+    future: Future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as exc:  # noqa: BLE001 - re-raised by future.result()
+        future.set_exception(exc)
+    return future
+
+
+class _Progress:
+    """Print files/chunks done and chunk throughput at most every ``interval``."""
+
+    def __init__(self, total: int, interval: float, stream: Any = None):
+        self.total = total
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.started = time.monotonic()
+        self._last = self.started
+
+    def update(self, files: int, chunks: int, *, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last < self.interval:
+            return
+        self._last = now
+        rate = chunks / max(now - self.started, 1e-9)
+        print(
+            f"[build_index] {files}/{self.total} files, {chunks} chunks, "
+            f"{rate:.0f} chunks/s",
+            file=self.stream,
+        )
+
+
+def build_index(
+    vault: Path,
+    output: Path = OUTPUT,
+    *,
+    embedder: Embedder | None = None,
+    batch_size: int = BATCH_SIZE,
+    row_group_size: int = ROW_GROUP_SIZE,
+    exclude_dirs: Iterable[str] = EXCLUDE_DIRS,
+    target_tokens: int = TARGET_TOKENS,
+    max_tokens: int = MAX_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS,
+    incremental: bool = True,
+    workers: int = 1,
+    embed_queue: int = EMBED_QUEUE,
+    progress_interval: float | None = None,
+    embedding_cache: EmbeddingCache | None = None,
+) -> dict[str, int]:
+    """Chunk and embed all notes of ``vault`` into ``output``.
+
+    At most about ``row_group_size`` chunks are held in memory; they are
+    embedded in calls of ``batch_size`` texts and written as one row group.
+    With ``incremental``, notes unchanged since the last build (see
+    :class:`Manifest`) are not re-chunked: their rows are copied from the
+    previous ``output``. With ``workers > 1`` notes are chunked in a process
+    pool; results are consumed in crawl order, so the output does not depend
+    on the worker count. ``embedding_cache`` serves chunks embedded before
+    (by any note or run) without calling the embedder. ``progress_interval``
+    (seconds) enables progress lines on stderr. The file is written next to
+    ``output`` and renamed over it at the end, so readers never see a partial
+    index.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required for parquet output")
+    if min(batch_size, row_group_size, workers, embed_queue) < 1:
+        raise ValueError(
+            "batch_size, row_group_size, workers and embed_queue must be at least 1"
+        )
+    started = time.monotonic()
+    embedder = embedder or make_embedder()
+    chunk_options = {
+        "target_tokens": target_tokens,
+        "max_tokens": max_tokens,
+        "overlap_tokens": overlap_tokens,
+    }
+    schema = index_schema(embedder, chunk_options)
+    manifest_path = manifest_path_for(output)
+    previous = Manifest.load(manifest_path) if incremental else None
+    if previous is not None and (
+        previous.embedder_revision != embedder.revision
+        or previous.chunking != chunk_options
+        or not output.exists()
+    ):
+        previous = None
+    manifest = Manifest(embedder.revision, chunk_options)
+    if embedding_cache is not None:
+        embedder = CachedEmbedder(embedder, embedding_cache)
+        cache_before = (embedding_cache.hits, embedding_cache.misses)
+    stats = dict.fromkeys(
+        ["files", "chunks", "row_groups", "reused_files", "reused_chunks"], 0
+    )
+    paths = [
+        path.as_posix() for path in iter_vault_files(vault, exclude_dirs=exclude_dirs)
+    ]
+    progress = (
+        _Progress(len(paths), progress_interval)
+        if progress_interval is not None
+        else None
+    )
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        with (
+            pq.ParquetWriter(tmp_path, schema) as writer,
+            _RowGroupWriter(
+                writer, schema, embedder, batch_size, row_group_size, embed_queue
+            ) as rows,
+        ):
+            old_rows = (
+                _PreviousRows(output, schema, row_group_size) if previous else None
+            )
+
+            def finish(
+                rel: str,
+                stat: os.stat_result,
+                entry: FileEntry | None,
+                future: Future | None,
+            ) -> None:
+                if entry is not None and _copy_rows(old_rows, rows, rel, entry):
+                    digest, chunk_ids = entry.blake2b, entry.chunk_ids
+                    stats["reused_files"] += 1
+                    stats["reused_chunks"] += len(chunk_ids)
+                else:
+                    if future is None:  # rows of an unchanged note went missing
+                        future = _completed(_chunk_job, vault, rel, chunk_options)
+                    digest, chunks = future.result()
+                    rows.add_chunks(chunks)
+                    chunk_ids = [chunk.id for chunk in chunks]
+                manifest.files[rel] = FileEntry(
+                    stat.st_mtime_ns, stat.st_size, digest, chunk_ids
+                )
+                stats["files"] += 1
+                stats["chunks"] += len(chunk_ids)
+                if progress is not None:
+                    progress.update(stats["files"], stats["chunks"])
+
+            # Chunk jobs run ahead of the writer by at most this many notes.
+            window: deque = deque()
+            max_ahead = CHUNK_QUEUE_PER_WORKER * workers
+            for rel in paths:
+                stat = (vault / rel).stat()
+                entry = previous.files.get(rel) if previous else None
+                if (
+                    entry is not None
+                    and (entry.mtime_ns, entry.size) != (stat.st_mtime_ns, stat.st_size)
+                    and content_hash((vault / rel).read_bytes()) != entry.blake2b
+                ):
+                    entry = None
+                future = None
+                if entry is None:
+                    if pool is not None:
+                        future = pool.submit(_chunk_job, vault, rel, chunk_options)
+                    else:
+                        future = _completed(_chunk_job, vault, rel, chunk_options)
+                window.append((rel, stat, entry, future))
+                while len(window) > max_ahead:
+                    finish(*window.popleft())
+            while window:
+                finish(*window.popleft())
+            rows.flush()
+            stats["row_groups"] = rows.row_groups
+        os.replace(tmp_path, output)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+    manifest.save(manifest_path)
+    if progress is not None:
+        progress.update(stats["files"], stats["chunks"], force=True)
+    stats["embedded_files"] = stats["files"] - stats["reused_files"]
+    stats["embedded_chunks"] = stats["chunks"] - stats["reused_chunks"]
+    stats["removed_files"] = (
+        len(previous.files.keys() - manifest.files.keys()) if previous else 0
+    )
+    if embedding_cache is not None:
+        stats["cache_hits"] = embedding_cache.hits - cache_before[0]
+        stats["cache_misses"] = embedding_cache.misses - cache_before[1]
+    stats["elapsed_ms"] = int((time.monotonic() - started) * 1000)
+    return stats
+
+
+def _copy_rows(
+    old_rows: _PreviousRows | None, rows: _RowGroupWriter, rel: str, entry: FileEntry
+) -> bool:
+    """Copy the previous rows of an unchanged note; False if they are missing."""
+    if not entry.chunk_ids:
+        return True
+    table = old_rows.take(rel) if old_rows is not None else None
+    if table is None or table.column("id").to_pylist() != entry.chunk_ids:
+        return False
+    rows.add_rows(table)
+    return True
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vault", type=Path, default=Path("."))
+    parser.add_argument("--output", type=Path, default=OUTPUT)
+    parser.add_argument(
+        "--embedder",
+        choices=EMBEDDERS,
+        default="sentence-transformers",
+        help="'stable' writes deterministic hash vectors without semantics (tests)",
+    )
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument(
+        "--dim", type=int, default=STABLE_DIM, help="dimension of the stable embedder"
+    )
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--row-group-size", type=int, default=ROW_GROUP_SIZE)
+    parser.add_argument("--target-tokens", type=int, default=TARGET_TOKENS)
+    parser.add_argument("--max-tokens", type=int, default=MAX_TOKENS)
+    parser.add_argument("--overlap-tokens", type=int, default=OVERLAP_TOKENS)
+    parser.add_argument(
+        "--exclude-dir",
+        action="append",
+        default=[],
+        help=(
+            "additional folder name to skip "
+            f"(always skipped: {', '.join(EXCLUDE_DIRS)})"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes for reading and chunking notes (default: 1)",
+    )
+    parser.add_argument(
+        "--embed-queue",
+        type=int,
+        default=EMBED_QUEUE,
+        help=f"embedding batches queued ahead of the writer (default: {EMBED_QUEUE})",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help=f"report progress and throughput every {PROGRESS_INTERVAL:.0f}s on stderr",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        help=(
+            "SQLite embedding cache (default: embedding_cache.sqlite next to --output)"
+        ),
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES >> 20,
+        help="evict least recently used cache entries above this size",
+    )
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help=(
+            f"re-embed every note instead of reusing rows via <output>{MANIFEST_SUFFIX}"
+        ),
+    )
+    return parser.parse_args(argv)
 
 
-def main() -> None:
-    OUTPUT.parent.mkdir(parents=True, exist_ok=True)
-    if not OUTPUT.exists():
-        OUTPUT.write_text("id,text,embedding\n")
-    print("[stub] build_index → wrote", OUTPUT)
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    cache = None
+    try:
+        embedder = make_embedder(args.embedder, model=args.model, dim=args.dim)
+        if not args.no_cache:
+            cache = EmbeddingCache(
+                args.cache or args.output.parent / "embedding_cache.sqlite",
+                max_bytes=args.cache_max_mb << 20,
+            )
+        stats = build_index(
+            args.vault,
+            args.output,
+            embedder=embedder,
+            batch_size=args.batch_size,
+            row_group_size=args.row_group_size,
+            exclude_dirs=(*EXCLUDE_DIRS, *args.exclude_dir),
+            target_tokens=args.target_tokens,
+            max_tokens=args.max_tokens,
+            overlap_tokens=args.overlap_tokens,
+            incremental=not args.full,
+            workers=args.workers,
+            embed_queue=args.embed_queue,
+            progress_interval=PROGRESS_INTERVAL if args.progress else None,
+            embedding_cache=cache,
+        )
+    except (OSError, RuntimeError, ValueError, sqlite3.Error) as exc:
+        print(f"[build_index] error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if cache is not None:
+            summary = cache.summary()
+            cache.close()
+    seconds = stats["elapsed_ms"] / 1000
+    print(
+        f"[build_index] {stats['files']} files → {stats['chunks']} chunks "
+        f"({embedder.revision}) → {args.output}; re-embedded "
+        f"{stats['embedded_files']} files / {stats['embedded_chunks']} chunks, "
+        f"reused {stats['reused_files']}, removed {stats['removed_files']}; "
+        f"{seconds:.1f}s, {stats['embedded_chunks'] / max(seconds, 1e-3):.0f} chunks/s"
+    )
+    if cache is not None:
+        print(
+            f"[build_index] embedding cache: {summary['hits']} hits, "
+            f"{summary['misses']} misses ({summary['hit_rate']:.1%}), "
+            f"{summary['entries']} entries, {summary['bytes'] >> 20} MiB, "
+            f"{summary['evicted']} evicted"
+        )
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())